@@ -8,4 +8,4 @@ class AlumniConfig(AppConfig):
 
     def ready(self):
         # noinspection PyUnresolvedReferences
-        from . import permissions
+        from . import permissions, signals
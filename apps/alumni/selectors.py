@@ -0,0 +1,44 @@
+from typing import Optional
+
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet
+
+from core.models import AcademicProgram
+from learning.settings import StudentStatuses
+from users.models import AlumniConsent, City, StudentProfile, StudentTypes, User
+
+# Unique ordering of the alumni directory, see `users_user_name_idx` index
+ALUMNI_ORDERING = ('last_name', 'first_name', 'pk')
+
+
+def alumni_queryset(*, consent_required: bool,
+                    program: Optional[AcademicProgram] = None,
+                    graduation_year: Optional[int] = None,
+                    city: Optional[City] = None) -> QuerySet:
+    """
+    Returns users with alumni profile. Graduated student profiles are
+    prefetched to the `graduated_profiles` attribute.
+    """
+    alumni_profiles = StudentProfile.objects.filter(user=OuterRef('pk'),
+                                                    type=StudentTypes.ALUMNI)
+    if consent_required:
+        alumni_profiles = alumni_profiles.filter(alumni_consent=AlumniConsent.ACCEPTED)
+    users = User.objects.filter(Exists(alumni_profiles))
+    if program is not None:
+        graduations = StudentProfile.objects.filter(
+            user=OuterRef('pk'),
+            status=StudentStatuses.GRADUATED,
+            academic_program_enrollment__program=program,
+            year_of_graduation=graduation_year)
+        users = users.filter(Exists(graduations))
+    if city is not None:
+        users = users.filter(city=city)
+    graduated_profiles = (StudentProfile.objects
+                          .filter(status=StudentStatuses.GRADUATED)
+                          .select_related('academic_program_enrollment__program')
+                          .order_by('year_of_graduation', 'pk'))
+    return (users
+            .select_related('city__country')
+            .prefetch_related(Prefetch('student_profiles',
+                                       queryset=graduated_profiles,
+                                       to_attr='graduated_profiles'))
+            .order_by(*ALUMNI_ORDERING))
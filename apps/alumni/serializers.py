@@ -37,7 +37,11 @@ class AlumniUserSerializer(ModelSerializer):
         )
 
     def get_graduations(self, user: User):
-        profiles = StudentProfile.objects.filter(
-            user=user, status=StudentStatuses.GRADUATED
-        ).all()
+        # See `alumni.selectors.alumni_queryset`
+        if hasattr(user, 'graduated_profiles'):
+            profiles = user.graduated_profiles
+        else:
+            profiles = StudentProfile.objects.filter(
+                user=user, status=StudentStatuses.GRADUATED
+            ).all()
         return StudentProfileToGraduationSerializer(profiles, many=True).data
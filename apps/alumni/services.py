@@ -1,31 +1,149 @@
-from django.db import transaction
+from typing import Dict, Iterable, List
+
+from django.db import models, transaction
+from django.db.models import Case, Value, When
 from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-from alumni.tasks import send_alumni_promotion_email
+from alumni.tasks import send_alumni_promotion_emails
+from core.cache import CachedValue
+from learning.services.membership_service import invalidate_user_membership
 from learning.settings import StudentStatuses
 from users.constants import Roles
-from users.models import StudentProfile, StudentTypes
-from users.services import assign_role
+from users.identity import invalidate_identity_snapshot
+from users.models import StudentProfile, StudentStatusLog, StudentTypes, User, UserGroup
+from users.services import get_student_profile_priority
+
+
+ALUMNI_GRADUATIONS_CACHE_VERSION = 1
+ALUMNI_GRADUATIONS_CACHE_TIMEOUT = 24 * 3600
+
+
+class PromotionOutcome(models.TextChoices):
+    PROMOTED = 'promoted', _('Promoted')
+    ALREADY_GRADUATED = 'already_graduated', _('Already graduated')
+    NOT_FOUND = 'not_found', _('Student profile not found')
+
+
+_graduations: CachedValue[List[Dict]] = CachedValue(
+    "alumni_graduations:{version}", version=ALUMNI_GRADUATIONS_CACHE_VERSION,
+    timeout=ALUMNI_GRADUATIONS_CACHE_TIMEOUT)
+
+
+def _load_graduations() -> List[Dict]:
+    program_year_tuples = (
+        StudentProfile.objects.filter(
+            type=StudentTypes.REGULAR,
+            status=StudentStatuses.GRADUATED,
+        )
+        .order_by(
+            'academic_program_enrollment__program__title',
+            'year_of_graduation',
+        )
+        .values_list(
+            'academic_program_enrollment__program__pk',
+            'academic_program_enrollment__program__title',
+            'year_of_graduation',
+        )
+        .distinct()
+    )
+    return [
+        {
+            'program_id': x[0],
+            'program_title': x[1],
+            'graduation_year': x[2],
+        }
+        for x in program_year_tuples
+    ]
+
+
+def get_graduations() -> List[Dict]:
+    """
+    Returns distinct (program, graduation year) pairs of the graduated
+    regular students, used as the alumni directory filter.
+    """
+    return _graduations.get(_load_graduations)
+
 
+def invalidate_graduations() -> None:
+    _graduations.invalidate()
 
-def promote_to_alumni(student_profile: StudentProfile) -> None:
+
+def _get_graduated_priority(profile_type: str) -> int:
+    return get_student_profile_priority(
+        StudentProfile(type=profile_type, status=StudentStatuses.GRADUATED))
+
+
+def bulk_promote_to_alumni(student_profile_ids: Iterable[int], *,
+                           editor: User) -> Dict[int, str]:
+    """
+    Promotes students to alumni in one transaction with a fixed number
+    of queries: graduates student profiles, writes status log entries,
+    creates missing alumni profiles and roles. One email job for all
+    new alumni is enqueued after commit.
+
+    Already graduated profiles are skipped, so it's safe to retry.
+    Returns promotion outcome for each student profile id.
+    """
+    student_profile_ids = set(student_profile_ids)
+    outcomes = {pk: PromotionOutcome.NOT_FOUND for pk in student_profile_ids}
     with transaction.atomic():
+        student_profiles = list(StudentProfile.objects
+                                .filter(pk__in=student_profile_ids)
+                                .select_for_update(of=('self',))
+                                .select_related('user')
+                                .only('pk', 'type', 'status', 'user',
+                                      'user__email', 'user__first_name')
+                                .order_by('pk'))
+        graduates: List[StudentProfile] = []
+        for student_profile in student_profiles:
+            if student_profile.status == StudentStatuses.GRADUATED:
+                outcomes[student_profile.pk] = PromotionOutcome.ALREADY_GRADUATED
+            else:
+                outcomes[student_profile.pk] = PromotionOutcome.PROMOTED
+                graduates.append(student_profile)
+        if not graduates:
+            return outcomes
         current_year = timezone.now().year
-        student_profile.status = StudentStatuses.GRADUATED
-        student_profile.year_of_graduation = current_year
-        student_profile.save()
-        has_alumni_profile = StudentProfile.objects.filter(
-            user=student_profile.user, type=StudentTypes.ALUMNI
-        ).exists()
-        if not has_alumni_profile:
-            alumni_profile = StudentProfile(
-                user=student_profile.user,
-                year_of_admission=current_year,
-                type=StudentTypes.ALUMNI,
-            )
-            alumni_profile.save()
-            assign_role(account=student_profile.user, role=Roles.ALUMNI)
-    if not has_alumni_profile:
-        send_alumni_promotion_email.delay(
-            student_profile.user.email, student_profile.user.first_name
-        )
+        profile_types = {sp.type for sp in graduates}
+        (StudentProfile.objects
+         .filter(pk__in=[sp.pk for sp in graduates])
+         .update(status=StudentStatuses.GRADUATED,
+                 year_of_graduation=current_year,
+                 priority=Case(*(When(type=t, then=Value(_get_graduated_priority(t)))
+                                 for t in profile_types)),
+                 modified=timezone.now()))
+        StudentStatusLog.objects.bulk_create([
+            StudentStatusLog(status=StudentStatuses.GRADUATED,
+                             student_profile_id=sp.pk,
+                             entry_author=editor)
+            for sp in graduates
+        ])
+        users = {sp.user_id: sp.user for sp in graduates}
+        has_alumni_profile = set(StudentProfile.objects
+                                 .filter(user__in=users.keys(),
+                                         type=StudentTypes.ALUMNI)
+                                 .values_list('user_id', flat=True))
+        new_alumni = [user for user_id, user in users.items()
+                      if user_id not in has_alumni_profile]
+        alumni_priority = get_student_profile_priority(
+            StudentProfile(type=StudentTypes.ALUMNI))
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user_id=user.pk,
+                           type=StudentTypes.ALUMNI,
+                           year_of_admission=current_year,
+                           priority=alumni_priority)
+            for user in new_alumni
+        ], ignore_conflicts=True)
+        UserGroup.objects.bulk_create([
+            UserGroup(user_id=user.pk, role=Roles.ALUMNI) for user in new_alumni
+        ], ignore_conflicts=True)
+        # Bulk operations don't send model signals
+        invalidate_graduations()
+        for user_id in users:
+            invalidate_identity_snapshot(user_id)
+            invalidate_user_membership(user_id)
+        if new_alumni:
+            recipients = [(user.email, user.first_name) for user in new_alumni]
+            transaction.on_commit(lambda: send_alumni_promotion_emails.delay(recipients))
+    return outcomes
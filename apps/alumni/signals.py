@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from alumni.services import invalidate_graduations
+from learning.settings import StudentStatuses
+from users.models import StudentProfile
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def invalidate_alumni_graduations(sender, instance: StudentProfile, *args, **kwargs):
+    graduated = StudentStatuses.GRADUATED
+    if instance.status == graduated or instance.tracker.previous('status') == graduated:
+        invalidate_graduations()
@@ -1,24 +1,34 @@
+from typing import List, Tuple
+
 from django.conf import settings
 from django_rq import job
 
+from core.mail import send_transactional_emails
 from core.models import Config
 from core.urls import reverse, replace_hostname
 from core.utils import create_multipart_email
 
 
-@job('default')
-def send_alumni_promotion_email(to_email, first_name):
+def _get_alumni_promotion_email(to_email, first_name, telegram_chat_url):
     consent_form_url = reverse('alumni:consent_form')
     consent_form_url = replace_hostname(consent_form_url, settings.LMS_DOMAIN)
     context = {
         'consent_form_url': consent_form_url,
         'first_name': first_name,
-        'telegram_chat_url': Config.get().alumni_chat_link,
+        'telegram_chat_url': telegram_chat_url,
     }
-    msg = create_multipart_email(
+    return create_multipart_email(
         'Welcome to JetBrains Academy Alumni Offline!',
         'emails/alumni_promotion.html',
         context,
         [to_email],
     )
-    msg.send()
+
+
+@job('default')
+def send_alumni_promotion_emails(recipients: List[Tuple[str, str]]):
+    """Sends emails to (email, first name) pairs"""
+    telegram_chat_url = Config.get().alumni_chat_link
+    messages = [_get_alumni_promotion_email(to_email, first_name, telegram_chat_url)
+                for to_email, first_name in recipients]
+    send_transactional_emails(messages)
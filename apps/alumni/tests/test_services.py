@@ -1,34 +1,75 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from alumni.services import promote_to_alumni
+from alumni.services import PromotionOutcome, bulk_promote_to_alumni
 from learning.settings import StudentStatuses
-from users.models import StudentProfile, StudentTypes
-from users.tests.factories import StudentProfileFactory
+from users.constants import Roles
+from users.models import StudentProfile, StudentStatusLog, StudentTypes, User, UserGroup
+from users.services import get_student_profile_priority
+from users.tests.factories import CuratorFactory, StudentProfileFactory
 
 
 @pytest.mark.django_db
-def test_promote_to_alumni(program_run_cub):
-    sp: StudentProfile = StudentProfileFactory(year_of_admission=2024)
-    user = sp.user
-    promote_to_alumni(sp)
-    sp.refresh_from_db()
-    assert sp.status == StudentStatuses.GRADUATED
-    assert sp.year_of_graduation == timezone.now().year
-    ap = StudentProfile.objects.filter(user=user, type=StudentTypes.ALUMNI).first()
-    assert ap is not None
-    assert ap != sp
+def test_bulk_promote_to_alumni(mocker, django_capture_on_commit_callbacks):
+    send_emails = mocker.patch('alumni.services.send_alumni_promotion_emails')
+    curator = CuratorFactory()
+    sp1, sp2 = StudentProfileFactory.create_batch(2, year_of_admission=2024)
+    # Second graduation of the student who is already alumni
+    sp3 = StudentProfileFactory(year_of_admission=2023)
+    bulk_promote_to_alumni([sp3.pk], editor=curator)
+    sp4 = StudentProfileFactory(user=sp3.user, year_of_admission=2025)
+    unknown_id = sp4.pk + 1000
+    with django_capture_on_commit_callbacks(execute=True):
+        outcomes = bulk_promote_to_alumni([sp1.pk, sp2.pk, sp3.pk, sp4.pk, unknown_id],
+                                          editor=curator)
+    assert outcomes == {
+        sp1.pk: PromotionOutcome.PROMOTED,
+        sp2.pk: PromotionOutcome.PROMOTED,
+        sp3.pk: PromotionOutcome.ALREADY_GRADUATED,
+        sp4.pk: PromotionOutcome.PROMOTED,
+        unknown_id: PromotionOutcome.NOT_FOUND,
+    }
+    current_year = timezone.now().year
+    for sp in (sp1, sp2, sp4):
+        sp.refresh_from_db()
+        assert sp.status == StudentStatuses.GRADUATED
+        assert sp.year_of_graduation == current_year
+        assert sp.priority == get_student_profile_priority(sp)
+        log_entry = StudentStatusLog.objects.get(student_profile=sp)
+        assert log_entry.status == StudentStatuses.GRADUATED
+        assert log_entry.entry_author == curator
+    for sp in (sp1, sp2, sp3):
+        alumni_profiles = StudentProfile.objects.filter(user=sp.user, type=StudentTypes.ALUMNI)
+        assert alumni_profiles.count() == 1
+        assert alumni_profiles[0].priority == get_student_profile_priority(alumni_profiles[0])
+        assert UserGroup.objects.filter(user=sp.user, role=Roles.ALUMNI).count() == 1
+        assert User.objects.get(pk=sp.user_id).get_student_profile() == alumni_profiles[0]
+    # One email job for new alumni only
+    send_emails.delay.assert_called_once()
+    recipients = send_emails.delay.call_args.args[0]
+    assert sorted(recipients) == sorted([(sp1.user.email, sp1.user.first_name),
+                                         (sp2.user.email, sp2.user.first_name)])
+    # Retry is a no-op
+    send_emails.reset_mock()
+    with django_capture_on_commit_callbacks(execute=True):
+        outcomes = bulk_promote_to_alumni([sp1.pk, sp2.pk], editor=curator)
+    assert outcomes == {sp1.pk: PromotionOutcome.ALREADY_GRADUATED,
+                        sp2.pk: PromotionOutcome.ALREADY_GRADUATED}
+    assert StudentStatusLog.objects.filter(student_profile__in=[sp1, sp2]).count() == 2
+    send_emails.delay.assert_not_called()
 
-    assert user.get_student_profile() == ap
 
-    # Alumni profile is unused if there is an active student profile
-    sp2: StudentProfile = StudentProfileFactory(user=user, year_of_admission=2025)
-    assert user.get_student_profile() == sp2
+@pytest.mark.django_db
+def test_bulk_promote_to_alumni_queries(mocker):
+    mocker.patch('alumni.services.send_alumni_promotion_emails')
+    curator = CuratorFactory()
+
+    def count_queries(size):
+        student_profiles = StudentProfileFactory.create_batch(size)
+        with CaptureQueriesContext(connection) as context:
+            bulk_promote_to_alumni([sp.pk for sp in student_profiles], editor=curator)
+        return len(context.captured_queries)
 
-    # There can only be one alumni profile
-    promote_to_alumni(sp2)
-    sp2.refresh_from_db()
-    assert sp2.status == StudentStatuses.GRADUATED
-    alumni_profiles = StudentProfile.objects.filter(user=user, type=StudentTypes.ALUMNI).all()
-    assert len(alumni_profiles) == 1
-    assert alumni_profiles[0] == ap
+    assert count_queries(2) == count_queries(20)
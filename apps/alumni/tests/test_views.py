@@ -3,10 +3,17 @@ from urllib.parse import urlencode
 import pytest
 from django.utils import timezone
 
-from alumni.services import promote_to_alumni
+from alumni.services import bulk_promote_to_alumni
 from core.urls import reverse
+from core.utils import instance_memoize
 from users.models import User, StudentProfile, AlumniConsent, StudentTypes
-from users.tests.factories import StudentFactory, StudentProfileFactory
+from users.tests.factories import CuratorFactory, StudentFactory, StudentProfileFactory
+
+
+def _promote_to_alumni(student_profile: StudentProfile) -> None:
+    bulk_promote_to_alumni([student_profile.pk], editor=CuratorFactory())
+    # Memoized student profile has been changed
+    instance_memoize.delete_cache(student_profile.user)
 
 
 @pytest.mark.django_db
@@ -23,7 +30,7 @@ def test_alumni_list(client, curator):
     )
     sp: StudentProfile = user.get_student_profile()
     invited_profile = StudentProfile(user=user, type=StudentTypes.INVITED)
-    promote_to_alumni(sp)
+    _promote_to_alumni(sp)
     ap: StudentProfile = user.get_student_profile()
     ap.alumni_consent = AlumniConsent.DECLINED
     ap.save()
@@ -35,7 +42,7 @@ def test_alumni_list(client, curator):
         student_profile__year_of_admission=2024,
     )
     other_sp: StudentProfile = other_user.get_student_profile()
-    promote_to_alumni(other_sp)
+    _promote_to_alumni(other_sp)
     other_ap: StudentProfile = other_user.get_student_profile()
 
     non_graduated = StudentFactory()
@@ -62,14 +69,14 @@ def test_alumni_list(client, curator):
     assert resp.status_code == 200
     resp_data = resp.json()
     # Consent not given
-    assert len(resp_data['alumni']) == 0
+    assert len(resp_data['results']) == 0
 
     # Curator can see all alumni regardless of the consent status
     client.login(curator)
     resp = client.get(api_list_url)
     assert resp.status_code == 200
     resp_data = resp.json()
-    assert len(resp_data['alumni']) == 2
+    assert len(resp_data['results']) == 2
     client.login(user)
 
     ap.alumni_consent = AlumniConsent.ACCEPTED
@@ -79,11 +86,11 @@ def test_alumni_list(client, curator):
     assert resp.status_code == 200
     resp_data = resp.json()
     # 1 user gave consent
-    assert len(resp_data['alumni']) == 1
-    assert resp_data['alumni'][0]['id'] == user.id
-    assert len(resp_data['alumni'][0]['graduations']) == 1
+    assert len(resp_data['results']) == 1
+    assert resp_data['results'][0]['id'] == user.id
+    assert len(resp_data['results'][0]['graduations']) == 1
     assert (
-        resp_data['alumni'][0]['graduations'][0]['program_id']
+        resp_data['results'][0]['graduations'][0]['program_id']
         == sp.academic_program_enrollment.program.id
     )
 
@@ -94,37 +101,37 @@ def test_alumni_list(client, curator):
     assert resp.status_code == 200
     resp_data = resp.json()
     # 2 users gave consent
-    assert len(resp_data['alumni']) == 2
-    assert resp_data['alumni'][0]['id'] == user.id
-    assert resp_data['alumni'][1]['id'] == other_user.id
-    assert len(resp_data['alumni'][0]['graduations']) == 1
-    assert len(resp_data['alumni'][1]['graduations']) == 1
+    assert len(resp_data['results']) == 2
+    assert resp_data['results'][0]['id'] == user.id
+    assert resp_data['results'][1]['id'] == other_user.id
+    assert len(resp_data['results'][0]['graduations']) == 1
+    assert len(resp_data['results'][1]['graduations']) == 1
     assert (
-        resp_data['alumni'][0]['graduations'][0]['program_id']
+        resp_data['results'][0]['graduations'][0]['program_id']
         == sp.academic_program_enrollment.program.id
     )
     assert (
-        resp_data['alumni'][1]['graduations'][0]['program_id']
+        resp_data['results'][1]['graduations'][0]['program_id']
         == other_sp.academic_program_enrollment.program.id
     )
 
     # Check that all graduations are displayed
     sp2: StudentProfile = StudentProfileFactory(user=user, year_of_admission=2025)
-    promote_to_alumni(sp2)
+    _promote_to_alumni(sp2)
 
     resp = client.get(api_list_url)
     assert resp.status_code == 200
     resp_data = resp.json()
     # 2 users gave consent
-    assert len(resp_data['alumni']) == 2
-    assert resp_data['alumni'][0]['id'] == user.id
-    assert len(resp_data['alumni'][0]['graduations']) == 2
+    assert len(resp_data['results']) == 2
+    assert resp_data['results'][0]['id'] == user.id
+    assert len(resp_data['results'][0]['graduations']) == 2
     assert (
-        resp_data['alumni'][0]['graduations'][0]['program_id']
+        resp_data['results'][0]['graduations'][0]['program_id']
         == sp.academic_program_enrollment.program.id
     )
     assert (
-        resp_data['alumni'][0]['graduations'][1]['program_id']
+        resp_data['results'][0]['graduations'][1]['program_id']
         == sp2.academic_program_enrollment.program.id
     )
 
@@ -136,14 +143,14 @@ def test_alumni_list_filters(client):
 
     user: User = StudentFactory()
     sp: StudentProfile = user.get_student_profile()
-    promote_to_alumni(sp)
+    _promote_to_alumni(sp)
     ap: StudentProfile = user.get_student_profile()
     ap.alumni_consent = AlumniConsent.ACCEPTED
     ap.save()
 
     other_user: User = StudentFactory()
     other_sp: StudentProfile = other_user.get_student_profile()
-    promote_to_alumni(other_sp)
+    _promote_to_alumni(other_sp)
     other_ap: StudentProfile = other_user.get_student_profile()
     other_ap.alumni_consent = AlumniConsent.ACCEPTED
     other_ap.save()
@@ -162,8 +169,8 @@ def test_alumni_list_filters(client):
         if expected_status == 200:
             assert resp.status_code == 200
             resp_data = resp.json()
-            assert len(resp_data['alumni']) == len(expected_users)
-            assert {x['id'] for x in resp_data['alumni']} == expected_users
+            assert len(resp_data['results']) == len(expected_users)
+            assert {x['id'] for x in resp_data['results']} == expected_users
         else:
             if expected_users is not None:
                 raise ValueError(
@@ -211,9 +218,22 @@ def test_alumni_promote_view(client, curator):
         {'student_profiles': [sp.id, sp2.id]},
         content_type='application/json',
     )
-    assert resp.status_code == 204
+    assert resp.status_code == 200
+    assert resp.json() == {'results': [
+        {'student_profile': sp.id, 'outcome': 'promoted'},
+        {'student_profile': sp2.id, 'outcome': 'promoted'},
+    ]}
     assert user.get_student_profile().type == StudentTypes.ALUMNI
     assert user2.get_student_profile().type == StudentTypes.ALUMNI
+    resp = client.post(
+        api_promote_url,
+        {'student_profiles': [sp.id]},
+        content_type='application/json',
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {'results': [
+        {'student_profile': sp.id, 'outcome': 'already_graduated'},
+    ]}
 
 
 @pytest.mark.django_db
@@ -223,7 +243,7 @@ def test_alumni_consent_form(client, assert_redirect):
 
     sp: StudentProfile = StudentProfileFactory()
     user = sp.user
-    promote_to_alumni(sp)
+    _promote_to_alumni(sp)
     ap: StudentProfile = user.get_student_profile()
     client.login(user)
 
@@ -264,7 +284,7 @@ def test_alumni_consent_in_user_profile(client):
     resp = client.get(update_profile_url)
     assert b'alumni_consent' not in resp.content
 
-    promote_to_alumni(sp)
+    _promote_to_alumni(sp)
     ap: StudentProfile = user.get_student_profile()
 
     resp = client.get(update_profile_url)
@@ -276,3 +296,44 @@ def test_alumni_consent_in_user_profile(client):
     assert resp.status_code == 302
     ap.refresh_from_db()
     assert ap.alumni_consent == AlumniConsent.ACCEPTED
+
+
+@pytest.mark.django_db
+def test_alumni_list_pagination(client, curator, mocker, django_assert_num_queries):
+    mocker.patch('alumni.views.AlumniKeysetPagination.page_size', 3)
+    api_list_url = reverse('alumni:api:list')
+    users = []
+    for i in range(7):
+        user = StudentFactory(last_name=f'Alumni {i}')
+        _promote_to_alumni(user.get_student_profile())
+        users.append(user)
+    client.login(curator)
+    client.get(api_list_url)
+    ids = []
+    url = api_list_url
+    is_first_page = True
+    while url:
+        # count (first page only), page, graduations
+        with django_assert_num_queries(3 if is_first_page else 2):
+            resp = client.get(url)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data['count'] == (7 if is_first_page else None)
+        is_first_page = False
+        assert len(data['results']) <= 3
+        assert all(len(x['graduations']) == 1 for x in data['results'])
+        ids.extend(x['id'] for x in data['results'])
+        url = data['next']
+    assert ids == [u.pk for u in users]
+
+
+@pytest.mark.django_db
+def test_alumni_list_graduations_cache(client, curator):
+    list_url = reverse('alumni:list')
+    client.login(curator)
+    resp = client.get(list_url)
+    assert resp.context_data['react_data']['programs'] == []
+    user = StudentFactory()
+    _promote_to_alumni(user.get_student_profile())
+    resp = client.get(list_url)
+    assert len(resp.context_data['react_data']['programs']) == 1
@@ -5,23 +5,25 @@ from django.forms.models import ModelForm
 from django.http import HttpResponse, HttpResponseRedirect
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import TemplateView, FormView, UpdateView
-from rest_framework import serializers, status
+from rest_framework import serializers
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from alumni.permissions import ViewAlumniMenu
 from alumni.serializers import AlumniUserSerializer
-from alumni.services import promote_to_alumni
+from alumni.selectors import ALUMNI_ORDERING, alumni_queryset
+from alumni.services import PromotionOutcome, bulk_promote_to_alumni, get_graduations
+from api.pagination import KeysetPagination
 from api.permissions import CuratorAccessPermission
 from api.views import APIBaseView
 from auth.mixins import RolePermissionRequiredMixin, PermissionRequiredMixin
 from core.http import HttpRequest
 from core.models import AcademicProgram
 from core.urls import reverse
-from learning.settings import StudentStatuses
 from users.api.serializers import CitySerializer
 from users.mixins import CuratorOnlyMixin
 from users.models import StudentProfile, User, StudentTypes, AlumniConsent, City
+from users.thumbnails import get_user_thumbnail_urls
 
 
 class AlumniListView(PermissionRequiredMixin, TemplateView):
@@ -42,30 +44,7 @@ class AlumniListView(PermissionRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        program_year_tuples = (
-            StudentProfile.objects.filter(
-                type=StudentTypes.REGULAR,
-                status=StudentStatuses.GRADUATED,
-            )
-            .order_by(
-                'academic_program_enrollment__program__title',
-                'year_of_graduation',
-            )
-            .values_list(
-                'academic_program_enrollment__program__pk',
-                'academic_program_enrollment__program__title',
-                'year_of_graduation',
-            )
-            .distinct()
-        )
-        programs = [
-            {
-                'program_id': x[0],
-                'program_title': x[1],
-                'graduation_year': x[2],
-            }
-            for x in program_year_tuples
-        ]
+        programs = get_graduations()
         cities = City.objects.all()
         cities_serialized = CitySerializer(cities, many=True).data
         context.update(
@@ -74,6 +53,11 @@ class AlumniListView(PermissionRequiredMixin, TemplateView):
         return context
 
 
+class AlumniKeysetPagination(KeysetPagination):
+    page_size = 100
+    ordering = ALUMNI_ORDERING
+
+
 class AlumniListApiView(RolePermissionRequiredMixin, APIBaseView):
     permission_classes = [ViewAlumniMenu]
 
@@ -100,28 +84,21 @@ class AlumniListApiView(RolePermissionRequiredMixin, APIBaseView):
                 )
             return data
 
-    class OutputSerializer(serializers.Serializer):
-        alumni = AlumniUserSerializer(many=True)
-
     def get(self, request: Request, **kwargs) -> Response:
         serializer = self.InputSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
-        users = User.objects.filter(
-            student_profiles__type=StudentTypes.ALUMNI,
-        ).order_by('last_name', 'first_name')
-        if not request.user.is_curator:
-            users = users.filter(
-                student_profiles__alumni_consent=AlumniConsent.ACCEPTED
-            )
-        if program := data.get('program'):
-            users = users.filter(
-                student_profiles__academic_program_enrollment__program=program,
-                student_profiles__year_of_graduation=data['graduation_year'],
-            )
-        if city := data.get('city'):
-            users = users.filter(city=city)
-        return Response(self.OutputSerializer({'alumni': users}).data)
+        users = alumni_queryset(consent_required=not request.user.is_curator,
+                                program=data.get('program'),
+                                graduation_year=data.get('graduation_year'),
+                                city=data.get('city'))
+        paginator = AlumniKeysetPagination()
+        page = paginator.paginate_queryset(users, request, view=self)
+        photo_urls = get_user_thumbnail_urls(page, User.ThumbnailSize.BASE,
+                                             use_stub=True)
+        serializer = AlumniUserSerializer(page, many=True,
+                                          context={'photo_urls': photo_urls})
+        return paginator.get_paginated_response(serializer.data)
 
 
 class PromoteToAlumniView(CuratorOnlyMixin, TemplateView):
@@ -132,17 +109,22 @@ class PromoteToAlumniApiView(RolePermissionRequiredMixin, APIBaseView):
     permission_classes = [CuratorAccessPermission]
 
     class InputSerializer(serializers.Serializer):
-        student_profiles = serializers.PrimaryKeyRelatedField(
-            many=True, queryset=StudentProfile.objects.all()
+        student_profiles = serializers.ListField(
+            child=serializers.IntegerField(min_value=1)
         )
 
+    class OutputSerializer(serializers.Serializer):
+        student_profile = serializers.IntegerField()
+        outcome = serializers.ChoiceField(choices=PromotionOutcome.choices)
+
     def post(self, request: Request, **kwargs) -> Response:
         serializer = self.InputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         student_profiles = serializer.validated_data['student_profiles']
-        for student_profile in student_profiles:
-            promote_to_alumni(student_profile)
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        outcomes = bulk_promote_to_alumni(student_profiles, editor=request.user)
+        results = [{'student_profile': pk, 'outcome': outcome}
+                   for pk, outcome in sorted(outcomes.items())]
+        return Response({'results': self.OutputSerializer(results, many=True).data})
 
 
 class AlumniConsentForm(ModelForm):
@@ -1,7 +1,16 @@
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from django.core.paginator import EmptyPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
 
 
 class StandardPagination(pagination.PageNumberPagination):
@@ -30,3 +39,106 @@ class StandardPagination(pagination.PageNumberPagination):
             },
             'results': data,
         })
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Paginates queryset by the values of the ordering fields of the last
+    item on the page, so the next page is fetched by index without
+    scanning skipped rows as offset pagination does.
+
+    Ordering must be unique, e.g. the last field is a primary key.
+
+    Total count is returned with the first page only, it's null for
+    the next pages since counting scans all matching rows.
+    """
+    page_size = 500
+    # Field lookups, all in ascending order
+    ordering: Tuple[str, ...] = ()
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count = None
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            self.count = queryset.count()
+        queryset = queryset.order_by(*self.ordering)
+        if cursor is not None:
+            queryset = queryset.filter(get_keyset_condition(self.ordering, cursor))
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        last_item = self.page[-1]
+        cursor = [_get_value(last_item, lookup) for lookup in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param,
+                                   self.encode_cursor(cursor))
+
+    @staticmethod
+    def encode_cursor(values: List[Any]) -> str:
+        data = json.dumps(values, cls=DjangoJSONEncoder).encode()
+        return base64.urlsafe_b64encode(data).decode()
+
+    def decode_cursor(self, request) -> Optional[List[Any]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        return values
+
+
+def get_keyset_condition(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    Returns condition for rows that follow the row with the given values
+    of the ordering fields, e.g. for (a, b) ordering:
+        a > x OR (a = x AND b > y)
+    """
+    condition = Q()
+    for i, lookup in enumerate(ordering):
+        term = Q(**{f"{lookup}__gt": values[i]})
+        for prev_lookup, prev_value in zip(ordering[:i], values[:i]):
+            term &= Q(**{prev_lookup: prev_value})
+        condition |= term
+    return condition
+
+
+def _get_value(obj, lookup: str):
+    for attr in lookup.split(LOOKUP_SEP):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def iterate_keyset(queryset, ordering: Sequence[str], *, batch_size: int):
+    """
+    Yields all items of the queryset fetching them in batches ordered
+    by the unique *ordering*.
+    """
+    queryset = queryset.order_by(*ordering)
+    cursor = None
+    while True:
+        batch = queryset
+        if cursor is not None:
+            batch = batch.filter(get_keyset_condition(ordering, cursor))
+        batch = list(batch[:batch_size])
+        yield from batch
+        if len(batch) < batch_size:
+            break
+        cursor = [_get_value(batch[-1], lookup) for lookup in ordering]
@@ -30,18 +30,27 @@ class RBACPermissions:
         if user.is_anonymous:
             return self._has_perm(user, perm, {role_registry.anonymous_role}, obj)
         elif hasattr(user, 'roles'):
-            roles = [role_registry.anonymous_role, role_registry.authenticated_role]
-            for role_code in user.roles:
-                if role_code not in role_registry:
-                    logger.warning(f'Role with a code {role_code} is not '
-                                   f'registered but assigned to the user {user}')
-                    continue
-                role = role_registry[role_code]
-                roles.append(role)
-            roles.sort(key=lambda r: r.priority)
-            return self._has_perm(user, perm, roles, obj)
+            return self.has_perm_with_roles(user, perm, user.roles, obj)
         return False
 
+    def has_perm_with_roles(self, user, perm, role_codes, obj=None):
+        """
+        Checks permission of the authenticated *user* against the
+        given set of role codes instead of the `user.roles` attribute.
+        """
+        if not user.is_active:
+            return False
+        roles = [role_registry.anonymous_role, role_registry.authenticated_role]
+        for role_code in role_codes:
+            if role_code not in role_registry:
+                logger.warning(f'Role with a code {role_code} is not '
+                               f'registered but assigned to the user {user}')
+                continue
+            role = role_registry[role_code]
+            roles.append(role)
+        roles.sort(key=lambda r: r.priority)
+        return self._has_perm(user, perm, roles, obj)
+
     def _has_perm(self, user, perm_name, roles, obj):
         for role in roles:
             if role.permissions.rule_exists(perm_name):
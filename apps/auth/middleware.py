@@ -1,16 +1,47 @@
+from typing import Optional
+
 from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
 from django.contrib.auth import get_user as auth_get_user
 from django.contrib.auth.middleware import \
     AuthenticationMiddleware as _AuthenticationMiddleware
 from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.utils.crypto import constant_time_compare
 from django.utils.functional import SimpleLazyObject
 
-from users.models import ExtendedAnonymousUser
+from users.identity import get_identity_snapshot
+from users.models import ExtendedAnonymousUser, User
+
+
+def get_snapshot_user(request) -> Optional[User]:
+    """
+    Returns authenticated user restored from the cached identity snapshot
+    or None if the session can't be verified this way. In that case
+    the regular `django.contrib.auth.get_user` must be used, it also takes
+    care of flushing invalid sessions.
+    Assumes that authentication backends load active users by primary key.
+    """
+    try:
+        user_id = User._meta.pk.to_python(request.session[SESSION_KEY])
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except (KeyError, ValidationError):
+        return None
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return None
+    snapshot = get_identity_snapshot(user_id)
+    if snapshot is None or not snapshot.fields['is_active']:
+        return None
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(session_hash,
+                                                     snapshot.session_auth_hash):
+        return None
+    return snapshot.to_user()
 
 
 def get_user(request):
     if not hasattr(request, '_cached_user'):
-        request._cached_user = auth_get_user(request)
+        request._cached_user = get_snapshot_user(request) or auth_get_user(request)
         if isinstance(request._cached_user, AnonymousUser):
             request._cached_user = ExtendedAnonymousUser()
     return request._cached_user
@@ -5,7 +5,7 @@ from django_rq import job
 
 from django.apps import apps
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail import EmailMultiAlternatives
 from django.template import loader
 from django.utils import translation
 
@@ -13,6 +13,7 @@ from auth.settings import (
     EMAIL_ACTIVATION_BODY, EMAIL_ACTIVATION_SUBJECT, EMAIL_RESTORE_PASSWORD_BODY,
     EMAIL_RESTORE_PASSWORD_SUBJECT
 )
+from core.mail import EMAIL_PRIORITY_HIGH, send_transactional_email
 from core.urls import replace_hostname, reverse
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ def send_restore_password_email(context, from_email, to_email, language_code):
     subject = ''.join(subject.splitlines())
     body = loader.render_to_string(EMAIL_RESTORE_PASSWORD_BODY, context)
     email_message = EmailMultiAlternatives(subject, body, from_email, [to_email])
-    email_message.send()
+    send_transactional_email(email_message, priority=EMAIL_PRIORITY_HIGH)
 
 
 class ActivationEmailContext(NamedTuple):
@@ -65,4 +66,4 @@ def send_activation_email(context: ActivationEmailContext,
     email_message = EmailMultiAlternatives(subject, body,
                                            settings.DEFAULT_FROM_EMAIL,
                                            [reg_profile.user.email])
-    email_message.send()
+    send_transactional_email(email_message, priority=EMAIL_PRIORITY_HIGH)
@@ -14,6 +14,8 @@ class CoreConfig(AppConfig):
         from . import signals  # isort:skip  pylint: disable=unused-import
         # Register custom lookups
         from .db import lookups  # isort:skip  pylint: disable=unused-import
+        # Track persistent database connections
+        from .db import connections  # isort:skip  pylint: disable=unused-import
         # Update Django Rest Framework serializer mappings
         from rest_framework.serializers import ModelSerializer  # isort:skip
         from core.api import fields  # isort:skip
@@ -0,0 +1,296 @@
+"""
+Cache backends with per-alias hit/miss counters and memory usage.
+
+All cache aliases (see `CACHES` setting) are stored in the shared redis
+database and separated by the key prefix, so clearing one alias doesn't
+affect the others. `LocMemCache` is a stand-in with the same interface
+used in tests.
+
+Counters are approximate: process-local values are accumulated and
+periodically added to the cache they belong to, see `get_cache_stats`.
+
+`CachedValue` and `DataVersion` implement cache-aside storage of the
+values computed from the database.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Iterator, List, NamedTuple, Optional, TypeVar
+
+from django.core.cache import cache as default_cache
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.locmem import LocMemCache as _LocMemCache
+from django.core.cache.backends.redis import RedisCache as _RedisCache
+from django.db import transaction
+from django.utils.connection import ConnectionProxy
+
+logger = logging.getLogger(__name__)
+
+PERMISSIONS_CACHE_ALIAS = 'permissions'
+REPORTS_CACHE_ALIAS = 'reports'
+
+# Cached user roles, memberships and other data for permission checks
+permissions_cache = ConnectionProxy(caches, PERMISSIONS_CACHE_ALIAS)
+# Precomputed aggregates for reports and statistics pages
+reports_cache = ConnectionProxy(caches, REPORTS_CACHE_ALIAS)
+
+CACHE_STATS_KEY = "cache_stats:{name}"
+CACHE_STATS_COUNTERS = ("hits", "misses")
+# Local counters are flushed to the cache every N lookups
+CACHE_STATS_FLUSH_INTERVAL = 100
+CACHE_SCAN_BATCH_SIZE = 1000
+
+_missing = object()
+
+T = TypeVar('T')
+
+
+class CacheStats(NamedTuple):
+    alias: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    keys: int
+    memory: int  # in bytes
+
+
+class CacheStatsMixin:
+    """
+    Counts hits and misses of `.get` and `.get_many` lookups.
+
+    Subclasses must implement `_get_many_uncounted` and `_iter_memory_usage`.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_stats = dict.fromkeys(CACHE_STATS_COUNTERS, 0)
+        self._stats_lock = threading.Lock()
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version=version)
+        if value is _missing:
+            self._record_lookups(misses=1)
+            return default
+        self._record_lookups(hits=1)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = self._get_many_uncounted(keys, version=version)
+        self._record_lookups(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+    def _get_many_uncounted(self, keys, version=None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _iter_memory_usage(self) -> Iterator[int]:
+        """Yields memory used by each key of the cache"""
+        raise NotImplementedError
+
+    def clear(self):
+        self._reset_pending_stats()
+        super().clear()
+
+    def _reset_pending_stats(self) -> None:
+        with self._stats_lock:
+            self._pending_stats = dict.fromkeys(CACHE_STATS_COUNTERS, 0)
+
+    def _record_lookups(self, hits: int = 0, misses: int = 0) -> None:
+        with self._stats_lock:
+            self._pending_stats["hits"] += hits
+            self._pending_stats["misses"] += misses
+            should_flush = sum(self._pending_stats.values()) >= CACHE_STATS_FLUSH_INTERVAL
+        if should_flush:
+            self.flush_stats()
+
+    def flush_stats(self) -> None:
+        with self._stats_lock:
+            pending = self._pending_stats
+            self._pending_stats = dict.fromkeys(CACHE_STATS_COUNTERS, 0)
+        for name, delta in pending.items():
+            if not delta:
+                continue
+            key = CACHE_STATS_KEY.format(name=name)
+            try:
+                self.add(key, 0, timeout=None)
+                self.incr(key, delta)
+            except ValueError:
+                # Key has been evicted between .add and .incr calls
+                self.set(key, delta, timeout=None)
+            except Exception as e:
+                logger.warning("Failed to flush cache stats: %s", e)
+
+    def get_stats(self, alias: str) -> CacheStats:
+        keys = {name: CACHE_STATS_KEY.format(name=name) for name in CACHE_STATS_COUNTERS}
+        values = self._get_many_uncounted(list(keys.values()))
+        with self._stats_lock:
+            counters = {name: values.get(key, 0) + self._pending_stats[name]
+                        for name, key in keys.items()}
+        lookups = counters["hits"] + counters["misses"]
+        hit_ratio = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        total_keys, memory = 0, 0
+        for key_memory in self._iter_memory_usage():
+            total_keys += 1
+            memory += key_memory
+        return CacheStats(alias=alias, hits=counters["hits"],
+                          misses=counters["misses"], hit_ratio=hit_ratio,
+                          keys=total_keys, memory=memory)
+
+
+class RedisCache(CacheStatsMixin, _RedisCache):
+    def _get_many_uncounted(self, keys, version=None):
+        return _RedisCache.get_many(self, keys, version=version)
+
+    def _iter_keys(self) -> Iterator[List[bytes]]:
+        client = self._cache.get_client(write=False)
+        batch = []
+        for key in client.scan_iter(match=f"{self.key_prefix}:*",
+                                    count=CACHE_SCAN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= CACHE_SCAN_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _iter_memory_usage(self):
+        client = self._cache.get_client(write=False)
+        for batch in self._iter_keys():
+            pipeline = client.pipeline(transaction=False)
+            for key in batch:
+                pipeline.memory_usage(key)
+            yield from (usage or 0 for usage in pipeline.execute())
+
+    def clear(self):
+        self._reset_pending_stats()
+        # Don't flush the database, it's shared with other aliases and rq
+        client = self._cache.get_client(write=True)
+        for batch in self._iter_keys():
+            client.delete(*batch)
+
+
+class LocMemCache(CacheStatsMixin, _LocMemCache):
+    def _get_many_uncounted(self, keys, version=None):
+        values = {}
+        for key in keys:
+            value = _LocMemCache.get(self, key, _missing, version=version)
+            if value is not _missing:
+                values[key] = value
+        return values
+
+    def _iter_memory_usage(self):
+        with self._lock:
+            # Values are stored pickled
+            sizes = [len(key) + len(value) for key, value in self._cache.items()]
+        yield from sizes
+
+
+def get_cache_stats() -> List[CacheStats]:
+    stats = []
+    for alias in caches:
+        cache = caches[alias]
+        if isinstance(cache, CacheStatsMixin):
+            cache.flush_stats()
+            stats.append(cache.get_stats(alias))
+    return stats
+
+
+@dataclass(frozen=True)
+class _DeleteKey:
+    cache: BaseCache
+    key: str
+
+    def __call__(self) -> None:
+        self.cache.delete(self.key)
+
+
+@dataclass(frozen=True)
+class _BumpDataVersion:
+    cache: BaseCache
+    key: str
+
+    def __call__(self) -> None:
+        self.cache.set(self.key, time.time_ns() // 1000, timeout=None)
+
+
+def invalidate_on_commit(invalidate: Callable[[], None]) -> None:
+    """
+    Calls *invalidate* now and once again after the current transaction
+    is committed since concurrent request could cache the stale value
+    read before the commit. Equal callbacks are scheduled once per
+    transaction, e.g. saving the same user a few times invalidates its
+    cache once after the commit.
+    """
+    invalidate()
+    connection = transaction.get_connection()
+    if any(callback == invalidate for _, callback, *_ in connection.run_on_commit):
+        return
+    transaction.on_commit(invalidate)
+
+
+class _VersionedKey:
+    """
+    Cache key template formatted with the *version* and keyword arguments
+    passed to the methods. Bump the version after changing the structure
+    of the cached value, the values stored by the previous code are
+    not loaded then.
+    """
+    def __init__(self, key: str, *, version: int, cache: BaseCache = default_cache):
+        self.key = key
+        self.version = version
+        self.cache = cache
+
+    def get_key(self, **params) -> str:
+        return self.key.format(version=self.version, **params)
+
+
+class CachedValue(_VersionedKey, Generic[T]):
+    """
+    Value computed from the database and stored in cache, e.g.
+
+        _user_membership = CachedValue("user_membership:{version}:{user_id}",
+                                       version=1, timeout=3600)
+        _user_membership.get(lambda: _load_user_membership(user_id), user_id=user_id)
+    """
+    def __init__(self, key: str, *, version: int, timeout: Optional[int],
+                 cache: BaseCache = default_cache):
+        super().__init__(key, version=version, cache=cache)
+        self.timeout = timeout
+
+    def get(self, compute: Callable[[], Optional[T]], **params) -> Optional[T]:
+        """
+        Returns cached value or computes and stores it. None is not cached.
+        """
+        cache_key = self.get_key(**params)
+        value = self.cache.get(cache_key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.cache.set(cache_key, value, timeout=self.timeout)
+        return value
+
+    def invalidate(self, **params) -> None:
+        invalidate_on_commit(_DeleteKey(self.cache, self.get_key(**params)))
+
+
+class DataVersion(_VersionedKey):
+    """
+    Timestamp (in microseconds) of the latest change of the data. Values
+    built from the data are cached under the keys with the data version,
+    so changing the version invalidates all of them at once.
+    """
+    def get(self, **params) -> int:
+        cache_key = self.get_key(**params)
+        data_version = self.cache.get(cache_key)
+        if data_version is None:
+            data_version = time.time_ns() // 1000
+            if not self.cache.add(cache_key, data_version, timeout=None):
+                data_version = self.cache.get(cache_key, data_version)
+        return data_version
+
+    def bump(self, **params) -> None:
+        _BumpDataVersion(self.cache, self.get_key(**params))()
+
+    def invalidate(self, **params) -> None:
+        invalidate_on_commit(_BumpDataVersion(self.cache, self.get_key(**params)))
@@ -1,7 +1,16 @@
 from django.apps import apps
 from django.conf import settings
 from django.contrib.admin.checks import _contains_subclass  # type: ignore
+from django.core.cache.backends.locmem import LocMemCache
 from django.core.checks import Error, register
+from django.utils.module_loading import import_string
+
+from core.cache import PERMISSIONS_CACHE_ALIAS
+
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
 
 
 class Tags:
@@ -47,3 +56,26 @@ def check_dependencies(app_configs, **kwargs):
         ))
 
     return errors
+
+
+@register(Tags.core)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Sessions and identity snapshots are invalidated in the cache by the
+    process that handled the change, so the cache must be shared
+    between processes.
+    """
+    aliases = [PERMISSIONS_CACHE_ALIAS]
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        aliases.append(settings.SESSION_CACHE_ALIAS)
+    errors = []
+    for alias in aliases:
+        backend = settings.CACHES[alias]['BACKEND']
+        if issubclass(import_string(backend), LocMemCache):
+            errors.append(Error(
+                f"Cache {alias!r} must be shared between processes, "
+                f"{backend!r} is process-local",
+                hint="Use 'core.cache.RedisCache' backend",
+                id='core.E401',
+            ))
+    return errors
@@ -1,28 +1,51 @@
+"""
+Comment drafts are stored by the client in the local storage. After
+the comment was saved, the draft is no longer needed and could be removed
+by the client garbage collector, which looks for the comment hash in the
+list of recently saved comments of the user.
+
+Hashes are stored in the per-user redis sorted set scored by the time
+of saving, all modifications are atomic.
+"""
 import hashlib
 import json
 import re
+import time
+from typing import List
 
-from django.core.cache import cache
+from django_rq.queues import get_connection
 
-HASH_LEN = 16 + 1
 HASH_N = 100
 HASH_MAX_TTL = 600  # in seconds
-CACHE_KEY = 'comment_persistence'
+CACHE_KEY = 'comment_persistence:{user_id}'
+
+
+def get_comment_hash(comment_text: str) -> str:
+    nowhite_text = re.sub(r"\s+", '', comment_text)
+    return hashlib.md5(nowhite_text.encode('utf-8')).hexdigest()
 
 
-def add_to_gc(comment_text: str) -> None:
+def add_to_gc(user_id: int, comment_text: str) -> None:
     """
     After comment was saved to the persistent data storage mark it as not
     'in-use' for the client garbage collector.
     """
-    nowhite_text = re.sub(r"\s+", '', comment_text)
-    comment_md5 = hashlib.md5(nowhite_text.encode('utf-8')).hexdigest()
-    # NOTE(Dmitry): there is a race here, but it shouldn't matter
-    old_md5s = cache.get(CACHE_KEY, "")
-    new_md5s = "{}|{}".format(comment_md5, old_md5s[:(HASH_LEN * HASH_N)])
-    cache.set(CACHE_KEY, new_md5s, HASH_MAX_TTL)
+    key = CACHE_KEY.format(user_id=user_id)
+    now = time.time()
+    pipeline = get_connection().pipeline(transaction=True)
+    pipeline.zadd(key, {get_comment_hash(comment_text): now})
+    pipeline.zremrangebyscore(key, '-inf', now - HASH_MAX_TTL)
+    # Keep only the latest hashes
+    pipeline.zremrangebyrank(key, 0, -HASH_N - 1)
+    pipeline.expire(key, HASH_MAX_TTL)
+    pipeline.execute()
+
+
+def get_hashes(user_id: int) -> List[str]:
+    key = CACHE_KEY.format(user_id=user_id)
+    hashes = get_connection().zrangebyscore(key, time.time() - HASH_MAX_TTL, '+inf')
+    return [h.decode() for h in hashes]
 
 
-def get_garbage_collection() -> str:
-    hashes = cache.get(CACHE_KEY, "").split("|")
-    return json.dumps({h: 0 for h in hashes if h})
+def get_garbage_collection(user_id: int) -> str:
+    return json.dumps({h: 0 for h in get_hashes(user_id)})
@@ -0,0 +1,57 @@
+"""
+Statistics of the persistent database connections of the current process.
+
+Connections are reused by the web and rq worker processes if
+`CONN_MAX_AGE` is set for the process type, see `DATABASES` setting.
+The number of opened connections growing with the number of served
+requests means connections are not reused.
+"""
+import threading
+import time
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_opened_total: Counter = Counter()
+_opened_lock = threading.Lock()
+
+
+class ConnectionStats(NamedTuple):
+    alias: str
+    connected: bool
+    # Seconds since the current connection has been opened
+    age: Optional[float]
+    # Number of connections opened by the process
+    opened: int
+    max_age: Optional[int]
+    health_checks: bool
+
+
+@receiver(connection_created)
+def track_connection(sender, connection, **kwargs):
+    connection.opened_at = time.monotonic()
+    with _opened_lock:
+        _opened_total[connection.alias] += 1
+
+
+def get_connection_stats() -> List[ConnectionStats]:
+    """
+    Returns stats of the connections of the current thread, connections
+    are not opened.
+    """
+    stats = []
+    now = time.monotonic()
+    for alias in connections:
+        wrapper = connections[alias]
+        connected = wrapper.connection is not None
+        opened_at = getattr(wrapper, "opened_at", None)
+        age = round(now - opened_at, 3) if connected and opened_at is not None else None
+        settings_dict = wrapper.settings_dict
+        stats.append(ConnectionStats(alias=alias, connected=connected, age=age,
+                                     opened=_opened_total[alias],
+                                     max_age=settings_dict["CONN_MAX_AGE"],
+                                     health_checks=settings_dict["CONN_HEALTH_CHECKS"]))
+    return stats
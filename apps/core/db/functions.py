@@ -1,4 +1,4 @@
-from django.db.models import DateField, Field
+from django.db.models import Aggregate, DateField, Field, Func, JSONField, Value
 from django.db.models.functions.datetime import TruncBase
 
 
@@ -25,3 +25,40 @@ class TruncDateInTZ(TruncBase):
         tzname = self.tzinfo.tzname(None) if self.tzinfo else None
         sql = connection.ops.datetime_cast_date_sql(lhs, tzname)
         return sql, lhs_params
+
+
+class PercentileCont(Aggregate):
+    """
+    Continuous percentile (with interpolation between adjacent values)
+    of the non-null values in the group. Works for numbers and intervals.
+    Example:
+        .aggregate(median=PercentileCont('execution_time', 0.5))
+        # Will produce the output
+        SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY "execution_time")
+    """
+    function = 'PERCENTILE_CONT'
+    name = 'PercentileCont'
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, fraction: float, **extra):
+        fraction = float(fraction)
+        if not 0 <= fraction <= 1:
+            raise ValueError("Fraction must be between 0 and 1")
+        super().__init__(expression, fraction=fraction, **extra)
+
+
+class JSONBDeleteKey(Func):
+    """
+    Removes the top-level key from the jsonb value in the database, so
+    concurrent updates of the other keys are not overwritten.
+    Example:
+        .update(meta=JSONBDeleteKey('meta', 'stats'))
+        # Will produce the output
+        UPDATE ... SET "meta" = ("meta" - 'stats')
+    """
+    template = "(%(expressions)s)"
+    arg_joiner = " - "
+    output_field: Field = JSONField()
+
+    def __init__(self, expression, key: str, **extra):
+        super().__init__(expression, Value(key), **extra)
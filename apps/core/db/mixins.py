@@ -1,8 +1,8 @@
 import logging
-from typing import TYPE_CHECKING, Iterable, Mapping, Set
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, NamedTuple, Optional, Set
 
 from django.core import checks
-from django.db import models
+from django.db import connections, models
 from django.db.models import prefetch_related_objects
 
 from core.tasks import compute_model_fields
@@ -16,11 +16,28 @@ else:
     ModelMixinBase = object
 
 
+class DerivableFieldAggregate(NamedTuple):
+    """
+    Set-based definition of the derivable field value: *aggregate* over
+    the *queryset* rows grouped by the *related_field* which refers to
+    the model with derivable field. *default* is used if no rows were found.
+    """
+    queryset: models.QuerySet
+    related_field: str
+    aggregate: models.Aggregate
+    default: Any = None
+
+
 class DerivableFieldsMixin(ModelMixinBase):
     """
     Before computing derivable field value make sure that any data this
     field depends on didn't cache (e.g. related queryset could be cached
     with .prefetch_related)
+
+    Derivable field could also provide set-based implementation with
+    `_aggregate_<field_name>` class method returning `DerivableFieldAggregate`,
+    in that case values could be recomputed for the whole queryset with a
+    single UPDATE statement, see `.bulk_compute_fields`
     """
     # TODO: Make as an abstract property
     derivable_fields: Iterable[str] = []
@@ -79,6 +96,70 @@ class DerivableFieldsMixin(ModelMixinBase):
 
         return False
 
+    @classmethod
+    def get_derivable_field_aggregate(cls, field_name: str) -> Optional[DerivableFieldAggregate]:
+        aggregate_method = getattr(cls, f'_aggregate_{field_name}', None)
+        if aggregate_method is None:
+            return None
+        return aggregate_method()
+
+    @classmethod
+    def bulk_compute_fields(cls, queryset: models.QuerySet,
+                            *derivable_fields: str) -> Dict[str, Dict[Any, Any]]:
+        """
+        Recomputes derivable fields for all objects of the *queryset*, each
+        field is updated with a single `UPDATE ... FROM (subquery)` statement.
+        Model save method is not called and signals are not sent.
+
+        Returns map of field name to the new values of the updated rows
+        by primary key. Rows with unchanged values are not updated.
+        """
+        result = {}
+        for field_name in derivable_fields or cls.derivable_fields:
+            aggregate = cls.get_derivable_field_aggregate(field_name)
+            if aggregate is None:
+                raise ValueError(f"{cls.__name__}.{field_name} doesn't support "
+                                 f"set-based computation")
+            result[field_name] = cls._bulk_update_derivable_field(queryset, field_name,
+                                                                  aggregate)
+        return result
+
+    @classmethod
+    def _bulk_update_derivable_field(cls, queryset: models.QuerySet, field_name: str,
+                                     aggregate: DerivableFieldAggregate) -> Dict[Any, Any]:
+        connection = connections[queryset.db]
+        qn = connection.ops.quote_name
+        field = cls._meta.get_field(field_name)
+        target = queryset.order_by().values('pk')
+        source = (aggregate.queryset
+                  .filter(**{f"{aggregate.related_field}__in": target})
+                  .order_by()
+                  .values(aggregate.related_field)
+                  .annotate(_derived_value=aggregate.aggregate)
+                  .values_list(aggregate.related_field, '_derived_value'))
+        target_sql, target_params = target.query.get_compiler(connection=connection).as_sql()
+        source_sql, source_params = source.query.get_compiler(connection=connection).as_sql()
+        table = qn(cls._meta.db_table)
+        column = qn(field.column)
+        pk_column = qn(cls._meta.pk.column)
+        sql = f"""
+            UPDATE {table}
+            SET {column} = derived.value
+            FROM (
+                SELECT target.pk, COALESCE(source.value, %s) AS value
+                FROM ({target_sql}) AS target(pk)
+                LEFT JOIN ({source_sql}) AS source(fk, value) ON source.fk = target.pk
+            ) AS derived
+            WHERE {table}.{pk_column} = derived.pk
+              AND {table}.{column} IS DISTINCT FROM derived.value
+            RETURNING {table}.{pk_column}, {table}.{column}
+        """
+        default = field.get_db_prep_value(aggregate.default, connection)
+        params = (default, *target_params, *source_params)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return dict(cursor.fetchall())
+
     def compute_fields_async(self, *derivable_fields) -> None:
         from django.contrib.contenttypes.models import ContentType
         if not isinstance(self, models.Model):
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from django.db import connections
+
+from core.db.connections import get_connection_stats
+
+
+def _get_stats(alias="default"):
+    return next(s for s in get_connection_stats() if s.alias == alias)
+
+
+@pytest.mark.django_db
+def test_get_connection_stats(settings):
+    stats = _get_stats()
+    assert stats.connected
+    assert stats.age >= 0
+    assert stats.opened >= 1
+    connection = connections.create_connection("default")
+    try:
+        connection.ensure_connection()
+        assert _get_stats().opened == stats.opened + 1
+    finally:
+        connection.close()
+    assert _get_stats().max_age == settings.DATABASES["default"]["CONN_MAX_AGE"]
+
+
+@pytest.mark.django_db
+def test_readiness(client):
+    response = client.get("/readiness/")
+    assert response.status_code == 200
+    data = json.loads(response.content)
+    assert data["status"] == "OK"
+    stats = data["databases"][0]
+    assert stats["alias"] == "default"
+    assert stats["connected"]
+    assert {"age", "opened", "max_age", "health_checks"} <= set(stats)
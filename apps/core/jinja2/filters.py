@@ -3,11 +3,16 @@ from sorl.thumbnail import get_thumbnail
 
 from django.utils.timezone import now
 
-from core.utils import get_youtube_video_id, render_markdown_and_cache
+from core.markdown import render_markdown_cached
+from core.utils import get_youtube_video_id
 
 
-def markdown(value, fragment_name, expires_in=0, *vary_on):
-    return mark_safe(render_markdown_and_cache(value, fragment_name, expires_in, *vary_on))
+def markdown(value):
+    """
+    Renders markdown with content-addressed caching, the cache key is
+    derived from the text itself.
+    """
+    return mark_safe(render_markdown_cached(value))
 
 
 def pluralize(number, singular, genitive_singular, genitive_plural):
@@ -0,0 +1,285 @@
+"""
+Outgoing mail dispatcher for transactional emails.
+
+Messages are put to the redis outbox of the given priority and delivered
+by the `dispatch_emails` job in batches over a single connection, so a
+burst of emails (e.g. mass invitations) doesn't open a new SMTP connection
+per message. The job is enqueued to the rq queue named after the priority
+and delivers messages of the higher priority first, even those queued
+during delivery of the lower priority batch.
+
+Delivery is acknowledged: the batch is moved to the processing list and
+removed from it only after delivery. Only one dispatcher runs at a time,
+so messages left in the processing list by a crashed or timed out
+dispatcher are put back to the outbox by the next one, see also
+`recover_outbox` called on worker startup.
+
+Each message is retried independently: failed messages wait in the delayed
+set scored by the time of the next attempt, the delay is doubled after each
+failure. Due messages are moved back to the outbox by the dispatcher, which
+is scheduled to run when the earliest of them is due. Messages are moved to
+the dead-letter list once `EMAIL_MAX_ATTEMPTS` is reached.
+"""
+import datetime
+import logging
+import math
+import pickle
+import smtplib
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from django.core.mail import EmailMessage, get_connection
+from django_rq import get_queue
+from redis.exceptions import LockError
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PRIORITY_HIGH = 'high'
+EMAIL_PRIORITY_DEFAULT = 'default'
+# From the highest to the lowest, each priority is served by the rq queue
+# with the same name
+EMAIL_PRIORITIES = (EMAIL_PRIORITY_HIGH, EMAIL_PRIORITY_DEFAULT)
+
+EMAIL_OUTBOX_KEY = "email_outbox:{priority}"
+# Messages of the batch being delivered
+EMAIL_PROCESSING_KEY = "email_outbox:{priority}:processing"
+# Failed messages scored by the time of the next attempt
+EMAIL_DELAYED_KEY = "email_outbox:{priority}:delayed"
+# Messages that have exhausted all attempts, kept for inspection
+EMAIL_DEAD_LETTER_KEY = "email_outbox:dead_letter"
+# Set while the dispatch job is waiting in the queue to avoid enqueueing
+# a job per message
+EMAIL_DISPATCH_SCHEDULED_KEY = "email_outbox:{priority}:scheduled"
+EMAIL_DISPATCH_SCHEDULED_TIMEOUT = 300
+# Set while the delayed dispatch job is waiting for its time
+EMAIL_DISPATCH_RETRY_KEY = "email_outbox:{priority}:retry"
+# Held by the running dispatcher, prolonged after each batch
+EMAIL_DISPATCH_LOCK_KEY = "email_outbox:dispatch_lock"
+EMAIL_DISPATCH_LOCK_TIMEOUT = 300
+# Delay before the next attempt after the dispatcher failure
+EMAIL_DISPATCH_RETRY_DELAY = 60
+EMAIL_BATCH_SIZE = 50
+EMAIL_MAX_ATTEMPTS = 3
+# Delay before the second attempt in seconds, doubled after each failure
+EMAIL_RETRY_BACKOFF = 60
+
+
+class QueuedEmail(NamedTuple):
+    message: EmailMessage
+    priority: str
+    attempts: int = 0
+
+
+def _get_outbox_key(priority: str) -> str:
+    return EMAIL_OUTBOX_KEY.format(priority=priority)
+
+
+def _get_processing_key(priority: str) -> str:
+    return EMAIL_PROCESSING_KEY.format(priority=priority)
+
+
+def _get_delayed_key(priority: str) -> str:
+    return EMAIL_DELAYED_KEY.format(priority=priority)
+
+
+def _get_scheduled_key(priority: str) -> str:
+    return EMAIL_DISPATCH_SCHEDULED_KEY.format(priority=priority)
+
+
+def _get_retry_key(priority: str) -> str:
+    return EMAIL_DISPATCH_RETRY_KEY.format(priority=priority)
+
+
+def send_transactional_emails(messages: Iterable[EmailMessage], *,
+                              priority: str = EMAIL_PRIORITY_DEFAULT) -> None:
+    assert priority in EMAIL_PRIORITIES
+    emails = [QueuedEmail(message=message, priority=priority) for message in messages]
+    if not emails:
+        return
+    queue = get_queue(priority)
+    if not queue.is_async:
+        # Jobs are executed in place, deliver messages without the outbox
+        # since it's shared between processes. Failed messages are retried
+        # by the dispatcher
+        with get_connection() as connection:
+            failed = _send(connection, emails)
+        if failed:
+            pipeline = queue.connection.pipeline(transaction=True)
+            _put_failed(pipeline, failed)
+            pipeline.execute()
+            _schedule_delayed_dispatch(queue.connection, (priority,))
+        return
+    queue.connection.rpush(_get_outbox_key(priority), *(pickle.dumps(e) for e in emails))
+    _schedule_dispatch(priority)
+
+
+def send_transactional_email(message: EmailMessage, *,
+                             priority: str = EMAIL_PRIORITY_DEFAULT) -> None:
+    send_transactional_emails([message], priority=priority)
+
+
+def _schedule_dispatch(priority: str, *, force: bool = False,
+                       delay: Optional[int] = None) -> None:
+    """
+    Enqueues the dispatch job unless it's already waiting in the queue.
+    Set `force=True` if the scheduled job could be lost.
+    """
+    queue = get_queue(priority)
+    if delay is not None:
+        if queue.connection.set(_get_retry_key(priority), 1, nx=True, ex=delay):
+            queue.enqueue_in(datetime.timedelta(seconds=delay), dispatch_emails, priority)
+        return
+    scheduled = queue.connection.set(_get_scheduled_key(priority), 1, nx=not force,
+                                     ex=EMAIL_DISPATCH_SCHEDULED_TIMEOUT)
+    if scheduled:
+        queue.enqueue(dispatch_emails, priority)
+
+
+def dispatch_emails(priority: str) -> None:
+    """
+    Delivers messages from the outbox of the given or higher priority
+    until the outbox is empty.
+    """
+    redis = get_queue(priority).connection
+    # Messages queued from now on must schedule the next job
+    redis.delete(_get_scheduled_key(priority), _get_retry_key(priority))
+    lock = redis.lock(EMAIL_DISPATCH_LOCK_KEY, timeout=EMAIL_DISPATCH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        # The running dispatcher checks the outbox before exit, retry
+        # later in case it has died with the lock
+        lock_ttl = redis.pttl(EMAIL_DISPATCH_LOCK_KEY)
+        _schedule_dispatch(priority, delay=max(lock_ttl, 0) // 1000 + 1)
+        return
+    priorities = EMAIL_PRIORITIES[:EMAIL_PRIORITIES.index(priority) + 1]
+    failed = True
+    try:
+        # Left by the dispatcher that has crashed or timed out, the job
+        # of the lower priority could be lost as well
+        priorities += tuple(p for p in _requeue_processing(redis) if p not in priorities)
+        _move_due(redis, priorities)
+        with get_connection() as connection:
+            while batch := _move_batch(redis, priorities):
+                batch_priority, values = batch
+                emails = [pickle.loads(value) for value in values]
+                failed = _send(connection, emails)
+                _acknowledge(redis, batch_priority, values, failed)
+                lock.reacquire()
+        failed = False
+    finally:
+        _requeue_processing(redis)
+        try:
+            lock.release()
+        except LockError:
+            logger.warning("Email dispatch lock has expired before release")
+        for p in (EMAIL_PRIORITIES if failed else priorities):
+            if redis.llen(_get_outbox_key(p)):
+                _schedule_dispatch(p, delay=EMAIL_DISPATCH_RETRY_DELAY if failed else None)
+        _schedule_delayed_dispatch(redis, priorities)
+
+
+def recover_outbox() -> None:
+    """
+    Schedules delivery of messages left by the dispatch job which could
+    be lost along with the worker.
+    """
+    redis = get_queue(EMAIL_PRIORITY_DEFAULT).connection
+    for priority in EMAIL_PRIORITIES:
+        if (redis.llen(_get_outbox_key(priority)) or redis.llen(_get_processing_key(priority))
+                or redis.zcard(_get_delayed_key(priority))):
+            _schedule_dispatch(priority, force=True)
+
+
+def _schedule_delayed_dispatch(redis, priorities: Iterable[str]) -> None:
+    """Schedules the dispatch job at the time the earliest delayed message is due."""
+    for priority in priorities:
+        earliest = redis.zrange(_get_delayed_key(priority), 0, 0, withscores=True)
+        if earliest:
+            _, retry_at = earliest[0]
+            _schedule_dispatch(priority, delay=max(math.ceil(retry_at - time.time()), 1))
+
+
+def _move_due(redis, priorities: Iterable[str]) -> None:
+    """Moves delayed messages that are due to the end of the outbox."""
+    now = time.time()
+    for priority in priorities:
+        delayed_key = _get_delayed_key(priority)
+        values = redis.zrangebyscore(delayed_key, '-inf', now)
+        if values:
+            pipeline = redis.pipeline(transaction=True)
+            pipeline.zrem(delayed_key, *values)
+            pipeline.rpush(_get_outbox_key(priority), *values)
+            pipeline.execute()
+
+
+def _move_batch(redis, priorities: Iterable[str]) -> Optional[Tuple[str, List[bytes]]]:
+    """Moves the next batch from the outbox to the processing list."""
+    for priority in priorities:
+        pipeline = redis.pipeline(transaction=False)
+        for _ in range(EMAIL_BATCH_SIZE):
+            pipeline.lmove(_get_outbox_key(priority), _get_processing_key(priority),
+                           "LEFT", "RIGHT")
+        values = [value for value in pipeline.execute() if value is not None]
+        if values:
+            return priority, values
+    return None
+
+
+def _acknowledge(redis, priority: str, values: List[bytes],
+                 failed: List[QueuedEmail]) -> None:
+    """
+    Removes processed messages from the processing list and delays failed
+    messages in one transaction.
+    """
+    pipeline = redis.pipeline(transaction=True)
+    for value in values:
+        pipeline.lrem(_get_processing_key(priority), 1, value)
+    _put_failed(pipeline, failed)
+    pipeline.execute()
+
+
+def _put_failed(pipeline, emails: Iterable[QueuedEmail]) -> None:
+    """
+    Delays the next attempt of failed messages, messages that have
+    exhausted all attempts are moved to the dead-letter list.
+    """
+    now = time.time()
+    for email in emails:
+        if email.attempts < EMAIL_MAX_ATTEMPTS:
+            retry_at = now + EMAIL_RETRY_BACKOFF * 2 ** (email.attempts - 1)
+            pipeline.zadd(_get_delayed_key(email.priority), {pickle.dumps(email): retry_at})
+        else:
+            logger.error(f"Email to {email.message.to} has been moved to the "
+                         f"dead-letter list after {email.attempts} attempts")
+            pipeline.rpush(EMAIL_DEAD_LETTER_KEY, pickle.dumps(email))
+
+
+def _requeue_processing(redis) -> List[str]:
+    """
+    Puts unacknowledged messages back to the head of the outbox. Returns
+    priorities of the requeued messages.
+    """
+    requeued = []
+    for priority in EMAIL_PRIORITIES:
+        while redis.lmove(_get_processing_key(priority), _get_outbox_key(priority),
+                          "RIGHT", "LEFT"):
+            if priority not in requeued:
+                requeued.append(priority)
+    return requeued
+
+
+def _send(connection, emails: Iterable[QueuedEmail]) -> List[QueuedEmail]:
+    """
+    Sends messages one by one over the open connection. Returns
+    failed messages with incremented number of attempts.
+    """
+    failed = []
+    for email in emails:
+        try:
+            # Reopens connection closed after the failure
+            connection.open()
+            connection.send_messages([email.message])
+        except (smtplib.SMTPException, OSError):
+            logger.exception(f"Failed to send email to {email.message.to}")
+            connection.close()
+            failed.append(email._replace(attempts=email.attempts + 1))
+    return failed
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import get_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Shows hit ratio and memory usage of each cache alias"
+
+    def handle(self, *args, **options):
+        for stats in get_cache_stats():
+            self.stdout.write(f"{stats.alias}: hits={stats.hits} "
+                              f"misses={stats.misses} hit_ratio={stats.hit_ratio} "
+                              f"keys={stats.keys} memory={stats.memory}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.markdown import MARKDOWN_RENDERER_VERSION, markdown_renderer
+
+
+class Command(BaseCommand):
+    help = "Shows hit/miss counters of the markdown render cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset counters after output')
+
+    def handle(self, *args, **options):
+        stats = markdown_renderer.stats.totals()
+        self.stdout.write(f"Renderer version: {MARKDOWN_RENDERER_VERSION}")
+        for name, value in stats.items():
+            self.stdout.write(f"{name}: {value}")
+        if options['reset']:
+            markdown_renderer.stats.reset()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core.profiling import (
+    ENDPOINT_SORT_KEYS, REQUEST_PROFILE_WINDOWS_TOTAL, get_worst_endpoints,
+    request_profile_stats
+)
+
+
+class Command(BaseCommand):
+    help = "Shows the slowest endpoints recorded by the request profiler"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', default='total_time', choices=ENDPOINT_SORT_KEYS,
+                            help='Sort endpoints by this value')
+        parser.add_argument('--limit', type=int, default=20,
+                            help='Max number of endpoints to show')
+        parser.add_argument('--windows', type=int, default=REQUEST_PROFILE_WINDOWS_TOTAL,
+                            help='Number of the latest hourly windows to aggregate')
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset stats after output')
+
+    def handle(self, *args, **options):
+        stats = request_profile_stats.totals(windows=options['windows'])
+        endpoints = get_worst_endpoints(stats, sort_by=options['sort'],
+                                        limit=options['limit'])
+        for e in endpoints:
+            self.stdout.write(
+                f"{e.view_name}: requests={e.requests} "
+                f"mean={e.mean_time * 1000:.1f}ms max={e.max_time * 1000:.1f}ms "
+                f"sql={e.mean_sql_time * 1000:.1f}ms queries={e.mean_queries:.1f} "
+                f"templates={e.mean_template_time * 1000:.1f}ms")
+            for sql, duplicates in e.top_duplicates:
+                self.stdout.write(f"    x{duplicates:.1f} {sql[:200]}")
+        if options['reset']:
+            request_profile_stats.reset()
@@ -1,4 +1,5 @@
 import ast
+import time
 
 from django.core.management.base import AppCommand, CommandError
 
@@ -43,11 +44,35 @@ class Command(AppCommand):
             custom_manager = custom_manager.filter(**queryset_filters)
         custom_manager = custom_manager.order_by()
 
+        derivable_fields = derivable_fields or list(model.derivable_fields)
+        bulk_fields = [f for f in derivable_fields
+                       if model.get_derivable_field_aggregate(f) is not None]
+        if bulk_fields:
+            total = custom_manager.count()
+        for field_name in bulk_fields:
+            started_at = time.monotonic()
+            updated = model.bulk_compute_fields(custom_manager, field_name)
+            self._report(model_name, field_name, len(updated[field_name]),
+                         total, time.monotonic() - started_at)
+
+        object_fields = [f for f in derivable_fields if f not in bulk_fields]
+        if not object_fields:
+            return
+        started_at = time.monotonic()
         count = 0
+        processed = 0
         # TODO: replace with `core.utils.queryset_iterator`
         for model_object in custom_manager.iterator():
-            count += int(model_object.compute_fields(*derivable_fields,
+            count += int(model_object.compute_fields(*object_fields,
                                                      prefetch=True))
+            processed += 1
             # TODO: pause?
 
-        self.stdout.write(f'Updated {model_name} objects: {count}')
+        self._report(model_name, ", ".join(object_fields), count, processed,
+                     time.monotonic() - started_at)
+
+    def _report(self, model_name, field_names, updated, processed, elapsed):
+        throughput = processed / elapsed if elapsed else processed
+        self.stdout.write(f'Updated {model_name} objects: {updated} '
+                          f'[{field_names}] processed {processed} '
+                          f'in {elapsed:.2f}s ({throughput:.0f} objects/s)')
@@ -0,0 +1,207 @@
+"""
+Markdown rendering service with content-addressed caching.
+
+Rendered html depends only on the source text and on the renderer
+configuration (markdown extras, allowed tags and attributes), so the cache
+key is a hash of the text plus `MARKDOWN_RENDERER_VERSION`. The same text
+is rendered once for all pages, all objects and all worker processes:
+
+    1. bounded in-process LRU cache
+    2. shared cache backend (`markdown_fragments` alias or `default`)
+    3. markdown2 + bleach + linkify
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import InvalidCacheBackendError, caches
+
+from core.utils import render_markdown
+
+logger = logging.getLogger(__name__)
+
+# Bump the version after changing markdown extras, allowed tags or attributes
+# to invalidate previously rendered fragments.
+MARKDOWN_RENDERER_VERSION = 1
+MARKDOWN_CACHE_KEY_PREFIX = "md"
+MARKDOWN_STATS_CACHE_KEY = "md_stats:{version}:{name}"
+# Local counters are flushed to the shared cache every N lookups
+MARKDOWN_STATS_FLUSH_INTERVAL = 100
+MARKDOWN_STATS_COUNTERS = ("lru_hits", "shared_hits", "misses")
+
+
+def get_markdown_cache():
+    try:
+        return caches['markdown_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def get_markdown_cache_key(text: str) -> str:
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return f"{MARKDOWN_CACHE_KEY_PREFIX}:{MARKDOWN_RENDERER_VERSION}:{digest}"
+
+
+class LRUCache:
+    """Thread-safe in-process cache bounded by the number of entries."""
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: str, value: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MarkdownCacheStats:
+    """
+    Hit/miss counters. Process-local values are accumulated and periodically
+    added to the shared cache, so `totals()` reflects all worker processes.
+    """
+    def __init__(self, flush_interval: int = MARKDOWN_STATS_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending = dict.fromkeys(MARKDOWN_STATS_COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str, delta: int = 1) -> None:
+        if not delta:
+            return
+        with self._lock:
+            self._pending[counter] += delta
+            should_flush = sum(self._pending.values()) >= self.flush_interval
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, dict.fromkeys(MARKDOWN_STATS_COUNTERS, 0)
+        cache = get_markdown_cache()
+        for name, delta in pending.items():
+            if not delta:
+                continue
+            key = MARKDOWN_STATS_CACHE_KEY.format(version=MARKDOWN_RENDERER_VERSION, name=name)
+            try:
+                cache.add(key, 0, timeout=None)
+                cache.incr(key, delta)
+            except ValueError:
+                # Key has been evicted between .add and .incr calls
+                cache.set(key, delta, timeout=None)
+            except Exception as e:
+                logger.warning("Failed to flush markdown cache stats: %s", e)
+
+    def totals(self) -> Dict[str, int]:
+        cache = get_markdown_cache()
+        keys = {name: MARKDOWN_STATS_CACHE_KEY.format(version=MARKDOWN_RENDERER_VERSION, name=name)
+                for name in MARKDOWN_STATS_COUNTERS}
+        values = cache.get_many(list(keys.values()))
+        with self._lock:
+            stats = {name: values.get(key, 0) + self._pending[name]
+                     for name, key in keys.items()}
+        lookups = sum(stats.values())
+        hits = stats["lru_hits"] + stats["shared_hits"]
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending = dict.fromkeys(MARKDOWN_STATS_COUNTERS, 0)
+        get_markdown_cache().delete_many([
+            MARKDOWN_STATS_CACHE_KEY.format(version=MARKDOWN_RENDERER_VERSION, name=name)
+            for name in MARKDOWN_STATS_COUNTERS
+        ])
+
+
+class MarkdownRenderer:
+    def __init__(self, lru_size: int, timeout: Optional[int]):
+        self.lru = LRUCache(maxsize=lru_size)
+        self.timeout = timeout
+        self.stats = MarkdownCacheStats()
+
+    def render(self, text: Optional[str]) -> str:
+        return self.render_many([text])[0]
+
+    def render_many(self, texts: Iterable[Optional[str]]) -> List[str]:
+        """
+        Renders list of texts at once, e.g. all comments of the
+        submission page. Makes at most one round trip to the shared cache.
+        """
+        texts = [text or "" for text in texts]
+        results: List[Optional[str]] = [None] * len(texts)
+        # cache key -> positions of the text in the input list
+        missing: Dict[str, List[int]] = {}
+        lru_hits = 0
+        for i, text in enumerate(texts):
+            if not text:
+                results[i] = ""
+                continue
+            cache_key = get_markdown_cache_key(text)
+            rendered = self.lru.get(cache_key)
+            if rendered is not None:
+                results[i] = rendered
+                lru_hits += 1
+            else:
+                missing.setdefault(cache_key, []).append(i)
+        self.stats.incr("lru_hits", lru_hits)
+        if not missing:
+            return results
+
+        shared_cache = get_markdown_cache()
+        found = shared_cache.get_many(list(missing))
+        self.stats.incr("shared_hits", sum(len(missing[k]) for k in found))
+        to_store = {}
+        misses = 0
+        for cache_key, positions in missing.items():
+            rendered = found.get(cache_key)
+            if rendered is None:
+                rendered = render_markdown(texts[positions[0]])
+                to_store[cache_key] = rendered
+                misses += len(positions)
+            self.lru.set(cache_key, rendered)
+            for i in positions:
+                results[i] = rendered
+        if to_store:
+            shared_cache.set_many(to_store, self.timeout)
+        self.stats.incr("misses", misses)
+        return results
+
+
+markdown_renderer = MarkdownRenderer(
+    lru_size=getattr(settings, "MARKDOWN_LRU_CACHE_SIZE", 1024),
+    timeout=getattr(settings, "MARKDOWN_CACHE_TIMEOUT", 7 * 24 * 3600))
+
+
+def render_markdown_cached(text: Optional[str]) -> str:
+    """Renders markdown with sanitized html output using shared cache."""
+    return markdown_renderer.render(text)
+
+
+def render_markdown_many(texts: Iterable[Optional[str]]) -> List[str]:
+    return markdown_renderer.render_many(texts)
+
+
+def get_markdown_cache_stats() -> Dict[str, int]:
+    return markdown_renderer.stats.totals()
@@ -55,12 +55,15 @@ class MenuItem(_MenuItem):
     def check(self, request):
         """Update menu item visibility for this request"""
         if self.permissions is not None:
-            self.visible = request.user.has_perms(self.permissions)
+            self.visible = self.has_perms(request)
         if callable(self.check_func):
             self.visible = self.check_func(request)
         if self.for_staff and not request.user.is_curator:
             self.visible = False
 
+    def has_perms(self, request: HttpRequest) -> bool:
+        return request.user.has_perms(self.permissions)
+
     def match_url(self, request: HttpRequest):
         """match url determines if this is selected"""
         matched = False
@@ -1,11 +1,20 @@
 import logging
+import random
+import time
 
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.http.response import (
-    HttpResponse, HttpResponseRedirect, HttpResponseServerError
+    HttpResponse, HttpResponseRedirect, HttpResponseServerError, JsonResponse
 )
 
+from core.db.connections import get_connection_stats
 from core.exceptions import Redirect
+from core.profiling import (
+    UNRESOLVED_VIEW_NAME, QueryCollector, RequestProfile, instrument_templates,
+    measure_templates, request_profile_stats
+)
 
 logger = logging.getLogger(__name__)
 
@@ -86,4 +95,38 @@ class HealthCheckMiddleware:
         except Exception as e:
             logger.exception(e)
             return HttpResponseServerError("db: cannot connect to database.")
-        return HttpResponse("OK")
+        databases = [stats._asdict() for stats in get_connection_stats()]
+        return JsonResponse({"status": "OK", "databases": databases})
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles a random sample of requests, see `core.profiling`.
+    Put it at the top of the `MIDDLEWARE` list to take into account
+    time spent in other middlewares.
+    """
+    def __init__(self, get_response):
+        if settings.REQUEST_PROFILER_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        instrument_templates()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_PROFILER_SAMPLE_RATE:
+            return self.get_response(request)
+        collector = QueryCollector()
+        started_at = time.perf_counter()
+        with connection.execute_wrapper(collector), measure_templates() as template_timer:
+            response = self.get_response(request)
+        total_time = time.perf_counter() - started_at
+        resolver_match = request.resolver_match
+        view_name = resolver_match.view_name if resolver_match else UNRESOLVED_VIEW_NAME
+        profile = RequestProfile(view_name=view_name or UNRESOLVED_VIEW_NAME,
+                                 total_time=total_time,
+                                 sql_time=collector.time,
+                                 queries=collector.total,
+                                 template_time=template_timer.time,
+                                 duplicates=collector.duplicates(),
+                                 statements=collector.statements)
+        request_profile_stats.add(profile)
+        return response
@@ -0,0 +1,320 @@
+"""
+Sampling request profiler. For a fraction of requests (see
+`REQUEST_PROFILER_SAMPLE_RATE` setting) it records the number of SQL
+queries, time spent in SQL, duplicated queries, template render time and
+total time. Numbers are aggregated per resolved URL name in the process
+memory and periodically merged into the shared cache, where they're
+stored in hourly windows.
+"""
+import contextlib
+import copy
+import functools
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.core.cache import caches
+
+from core.locks import acquire_cache_lock, release_cache_lock
+
+logger = logging.getLogger(__name__)
+
+# Bump the version after changing the structure of the aggregated stats
+REQUEST_PROFILE_VERSION = 1
+REQUEST_PROFILE_CACHE_KEY = "req_profile:{version}:{window}"
+REQUEST_PROFILE_FLUSH_LOCK = "req_profile_flush"
+# Length of the aggregation window in seconds
+REQUEST_PROFILE_WINDOW = 3600
+# Number of windows kept in the shared cache
+REQUEST_PROFILE_WINDOWS_TOTAL = 24
+# Local stats are merged into the shared cache every N profiled requests
+REQUEST_PROFILE_FLUSH_INTERVAL = 50
+# Max number of query fingerprints stored per endpoint
+REQUEST_PROFILE_MAX_FINGERPRINTS = 20
+UNRESOLVED_VIEW_NAME = "<unresolved>"
+
+_sql_literals_re = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_sql_in_list_re = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_whitespace_re = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Replaces literals with placeholders and collapses IN lists."""
+    sql = _sql_literals_re.sub("?", sql.replace("%s", "?"))
+    sql = _sql_in_list_re.sub("(...)", sql)
+    return _whitespace_re.sub(" ", sql).strip()
+
+
+def fingerprint_sql(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:12]
+
+
+class QueryCollector:
+    """
+    Database execute wrapper, see
+    https://docs.djangoproject.com/en/4.2/topics/db/instrumentation/
+    """
+    def __init__(self):
+        self.total = 0
+        self.time = 0.0
+        self.fingerprints: Counter = Counter()
+        self.statements: Dict[str, str] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started_at
+            self.total += 1
+            normalized = normalize_sql(sql)
+            fingerprint = fingerprint_sql(normalized)
+            self.fingerprints[fingerprint] += 1
+            self.statements.setdefault(fingerprint, normalized)
+
+    def duplicates(self) -> Dict[str, int]:
+        """Returns the number of extra executions of each repeated query."""
+        return {fp: n - 1 for fp, n in self.fingerprints.items() if n > 1}
+
+
+class TemplateTimer:
+    """
+    Measures time spent in rendering templates. Nested renders (includes
+    made with the backend API, form widgets) are counted once.
+    """
+    def __init__(self):
+        self.time = 0.0
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def measure(self) -> Iterator[None]:
+        if self._depth:
+            yield
+            return
+        self._depth += 1
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.time += time.perf_counter() - started_at
+
+
+_template_timer: ContextVar[Optional[TemplateTimer]] = ContextVar('template_timer', default=None)
+
+
+def _instrument_render(render):
+    @functools.wraps(render)
+    def wrapper(self, *args, **kwargs):
+        timer = _template_timer.get()
+        if timer is None:
+            return render(self, *args, **kwargs)
+        with timer.measure():
+            return render(self, *args, **kwargs)
+    wrapper._profiled = True
+    return wrapper
+
+
+def instrument_templates() -> None:
+    """
+    Wraps `render` of the template backends, so templates rendered with
+    `render()` shortcut are measured as well as template responses.
+    """
+    from django.template.backends.django import Template as DjangoTemplate
+    from django_jinja.backend import Template as JinjaTemplate
+    for template_class in (DjangoTemplate, JinjaTemplate):
+        if not getattr(template_class.render, '_profiled', False):
+            template_class.render = _instrument_render(template_class.render)
+
+
+@contextlib.contextmanager
+def measure_templates() -> Iterator[TemplateTimer]:
+    """Measures templates rendered in the current context."""
+    timer = TemplateTimer()
+    token = _template_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _template_timer.reset(token)
+
+
+class RequestProfile(NamedTuple):
+    view_name: str
+    total_time: float
+    sql_time: float
+    queries: int
+    template_time: float
+    duplicates: Dict[str, int]
+    statements: Dict[str, str]
+
+
+def _empty_endpoint_stats() -> Dict:
+    return {
+        "requests": 0,
+        "total_time": 0.0,
+        "max_time": 0.0,
+        "sql_time": 0.0,
+        "queries": 0,
+        "template_time": 0.0,
+        "duplicates": {},
+        "statements": {},
+    }
+
+
+def merge_endpoint_stats(target: Dict, source: Dict) -> Dict:
+    for name in ("requests", "total_time", "sql_time", "queries", "template_time"):
+        target[name] += source[name]
+    target["max_time"] = max(target["max_time"], source["max_time"])
+    duplicates = Counter(target["duplicates"])
+    duplicates.update(source["duplicates"])
+    top = dict(duplicates.most_common(REQUEST_PROFILE_MAX_FINGERPRINTS))
+    target["duplicates"] = top
+    statements = {**source["statements"], **target["statements"]}
+    target["statements"] = {fp: statements[fp] for fp in top if fp in statements}
+    return target
+
+
+def _get_window(timestamp: Optional[float] = None) -> int:
+    if timestamp is None:
+        timestamp = time.time()
+    return int(timestamp // REQUEST_PROFILE_WINDOW)
+
+
+def get_request_profile_cache_key(window: int) -> str:
+    return REQUEST_PROFILE_CACHE_KEY.format(version=REQUEST_PROFILE_VERSION,
+                                            window=window)
+
+
+class RequestProfileStats:
+    """
+    Process-local stats are accumulated and merged into the shared cache
+    every `flush_interval` profiled requests, so `totals()` reflects all
+    worker processes.
+    """
+    def __init__(self, flush_interval: int = REQUEST_PROFILE_FLUSH_INTERVAL,
+                 cache_alias: str = "default"):
+        self.flush_interval = flush_interval
+        self.cache_alias = cache_alias
+        self._pending: Dict[str, Dict] = {}
+        self._pending_requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def add(self, profile: RequestProfile) -> None:
+        source = {
+            "requests": 1,
+            "total_time": profile.total_time,
+            "max_time": profile.total_time,
+            "sql_time": profile.sql_time,
+            "queries": profile.queries,
+            "template_time": profile.template_time,
+            "duplicates": profile.duplicates,
+            "statements": {fp: profile.statements[fp] for fp in profile.duplicates},
+        }
+        with self._lock:
+            stats = self._pending.setdefault(profile.view_name, _empty_endpoint_stats())
+            merge_endpoint_stats(stats, source)
+            self._pending_requests += 1
+            should_flush = self._pending_requests >= self.flush_interval
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        # Merge is read-modify-write, concurrent flushes must be serialized
+        if not acquire_cache_lock(REQUEST_PROFILE_FLUSH_LOCK, timeout=10, cache=self.cache):
+            return
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._pending_requests = 0
+            if not pending:
+                return
+            key = get_request_profile_cache_key(_get_window())
+            stored = self.cache.get(key) or {}
+            for view_name, stats in pending.items():
+                merge_endpoint_stats(stored.setdefault(view_name, _empty_endpoint_stats()),
+                                     stats)
+            timeout = REQUEST_PROFILE_WINDOW * REQUEST_PROFILE_WINDOWS_TOTAL
+            self.cache.set(key, stored, timeout=timeout)
+        except Exception as e:
+            logger.warning("Failed to flush request profile stats: %s", e)
+        finally:
+            release_cache_lock(REQUEST_PROFILE_FLUSH_LOCK, cache=self.cache)
+
+    def totals(self, windows: int = REQUEST_PROFILE_WINDOWS_TOTAL) -> Dict[str, Dict]:
+        """Returns stats of the last *windows* windows merged by URL name."""
+        current = _get_window()
+        keys = [get_request_profile_cache_key(w)
+                for w in range(current - windows + 1, current + 1)]
+        result: Dict[str, Dict] = {}
+        with self._lock:
+            pending = copy.deepcopy(self._pending)
+        for source in (*self.cache.get_many(keys).values(), pending):
+            for view_name, stats in source.items():
+                merge_endpoint_stats(result.setdefault(view_name, _empty_endpoint_stats()),
+                                     stats)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending = {}
+            self._pending_requests = 0
+        current = _get_window()
+        self.cache.delete_many([
+            get_request_profile_cache_key(w)
+            for w in range(current - REQUEST_PROFILE_WINDOWS_TOTAL + 1, current + 1)
+        ])
+
+
+class EndpointSummary(NamedTuple):
+    view_name: str
+    requests: int
+    mean_time: float
+    max_time: float
+    total_time: float
+    mean_sql_time: float
+    mean_queries: float
+    mean_template_time: float
+    # Pairs of (normalized SQL, extra executions per request)
+    top_duplicates: List[Tuple[str, float]]
+
+
+ENDPOINT_SORT_KEYS = ("total_time", "mean_time", "max_time",
+                      "mean_sql_time", "mean_queries")
+
+
+def get_worst_endpoints(stats: Dict[str, Dict], *, sort_by: str = "total_time",
+                        limit: int = 20, top_duplicates: int = 3) -> List[EndpointSummary]:
+    if sort_by not in ENDPOINT_SORT_KEYS:
+        raise ValueError(f"Unknown sort key {sort_by}")
+    summaries = []
+    for view_name, s in stats.items():
+        requests = s["requests"]
+        if not requests:
+            continue
+        duplicates = Counter(s["duplicates"]).most_common(top_duplicates)
+        summaries.append(EndpointSummary(
+            view_name=view_name,
+            requests=requests,
+            mean_time=s["total_time"] / requests,
+            max_time=s["max_time"],
+            total_time=s["total_time"],
+            mean_sql_time=s["sql_time"] / requests,
+            mean_queries=s["queries"] / requests,
+            mean_template_time=s["template_time"] / requests,
+            top_duplicates=[(s["statements"].get(fp, fp), n / requests)
+                            for fp, n in duplicates],
+        ))
+    summaries.sort(key=lambda e: getattr(e, sort_by), reverse=True)
+    return summaries[:limit]
+
+
+request_profile_stats = RequestProfileStats()
@@ -1,6 +1,8 @@
+import csv
 import io
+from typing import Any, Iterable
 
-from django.http import FileResponse, HttpResponse
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from pandas import DataFrame, ExcelWriter
 
 
@@ -35,3 +37,22 @@ class DataFrameResponse:
             filename
         )
         return response
+
+
+class _Echo:
+    """Pseudo-buffer that returns the written value instead of storing it"""
+    def write(self, value):
+        return value
+
+
+def csv_streaming_response(rows: Iterable[Iterable[Any]],
+                           filename: str) -> StreamingHttpResponse:
+    """
+    Encodes rows to CSV lazily, so the response is sent while rows
+    are generated.
+    """
+    writer = csv.writer(_Echo())
+    response = StreamingHttpResponse((writer.writerow(row) for row in rows),
+                                     content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,122 @@
+import uuid
+
+import pytest
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+
+from core.cache import CachedValue, DataVersion, RedisCache, get_cache_stats
+from core.checks import check_shared_caches
+
+
+def test_cache_aliases_are_isolated():
+    caches['default'].set('key', 'default')
+    caches['permissions'].set('key', 'permissions')
+    caches['default'].clear()
+    assert caches['default'].get('key') is None
+    assert caches['permissions'].get('key') == 'permissions'
+
+
+def test_cache_stats():
+    cache = caches['reports']
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    assert cache.get('missing') is None
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 2}
+    stats = {s.alias: s for s in get_cache_stats()}
+    assert set(stats) == set(settings.CACHES)
+    assert stats['reports'].hits == 3
+    assert stats['reports'].misses == 2
+    assert stats['reports'].hit_ratio == 0.6
+    # Flushed counters are stored in the cache too
+    assert stats['reports'].keys == 4
+    assert stats['reports'].memory > 0
+    assert stats['permissions'].hits == 0
+    assert stats['permissions'].hit_ratio == 0.0
+
+
+def test_cache_stats_command(capsys):
+    caches['reports'].get('missing')
+    call_command('cache_stats')
+    stdout = capsys.readouterr().out
+    assert 'reports: hits=0 misses=1 hit_ratio=0.0' in stdout
+
+
+@pytest.fixture
+def redis_cache():
+    config = settings.RQ_QUEUES['default']
+    location = f"redis://{config['HOST']}:{config['PORT']}/{config['DB']}"
+    caches = [RedisCache(location, {"KEY_PREFIX": f"test_{uuid.uuid4().hex}_{i}",
+                                    "OPTIONS": {"password": config['PASSWORD']}})
+              for i in range(2)]
+    yield caches
+    for cache in caches:
+        cache.clear()
+
+
+def test_redis_cache(redis_cache):
+    cache, other_cache = redis_cache
+    cache.set('key', 'value')
+    other_cache.set('key', 'other value')
+    assert cache.get('key') == 'value'
+    assert cache.get_many(['key', 'missing']) == {'key': 'value'}
+    stats = cache.get_stats('test')
+    assert stats.hits == 2
+    assert stats.misses == 1
+    assert stats.keys == 1
+    assert stats.memory > 0
+    cache.clear()
+    assert cache.get('key') is None
+    assert other_cache.get('key') == 'other value'
+
+
+def test_check_shared_caches(settings):
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    errors = check_shared_caches(None)
+    assert [e.id for e in errors] == ['core.E401']
+    assert "'permissions'" in errors[0].msg
+    settings.CACHES = {
+        **settings.CACHES,
+        'permissions': {'BACKEND': 'core.cache.RedisCache',
+                        'LOCATION': 'redis://127.0.0.1:6379/0'},
+    }
+    assert not check_shared_caches(None)
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    errors = check_shared_caches(None)
+    assert [e.id for e in errors] == ['core.E401']
+    assert "'sessions'" in errors[0].msg
+
+
+@pytest.mark.django_db
+def test_cached_value(django_capture_on_commit_callbacks):
+    cached_value = CachedValue("test:{version}:{pk}", version=2, timeout=60)
+    assert cached_value.get_key(pk=1) == "test:2:1"
+    assert cached_value.get(lambda: None, pk=1) is None
+    assert cached_value.get(lambda: 'value', pk=1) == 'value'
+    assert cached_value.get(lambda: 'new value', pk=1) == 'value'
+    assert cached_value.get(lambda: 'other value', pk=2) == 'other value'
+    with django_capture_on_commit_callbacks() as callbacks:
+        cached_value.invalidate(pk=1)
+        # Cached before the transaction commit
+        assert cached_value.get(lambda: 'stale value', pk=1) == 'stale value'
+        cached_value.invalidate(pk=1)
+    # The key is deleted once after the commit
+    assert len(callbacks) == 1
+    for callback in callbacks:
+        callback()
+    assert cached_value.get(lambda: 'new value', pk=1) == 'new value'
+    assert cached_value.get(lambda: 'new value', pk=2) == 'other value'
+
+
+@pytest.mark.django_db
+def test_data_version(django_capture_on_commit_callbacks):
+    data_version = DataVersion("test:{version}:{pk}:data_version", version=1)
+    version = data_version.get(pk=1)
+    assert data_version.get(pk=1) == version
+    with django_capture_on_commit_callbacks(execute=True):
+        data_version.invalidate(pk=1)
+        new_version = data_version.get(pk=1)
+        assert new_version > version
+    assert data_version.get(pk=1) > new_version
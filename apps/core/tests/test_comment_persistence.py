@@ -0,0 +1,56 @@
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django_rq.queues import get_connection
+
+from core.comment_persistence import (
+    CACHE_KEY, HASH_N, add_to_gc, get_comment_hash, get_garbage_collection, get_hashes
+)
+
+
+@pytest.fixture
+def user_id():
+    # Redis is shared between test processes
+    user_id = random.randint(10 ** 9, 10 ** 10)
+    yield user_id
+    get_connection().delete(CACHE_KEY.format(user_id=user_id))
+
+
+def test_get_comment_hash():
+    assert get_comment_hash("new\n comment") == get_comment_hash("newcomment")
+
+
+def test_add_to_gc(user_id):
+    add_to_gc(user_id, "comment")
+    add_to_gc(user_id, "co mment")
+    assert get_hashes(user_id) == [get_comment_hash("comment")]
+    assert get_hashes(user_id + 1) == []
+    assert json.loads(get_garbage_collection(user_id)) == {get_comment_hash("comment"): 0}
+
+
+def test_add_to_gc_bounded(user_id):
+    for i in range(HASH_N + 5):
+        add_to_gc(user_id, f"comment {i}")
+    hashes = get_hashes(user_id)
+    assert len(hashes) == HASH_N
+    assert get_comment_hash("comment 0") not in hashes
+    assert get_comment_hash(f"comment {HASH_N + 4}") in hashes
+
+
+def test_add_to_gc_expired(user_id, mocker):
+    add_to_gc(user_id, "old comment")
+    mocked_time = mocker.patch('core.comment_persistence.time')
+    mocked_time.time.return_value = 10 ** 10
+    assert get_hashes(user_id) == []
+    add_to_gc(user_id, "comment")
+    assert get_hashes(user_id) == [get_comment_hash("comment")]
+    assert get_connection().zcard(CACHE_KEY.format(user_id=user_id)) == 1
+
+
+def test_add_to_gc_concurrent_writers(user_id):
+    comments = [f"comment {i}" for i in range(HASH_N)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda text: add_to_gc(user_id, text), comments))
+    assert set(get_hashes(user_id)) == {get_comment_hash(text) for text in comments}
@@ -0,0 +1,228 @@
+import pickle
+import smtplib
+import uuid
+
+import pytest
+from django_rq import get_queue
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocMemEmailBackend
+
+from core import mail as mail_module
+from core.mail import (
+    EMAIL_MAX_ATTEMPTS, EMAIL_PRIORITIES, EMAIL_PRIORITY_DEFAULT,
+    EMAIL_PRIORITY_HIGH, EMAIL_RETRY_BACKOFF, QueuedEmail, _get_delayed_key,
+    _get_outbox_key, _get_processing_key, _get_retry_key, _get_scheduled_key,
+    dispatch_emails, recover_outbox, send_transactional_email,
+    send_transactional_emails
+)
+
+
+class FlakyEmailBackend(LocMemEmailBackend):
+    """Fails to send the first attempts to recipients from the `failures`"""
+    failures = {}
+
+    def send_messages(self, messages):
+        for message in messages:
+            recipient = message.to[0]
+            if self.failures.get(recipient, 0) > 0:
+                self.failures[recipient] -= 1
+                raise smtplib.SMTPServerDisconnected(recipient)
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def flaky_email_backend(settings):
+    settings.EMAIL_BACKEND = 'core.tests.test_mail.FlakyEmailBackend'
+    FlakyEmailBackend.failures = {}
+    yield FlakyEmailBackend
+    FlakyEmailBackend.failures = {}
+
+
+@pytest.fixture
+def outbox_redis(monkeypatch):
+    # Keys are unique per test since redis is shared between test processes
+    prefix = uuid.uuid4().hex
+    for name in ('EMAIL_OUTBOX_KEY', 'EMAIL_PROCESSING_KEY', 'EMAIL_DELAYED_KEY',
+                 'EMAIL_DEAD_LETTER_KEY', 'EMAIL_DISPATCH_SCHEDULED_KEY',
+                 'EMAIL_DISPATCH_RETRY_KEY', 'EMAIL_DISPATCH_LOCK_KEY'):
+        monkeypatch.setattr(mail_module, name, f"{prefix}:{getattr(mail_module, name)}")
+    redis = get_queue(EMAIL_PRIORITY_DEFAULT).connection
+    yield redis
+    redis.delete(*redis.keys(f"{prefix}:*") or [prefix])
+
+
+def _push(redis, key, *to_emails, priority=EMAIL_PRIORITY_DEFAULT):
+    for to_email in to_emails:
+        email = QueuedEmail(message=_make_message(to_email), priority=priority)
+        redis.rpush(key, pickle.dumps(email))
+
+
+def _get_recipients(redis, key):
+    return [pickle.loads(value).message.to[0] for value in redis.lrange(key, 0, -1)]
+
+
+def _get_delayed_recipients(redis, key):
+    return [pickle.loads(value).message.to[0] for value in redis.zrange(key, 0, -1)]
+
+
+@pytest.fixture
+def mocked_time(mocker):
+    mocked = mocker.patch('core.mail.time')
+    mocked.time.return_value = 10 ** 9
+    return mocked.time
+
+
+def _make_message(to_email):
+    return EmailMessage('Subject', 'Body', 'noreply@example.com', [to_email])
+
+
+def test_send_transactional_emails():
+    mail.outbox = []
+    send_transactional_email(_make_message('a@example.com'),
+                             priority=EMAIL_PRIORITY_HIGH)
+    send_transactional_emails([_make_message('b@example.com'),
+                               _make_message('c@example.com')])
+    assert [m.to for m in mail.outbox] == [['a@example.com'], ['b@example.com'],
+                                           ['c@example.com']]
+
+
+def test_send_transactional_emails_retry(outbox_redis, flaky_email_backend, mocked_time):
+    mail.outbox = []
+    flaky_email_backend.failures = {'a@example.com': 1}
+    send_transactional_emails([_make_message('a@example.com'),
+                               _make_message('b@example.com')])
+    # Failure doesn't affect other messages, the failed one is delayed
+    assert [m.to for m in mail.outbox] == [['b@example.com']]
+    delayed_key = _get_delayed_key(EMAIL_PRIORITY_DEFAULT)
+    assert _get_delayed_recipients(outbox_redis, delayed_key) == ['a@example.com']
+    assert outbox_redis.exists(_get_retry_key(EMAIL_PRIORITY_DEFAULT))
+    mocked_time.return_value += EMAIL_RETRY_BACKOFF
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    assert [m.to for m in mail.outbox] == [['b@example.com'], ['a@example.com']]
+    assert not outbox_redis.zcard(delayed_key)
+
+
+def test_dispatch_emails_priority(outbox_redis):
+    mail.outbox = []
+    for priority, to_email in [(EMAIL_PRIORITY_DEFAULT, 'bulk@example.com'),
+                               (EMAIL_PRIORITY_HIGH, 'reset@example.com')]:
+        email = QueuedEmail(message=_make_message(to_email), priority=priority)
+        outbox_redis.rpush(_get_outbox_key(priority), pickle.dumps(email))
+    dispatch_emails(EMAIL_PRIORITY_HIGH)
+    # Lower priority messages are not delivered by the high priority job
+    assert [m.to for m in mail.outbox] == [['reset@example.com']]
+    assert outbox_redis.llen(_get_outbox_key(EMAIL_PRIORITY_DEFAULT)) == 1
+    email = QueuedEmail(message=_make_message('reset2@example.com'),
+                        priority=EMAIL_PRIORITY_HIGH)
+    outbox_redis.rpush(_get_outbox_key(EMAIL_PRIORITY_HIGH), pickle.dumps(email))
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    assert [m.to for m in mail.outbox] == [['reset@example.com'],
+                                           ['reset2@example.com'],
+                                           ['bulk@example.com']]
+    assert not outbox_redis.llen(_get_outbox_key(EMAIL_PRIORITY_DEFAULT))
+
+
+def test_dispatch_emails_retry(outbox_redis, flaky_email_backend, mocked_time):
+    mail.outbox = []
+    flaky_email_backend.failures = {'a@example.com': 2}
+    _push(outbox_redis, _get_outbox_key(EMAIL_PRIORITY_DEFAULT), 'a@example.com', 'b@example.com')
+    delayed_key = _get_delayed_key(EMAIL_PRIORITY_DEFAULT)
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    # Failed message is not retried in the same run
+    assert [m.to for m in mail.outbox] == [['b@example.com']]
+    assert not outbox_redis.llen(_get_outbox_key(EMAIL_PRIORITY_DEFAULT))
+    assert _get_delayed_recipients(outbox_redis, delayed_key) == ['a@example.com']
+    # Next dispatch is scheduled when the message is due
+    assert 0 < outbox_redis.ttl(_get_retry_key(EMAIL_PRIORITY_DEFAULT)) <= EMAIL_RETRY_BACKOFF
+    mocked_time.return_value += EMAIL_RETRY_BACKOFF - 1
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    assert len(mail.outbox) == 1
+    # SMTP server is still unavailable, the delay is doubled
+    mocked_time.return_value += 1
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    assert len(mail.outbox) == 1
+    _, retry_at = outbox_redis.zrange(delayed_key, 0, 0, withscores=True)[0]
+    assert retry_at == mocked_time.return_value + 2 * EMAIL_RETRY_BACKOFF
+    # Failure has cleared
+    mocked_time.return_value = retry_at
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    assert [m.to for m in mail.outbox] == [['b@example.com'], ['a@example.com']]
+    assert not outbox_redis.zcard(delayed_key)
+
+
+def test_dispatch_emails_dead_letter(outbox_redis, flaky_email_backend, mocked_time):
+    mail.outbox = []
+    flaky_email_backend.failures = {'a@example.com': EMAIL_MAX_ATTEMPTS}
+    _push(outbox_redis, _get_outbox_key(EMAIL_PRIORITY_DEFAULT), 'a@example.com')
+    delayed_key = _get_delayed_key(EMAIL_PRIORITY_DEFAULT)
+    for _ in range(EMAIL_MAX_ATTEMPTS):
+        dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+        mocked_time.return_value += 2 ** EMAIL_MAX_ATTEMPTS * EMAIL_RETRY_BACKOFF
+    assert not mail.outbox
+    assert not outbox_redis.zcard(delayed_key)
+    dead_letter = [pickle.loads(value) for value in
+                   outbox_redis.lrange(mail_module.EMAIL_DEAD_LETTER_KEY, 0, -1)]
+    assert [(e.message.to, e.attempts) for e in dead_letter] == [
+        (['a@example.com'], EMAIL_MAX_ATTEMPTS)
+    ]
+
+
+def test_dispatch_emails_failure(outbox_redis, mocker):
+    mail.outbox = []
+    outbox_key = _get_outbox_key(EMAIL_PRIORITY_DEFAULT)
+    _push(outbox_redis, outbox_key, 'a@example.com', 'b@example.com')
+    mocker.patch('core.mail._send', side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    # Unacknowledged messages are put back to the outbox and delivery
+    # is retried later
+    assert not mail.outbox
+    assert _get_recipients(outbox_redis, outbox_key) == ['a@example.com', 'b@example.com']
+    assert not outbox_redis.llen(_get_processing_key(EMAIL_PRIORITY_DEFAULT))
+    assert outbox_redis.exists(_get_retry_key(EMAIL_PRIORITY_DEFAULT))
+    assert not outbox_redis.exists(mail_module.EMAIL_DISPATCH_LOCK_KEY)
+
+
+def test_dispatch_emails_unacknowledged(outbox_redis):
+    mail.outbox = []
+    # Left by the dispatcher that has crashed
+    _push(outbox_redis, _get_processing_key(EMAIL_PRIORITY_HIGH), 'reset@example.com',
+          priority=EMAIL_PRIORITY_HIGH)
+    _push(outbox_redis, _get_outbox_key(EMAIL_PRIORITY_DEFAULT), 'bulk@example.com')
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    assert [m.to for m in mail.outbox] == [['reset@example.com'], ['bulk@example.com']]
+    for priority in EMAIL_PRIORITIES:
+        assert not outbox_redis.llen(_get_processing_key(priority))
+        assert not outbox_redis.llen(_get_outbox_key(priority))
+
+
+def test_dispatch_emails_locked(outbox_redis):
+    mail.outbox = []
+    outbox_key = _get_outbox_key(EMAIL_PRIORITY_DEFAULT)
+    _push(outbox_redis, outbox_key, 'a@example.com')
+    lock = outbox_redis.lock(mail_module.EMAIL_DISPATCH_LOCK_KEY, timeout=10)
+    assert lock.acquire(blocking=False)
+    dispatch_emails(EMAIL_PRIORITY_DEFAULT)
+    # Another dispatcher is running, check the outbox after lock expiration
+    assert not mail.outbox
+    assert outbox_redis.llen(outbox_key) == 1
+    assert 0 < outbox_redis.ttl(_get_retry_key(EMAIL_PRIORITY_DEFAULT)) <= 11
+    lock.release()
+
+
+def test_recover_outbox(outbox_redis):
+    mail.outbox = []
+    # Delayed message is not due yet
+    email = QueuedEmail(message=_make_message('b@example.com'),
+                        priority=EMAIL_PRIORITY_HIGH, attempts=1)
+    outbox_redis.zadd(_get_delayed_key(EMAIL_PRIORITY_HIGH), {pickle.dumps(email): 2 ** 40})
+    # Scheduled job has been lost along with the worker
+    outbox_redis.set(_get_scheduled_key(EMAIL_PRIORITY_DEFAULT), 1)
+    _push(outbox_redis, _get_processing_key(EMAIL_PRIORITY_DEFAULT), 'a@example.com')
+    recover_outbox()
+    assert [m.to for m in mail.outbox] == [['a@example.com']]
+    assert not outbox_redis.llen(_get_processing_key(EMAIL_PRIORITY_DEFAULT))
+    assert outbox_redis.zcard(_get_delayed_key(EMAIL_PRIORITY_HIGH)) == 1
+    assert outbox_redis.exists(_get_retry_key(EMAIL_PRIORITY_HIGH))
@@ -0,0 +1,72 @@
+import pytest
+
+from core.markdown import (
+    LRUCache, MarkdownRenderer, get_markdown_cache, get_markdown_cache_key,
+    render_markdown_cached
+)
+from core.utils import render_markdown
+
+
+@pytest.fixture()
+def renderer():
+    get_markdown_cache().clear()
+    return MarkdownRenderer(lru_size=2, timeout=60)
+
+
+def test_get_markdown_cache_key():
+    key = get_markdown_cache_key("**text**")
+    assert key == get_markdown_cache_key("**text**")
+    assert key != get_markdown_cache_key("**text** ")
+
+
+def test_lru_cache_is_bounded():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    assert lru.get("a") == "1"
+    lru.set("c", "3")
+    assert len(lru) == 2
+    # `b` is the least recently used key
+    assert lru.get("b") is None
+    assert lru.get("a") == "1"
+    assert lru.get("c") == "3"
+
+
+def test_markdown_renderer_render(renderer, mocker):
+    mocked = mocker.patch('core.markdown.render_markdown', side_effect=render_markdown)
+    assert renderer.render("**bold**") == render_markdown("**bold**")
+    assert renderer.render("**bold**") == render_markdown("**bold**")
+    assert mocked.call_count == 1
+    assert renderer.render("") == ""
+    assert renderer.render(None) == ""
+    # Rendered fragment is shared with other processes
+    other_process_renderer = MarkdownRenderer(lru_size=2, timeout=60)
+    assert other_process_renderer.render("**bold**") == render_markdown("**bold**")
+    assert mocked.call_count == 1
+    assert render_markdown_cached("**bold**") == render_markdown("**bold**")
+
+
+def test_markdown_renderer_render_many(renderer, mocker):
+    mocked = mocker.patch('core.markdown.render_markdown', side_effect=render_markdown)
+    texts = ["*a*", "", "*b*", "*a*", "*c*"]
+    expected = [render_markdown(t) if t else "" for t in texts]
+    assert renderer.render_many(texts) == expected
+    assert mocked.call_count == 3
+    assert renderer.render_many(texts) == expected
+    assert mocked.call_count == 3
+    assert renderer.render_many([]) == []
+
+
+def test_markdown_renderer_stats(renderer):
+    renderer.stats.reset()
+    renderer.render_many(["*a*", "*b*"])
+    renderer.render("*a*")
+    renderer.lru.clear()
+    renderer.render("*b*")
+    stats = renderer.stats.totals()
+    assert stats["misses"] == 2
+    assert stats["lru_hits"] == 1
+    assert stats["shared_hits"] == 1
+    assert stats["hit_ratio"] == 0.5
+    renderer.stats.flush()
+    assert renderer.stats.totals() == stats
@@ -0,0 +1,120 @@
+import pytest
+
+from django.core import management
+from django.http import HttpResponse
+from django.template import engines
+
+from core.middleware import RequestProfilerMiddleware
+from core.profiling import (
+    UNRESOLVED_VIEW_NAME, RequestProfile, RequestProfileStats, TemplateTimer,
+    fingerprint_sql, get_worst_endpoints, normalize_sql, request_profile_stats
+)
+from core.urls import reverse
+from courses.tests.factories import CourseFactory
+from users.tests.factories import CuratorFactory, StudentFactory
+
+
+def test_normalize_sql():
+    sql = """SELECT "t"."id" FROM "t"  WHERE "t"."id" IN (%s, %s, %s) AND "t"."name" = 'it''s' LIMIT 21"""
+    assert normalize_sql(sql) == """SELECT "t"."id" FROM "t" WHERE "t"."id" IN (...) AND "t"."name" = ? LIMIT ?"""
+    assert (fingerprint_sql(normalize_sql("SELECT 1 FROM t2 WHERE id = 5")) ==
+            fingerprint_sql(normalize_sql("SELECT 1 FROM t2 WHERE id = 42")))
+
+
+def _profile(view_name, total_time, duplicates=None):
+    duplicates = duplicates or {}
+    return RequestProfile(view_name=view_name, total_time=total_time, sql_time=total_time / 2,
+                          queries=10, template_time=0.1, duplicates=duplicates,
+                          statements={fp: f"SELECT {fp}" for fp in duplicates})
+
+
+def test_request_profile_stats():
+    stats = RequestProfileStats(flush_interval=3)
+    stats.reset()
+    stats.add(_profile("fast", 0.1))
+    stats.add(_profile("slow", 1.0, duplicates={"a": 4}))
+    totals = stats.totals()
+    assert totals["slow"]["requests"] == 1
+    # Flushed to the shared cache
+    stats.add(_profile("slow", 2.0, duplicates={"a": 2, "b": 1}))
+    assert stats.totals() == RequestProfileStats().totals()
+    endpoints = get_worst_endpoints(stats.totals(), sort_by="mean_time")
+    assert [e.view_name for e in endpoints] == ["slow", "fast"]
+    slow = endpoints[0]
+    assert slow.requests == 2
+    assert slow.mean_time == pytest.approx(1.5)
+    assert slow.max_time == 2.0
+    assert slow.mean_queries == 10
+    assert slow.top_duplicates == [("SELECT a", 3.0), ("SELECT b", 0.5)]
+    stats.reset()
+    assert stats.totals() == {}
+
+
+@pytest.mark.django_db
+def test_request_profiler_middleware(client, settings):
+    request_profile_stats.reset()
+    settings.REQUEST_PROFILER_SAMPLE_RATE = 1
+    course = CourseFactory()
+    client.login(CuratorFactory())
+    response = client.get(course.get_absolute_url())
+    assert response.status_code == 200
+    stats = request_profile_stats.totals()
+    assert "courses:course_detail" in stats
+    course_detail = stats["courses:course_detail"]
+    assert course_detail["requests"] == 1
+    assert course_detail["queries"] > 0
+    assert 0 < course_detail["sql_time"] < course_detail["total_time"]
+    assert 0 < course_detail["template_time"] < course_detail["total_time"]
+    settings.REQUEST_PROFILER_SAMPLE_RATE = 0
+    client.get(course.get_absolute_url())
+    assert request_profile_stats.totals()["courses:course_detail"]["requests"] == 1
+    request_profile_stats.reset()
+
+
+def test_template_timer(mocker):
+    mocked_time = mocker.patch('core.profiling.time')
+    mocked_time.perf_counter.side_effect = [1.0, 3.0]
+    timer = TemplateTimer()
+    with timer.measure():
+        # Nested render is a part of the outer one
+        with timer.measure():
+            pass
+    assert timer.time == 2.0
+
+
+def test_request_profiler_middleware_render(rf, settings):
+    request_profile_stats.reset()
+    settings.REQUEST_PROFILER_SAMPLE_RATE = 1
+
+    def view(request):
+        # Rendered without the template response
+        template = engines['jinja2'].from_string("{{ value }}")
+        return HttpResponse(template.render({'value': 'rendered'}, request))
+
+    middleware = RequestProfilerMiddleware(view)
+    request = rf.get('/')
+    request.resolver_match = None
+    response = middleware(request)
+    assert response.content == b'rendered'
+    stats = request_profile_stats.totals()[UNRESOLVED_VIEW_NAME]
+    assert 0 < stats["template_time"] <= stats["total_time"]
+    request_profile_stats.reset()
+
+
+@pytest.mark.django_db
+def test_request_profile_stats_view_and_command(client, capsys):
+    request_profile_stats.reset()
+    request_profile_stats.add(_profile("slow", 1.0, duplicates={"a": 4}))
+    url = reverse("staff:request_profile")
+    client.login(StudentFactory())
+    assert client.get(url).status_code == 403
+    client.login(CuratorFactory())
+    response = client.get(url, {"sort": "mean_queries"})
+    assert response.status_code == 200
+    assert [e.view_name for e in response.context["endpoints"]] == ["slow"]
+    assert "SELECT a" in response.content.decode()
+    management.call_command("request_profile_stats", "--reset")
+    out = capsys.readouterr().out
+    assert "slow: requests=1" in out
+    assert "x4.0 SELECT a" in out
+    assert request_profile_stats.totals() == {}
@@ -0,0 +1,32 @@
+import pytest
+from django_rq.queues import get_connection
+from rq import Queue
+
+from core.workers import PersistentConnectionWorker, Worker
+
+
+@pytest.mark.django_db
+def test_persistent_connection_worker(mocker):
+    close_old_connections = mocker.patch("core.workers.close_old_connections")
+    queue = Queue("test_persistent_connection_worker", connection=get_connection())
+    queue.empty()
+    job = queue.enqueue(sum, [1, 2])
+    worker = PersistentConnectionWorker([queue], connection=queue.connection)
+    worker.work(burst=True)
+    job.refresh()
+    assert job.is_finished
+    assert job.return_value() == 3
+    # Obsolete connections are closed before and after the job
+    assert close_old_connections.call_count == 2
+
+
+@pytest.mark.parametrize("worker_class", [Worker, PersistentConnectionWorker])
+def test_worker_recovers_outbox(worker_class, mocker):
+    recover_outbox = mocker.patch("core.workers.recover_outbox")
+    queue = Queue("test_worker_recovers_outbox", connection=get_connection())
+    worker = worker_class([queue], connection=queue.connection)
+    worker.register_birth()
+    try:
+        recover_outbox.assert_called_once_with()
+    finally:
+        worker.register_death()
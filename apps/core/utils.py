@@ -12,13 +12,11 @@ from bleach.linkifier import Linker
 from markdown2 import Markdown
 import sqids.constants
 from django.conf import settings
-from django.core.cache import InvalidCacheBackendError, caches
 from django.core.mail import EmailMultiAlternatives
 from django.db.models import Max, Min
 from django.template import loader
 from django.utils import formats
 from django.utils.html import linebreaks, strip_tags
-from django_jinja.builtins.extensions import make_template_fragment_key
 from sqids import Sqids
 
 logger = logging.getLogger(__name__)
@@ -103,20 +101,6 @@ def render_markdown(text):
     return markdown_linker.linkify(cleaned)
 
 
-def render_markdown_and_cache(value, fragment_name, expires_in=0, *vary_on):
-    try:
-        fragment_cache = caches['markdown_fragments']
-    except InvalidCacheBackendError:
-        fragment_cache = caches['default']
-    cache_key = make_template_fragment_key(fragment_name, vary_on)
-    rendered = fragment_cache.get(cache_key)
-    if rendered is None:
-        rendered = render_markdown(value)
-        fragment_cache.set(cache_key, rendered, expires_in)
-    # TODO: think about escaping
-    return rendered
-
-
 def admin_datetime(dt: datetime.datetime) -> str:
     return formats.date_format(dt, 'j E Y г. G:i e')
 
@@ -289,6 +273,19 @@ class instance_memoize:
             cache[key] = self.func(*args, **kwargs)
         return cache[key]
 
+    @classmethod
+    def set_cache(cls, instance, method, value, *args, **kwargs):
+        """
+        Stores *value* as the result of the memoized *method* call with
+        the given arguments, e.g.
+            instance_memoize.set_cache(user, User.get_student_profile, None)
+        """
+        try:
+            cache = instance._instance_memoize_cache
+        except AttributeError:
+            cache = instance._instance_memoize_cache = {}
+        cache[(method, args, frozenset(kwargs.items()))] = value
+
     @classmethod
     def delete_cache(cls, instance):
         cache_attr_name = "_instance_memoize_cache"
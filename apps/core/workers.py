@@ -0,0 +1,32 @@
+from rq import SimpleWorker
+from rq import Worker as _Worker
+
+from django.db import close_old_connections
+
+from core.mail import recover_outbox
+
+
+class OutboxRecoveryMixin:
+    def register_birth(self):
+        super().register_birth()
+        # Email dispatch job could be lost along with the previous worker
+        recover_outbox()
+
+
+class Worker(OutboxRecoveryMixin, _Worker):
+    pass
+
+
+class PersistentConnectionWorker(OutboxRecoveryMixin, SimpleWorker):
+    """
+    Executes jobs in the worker process instead of the forked work horse,
+    so database connections are reused between jobs. As with requests,
+    obsolete and broken connections are closed before and after each job
+    (see `CONN_MAX_AGE` and `CONN_HEALTH_CHECKS` settings).
+    """
+    def execute_job(self, job, queue):
+        close_old_connections()
+        try:
+            return super().execute_job(job, queue)
+        finally:
+            close_old_connections()
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from core.utils import render_markdown_and_cache
+from core.markdown import render_markdown_cached
 from courses.models import Assignment, Course, CourseTeacher, Semester
 
 
@@ -54,5 +54,4 @@ class BaseAssignmentSerializer(serializers.ModelSerializer):
                   'maximum_score', 'weight', 'solution_format')
 
     def get_text(self, obj: Assignment):
-        return render_markdown_and_cache(obj.text, "assignment_text", 3600,
-                                         obj.pk, obj.modified)
+        return render_markdown_cached(obj.text)
@@ -2,14 +2,12 @@
 
 from django.core.management import BaseCommand
 
-from courses.models import Semester
-from courses.utils import get_term_index
+from courses.services import recalculate_semester_indexes
 
 
 class Command(BaseCommand):
     help = "Recalculates `Semester.index` values used for ordering/filtering"
 
     def handle(self, *args, **options):
-        for term in Semester.objects.all():
-            term.index = get_term_index(term.year, term.type)
-            term.save(update_fields=['index'])
+        updated = recalculate_semester_indexes()
+        self.stdout.write(f"Updated semesters: {updated}")
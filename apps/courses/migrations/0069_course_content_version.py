@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-19 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0068_delete_coursebranch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='content_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -6,10 +6,11 @@ from bitfield import BitField
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
 from django.utils import timezone
 from django.utils.encoding import smart_str
 from django.utils.functional import cached_property
@@ -20,7 +21,7 @@ from model_utils.models import TimeStampedModel
 from sorl.thumbnail import ImageField
 
 from core.db.fields import TimeZoneField
-from core.db.mixins import DerivableFieldsMixin
+from core.db.mixins import DerivableFieldAggregate, DerivableFieldsMixin
 from core.models import LATEX_MARKDOWN_HTML_ENABLED, Location, AcademicProgram
 from core.timezone import TimezoneAwareMixin, now_local, UTC
 from core.timezone.fields import TimezoneAwareDateTimeField
@@ -79,6 +80,10 @@ class LearningSpace(TimezoneAwareMixin, models.Model):
         return self.location.name
 
 
+def get_semester_cache_key(term_pair: TermPair) -> str:
+    return f"semester:{term_pair.year}:{term_pair.type}"
+
+
 class Semester(models.Model):
     year = models.PositiveSmallIntegerField(
         _("Year"),
@@ -128,9 +133,27 @@ class Semester(models.Model):
 
     @classmethod
     def get_current(cls, tz: tzinfo = settings.DEFAULT_TIMEZONE):
+        """
+        Returns semester of the current term. Semester is cached until
+        the end of the term, cache is invalidated on semester update.
+        """
         term_pair = get_current_term_pair(tz)
-        obj, created = cls.objects.get_or_create(year=term_pair.year,
-                                                 type=term_pair.type)
+        cache_key = get_semester_cache_key(term_pair)
+        obj = cache.get(cache_key)
+        if obj is not None:
+            return obj
+        try:
+            obj = cls.objects.get(year=term_pair.year, type=term_pair.type)
+        except cls.DoesNotExist:
+            # The first call in a new term. Don't cache a new record since
+            # transaction could be rolled back.
+            obj, created = cls.objects.get_or_create(year=term_pair.year,
+                                                     type=term_pair.type)
+            return obj
+        # Keep the value until the term ends in any timezone
+        ends_at = term_pair.get_next().starts_at(UTC)
+        timeout = (ends_at - timezone.now()).total_seconds() + 24 * 3600
+        cache.set(cache_key, obj, timeout=max(int(timeout), 60))
         return obj
 
     def is_current(self, tz: tzinfo = settings.DEFAULT_TIMEZONE):
@@ -324,6 +347,9 @@ class Course(TimezoneAwareMixin, TimeStampedModel, DerivableFieldsMixin):
         help_text="Helpful for getting thumbnail on /videos/ page",
         blank=True)
     learners_count = models.PositiveIntegerField(editable=False, default=0)
+    # Increased on changes of the course content shown on the course
+    # page (classes, news, teachers, etc.), used as a part of cache keys.
+    content_version = models.PositiveBigIntegerField(editable=False, default=0)
 
     objects = CourseDefaultManager()
     tracker = FieldTracker(fields=['time_zone'])
@@ -369,6 +395,14 @@ class Course(TimezoneAwareMixin, TimeStampedModel, DerivableFieldsMixin):
         """
         return False
 
+    @classmethod
+    def _aggregate_learners_count(cls) -> DerivableFieldAggregate:
+        from learning.models import Enrollment
+        return DerivableFieldAggregate(queryset=Enrollment.active.all(),
+                                       related_field='course',
+                                       aggregate=Count('*'),
+                                       default=0)
+
     def save(self, *args, **kwargs):
         # Make sure `self.completed_at` always has value
         if self.semester_id and not self.completed_at:
@@ -471,7 +505,7 @@ class Course(TimezoneAwareMixin, TimeStampedModel, DerivableFieldsMixin):
     @instance_memoize
     def is_actual_teacher(self, teacher_id):
         for ct in self.course_teachers.all():
-            if ct.teacher.id == teacher_id:
+            if ct.teacher_id == teacher_id:
                 return not bool(ct.roles.spectator)
         return False
 
@@ -4,28 +4,35 @@ from auth.permissions import Permission, add_perm
 from courses.constants import MaterialVisibilityTypes
 from courses.models import Assignment, AssignmentAttachment, Course, CourseClass, CourseProgramBinding
 from learning.permissions import course_access_role, CourseRole
+from learning.services.membership_service import get_cached_course_access_role
 from users.models import User
 
 
+# Course roles with access to the materials of the course participants
+PRIVATE_MATERIALS_ROLES = frozenset({
+    CourseRole.TEACHER,
+    CourseRole.CURATOR,
+    CourseRole.STUDENT_REGULAR
+})
+# Course roles with access to the course page
+COURSE_VIEWER_ROLES = frozenset({
+    CourseRole.TEACHER,
+    CourseRole.CURATOR,
+    CourseRole.STUDENT_REGULAR,
+    CourseRole.STUDENT_RESTRICT,
+    CourseRole.STUDENT_CAN_ENROLL
+})
+
+
 def can_view_private_materials(user: User, course: Course) -> bool:
     role = course_access_role(user=user, course=course)
-    return role in {
-        CourseRole.TEACHER,
-        CourseRole.CURATOR,
-        CourseRole.STUDENT_REGULAR
-    }
+    return role in PRIVATE_MATERIALS_ROLES
 
 
 @predicate
 def can_view_course(user: User, course: Course) -> bool:
     role = course_access_role(user=user, course=course)
-    return role in {
-        CourseRole.TEACHER,
-        CourseRole.CURATOR,
-        CourseRole.STUDENT_REGULAR,
-        CourseRole.STUDENT_RESTRICT,
-        CourseRole.STUDENT_CAN_ENROLL
-    }
+    return role in COURSE_VIEWER_ROLES
 
 
 @add_perm
@@ -199,11 +206,14 @@ class ViewCourseClassMaterials(Permission):
     @predicate
     def rule(user, course_class: CourseClass):
         visibility = course_class.materials_visibility
+        if visibility not in (MaterialVisibilityTypes.PARTICIPANTS,
+                              MaterialVisibilityTypes.COURSE_PARTICIPANTS):
+            return False
+        # Checked on each file download, so the access role is cached
+        role = get_cached_course_access_role(course=course_class.course, user=user)
         if visibility == MaterialVisibilityTypes.PARTICIPANTS:
-            return user.has_perm(ViewCourse.name, course_class.course)
-        elif visibility == MaterialVisibilityTypes.COURSE_PARTICIPANTS:
-            return can_view_private_materials(user, course_class.course)
-        return False
+            return role in COURSE_VIEWER_ROLES
+        return role in PRIVATE_MATERIALS_ROLES
 
 
 @add_perm
@@ -5,10 +5,12 @@ from django_filters.rest_framework import FilterSet
 from rest_framework.exceptions import ValidationError
 
 from django.contrib.sites.models import Site
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch, Q, QuerySet
 
 from courses.managers import AssignmentQuerySet, CourseQuerySet, CourseTeacherQuerySet
-from courses.models import Assignment, Course, CourseTeacher
+from courses.models import (
+    Assignment, Course, CourseClass, CourseClassAttachment, CourseTeacher
+)
 from learning.managers import StudentAssignmentQuerySet
 from learning.models import StudentAssignment
 
@@ -61,6 +63,29 @@ def course_teachers_prefetch_queryset(*, role_priority: bool = True,
             .order_by(*order_by, 'teacher__last_name', 'teacher__first_name'))
 
 
+def course_classes_queryset(*, course_id: int) -> QuerySet:
+    """
+    Returns classes of the course with venue location. Attachments are
+    prefetched to the `attachments` attribute, the newest go first.
+    """
+    attachments = CourseClassAttachment.objects.order_by('-created')
+    return (CourseClass.objects
+            .filter(course_id=course_id)
+            .select_related('venue__location')
+            .prefetch_related(Prefetch('courseclassattachment_set',
+                                       queryset=attachments,
+                                       to_attr='attachments'))
+            .order_by('date', 'starts_at'))
+
+
+def get_course_classes(course: Course) -> List[CourseClass]:
+    classes = list(course_classes_queryset(course_id=course.pk))
+    for course_class in classes:
+        # See `CourseClass.get_available_materials`
+        course_class.attachments_count = len(course_class.attachments)
+    return classes
+
+
 class BaseAssignmentFilter(FilterSet):
     class Meta:
         model = Assignment
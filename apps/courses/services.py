@@ -1,12 +1,18 @@
 import datetime
-from django.db.models import Prefetch, prefetch_related_objects
-from typing import Dict, List
+import time
+from django.core.cache import cache
+from django.db.models import F, Prefetch, Value, prefetch_related_objects
+from django.db.models.functions import Greatest
+from django.utils.translation import get_language
+from typing import Any, Callable, Dict, Iterable, List
 
 from core.models import AcademicProgram
 from core.timezone import UTC
 from courses.constants import TeacherRoles
-from courses.models import Course, CourseReview
-from courses.utils import get_terms_in_range
+from courses.models import (
+    Course, CourseReview, CourseTeacher, Semester, get_semester_cache_key
+)
+from courses.utils import TermPair, get_term_index_expression, get_terms_in_range
 from learning.models import StudentGroup, StudentGroupAssignee
 
 
@@ -33,6 +39,62 @@ def group_teachers(teachers, multiple_roles=False) -> Dict[str, List]:
     return {k: v for k, v in grouped.items() if v}
 
 
+# Bump the version after changing structure of the cached values
+COURSE_CONTENT_CACHE_VERSION = 2
+COURSE_CONTENT_CACHE_KEY = "course_content:{version}:{course_id}:{content_version}:{language}:{part}"
+COURSE_CONTENT_CACHE_TIMEOUT = 24 * 3600
+
+
+def get_course_content_cache_key(course: Course, part: str) -> str:
+    return COURSE_CONTENT_CACHE_KEY.format(version=COURSE_CONTENT_CACHE_VERSION,
+                                           course_id=course.pk,
+                                           content_version=course.content_version,
+                                           language=get_language(),
+                                           part=part)
+
+
+def get_cached_course_content(course: Course, part: str,
+                              fetch: Callable[[], Any]) -> Any:
+    """
+    Returns role-independent part of the course page content. Cached value
+    becomes stale after incrementing the course content version.
+    """
+    cache_key = get_course_content_cache_key(course, part)
+    value = cache.get(cache_key)
+    if value is None:
+        value = fetch()
+        cache.set(cache_key, value, timeout=COURSE_CONTENT_CACHE_TIMEOUT)
+    return value
+
+
+def bump_course_content_version(course_ids: Iterable[int]) -> None:
+    """
+    Sets new content version based on the current time. Course instance
+    with outdated version could be saved later, the version must not
+    return to the value that was already used in cache keys.
+    """
+    now_us = time.time_ns() // 1000
+    (Course.objects
+     .filter(pk__in=course_ids)
+     .update(content_version=Greatest(F('content_version') + 1, Value(now_us))))
+
+
+def recalculate_semester_indexes() -> int:
+    """
+    Recalculates `Semester.index` values with one UPDATE statement.
+    Semesters with the actual index are not touched, so it's safe to run
+    on the live site. Returns the number of updated semesters.
+    """
+    index = get_term_index_expression()
+    outdated = Semester.objects.exclude(index=index)
+    term_pairs = [TermPair(year, term_type) for year, term_type
+                  in outdated.values_list('year', 'type')]
+    updated = outdated.update(index=index)
+    if updated:
+        cache.delete_many([get_semester_cache_key(t) for t in term_pairs])
+    return updated
+
+
 class CourseService:
 
     @staticmethod
@@ -44,9 +106,16 @@ class CourseService:
                          'course__semester__year', 'course__semester__type'))
         return list(reviews)
 
+    @staticmethod
+    def get_teachers(course) -> List[CourseTeacher]:
+        return list(CourseTeacher.objects
+                    .filter(course=course)
+                    .select_related("teacher")
+                    .order_by('teacher__last_name', 'teacher__first_name'))
+
     @staticmethod
     def get_contacts(course):
-        teachers_by_role = group_teachers(course.course_teachers.all())
+        teachers_by_role = group_teachers(CourseService.get_cached_teachers(course))
         if teachers_by_role.get(TeacherRoles.ORGANIZER, []):
             teachers_by_role = {
                 TeacherRoles.ORGANIZER: teachers_by_role[TeacherRoles.ORGANIZER]
@@ -56,14 +125,13 @@ class CourseService:
                 if len(ct.teacher.private_contacts.strip()) > 0]
 
     @staticmethod
-    def get_news(course):
-        return course.coursenews_set.all()
+    def get_cached_teachers(course) -> List[CourseTeacher]:
+        return get_cached_course_content(course, 'teachers',
+                                         lambda: CourseService.get_teachers(course))
 
     @staticmethod
-    def get_classes(course):
-        return (course.courseclass_set
-                .select_related("venue", "venue__location")
-                .order_by("date", "starts_at"))
+    def get_news(course):
+        return course.coursenews_set.all()
 
     @staticmethod
     def get_time_zones(course: Course) -> set[datetime.tzinfo]:
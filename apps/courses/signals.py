@@ -1,7 +1,14 @@
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from courses.models import Course, CourseProgramBinding
+from courses.models import (
+    Assignment, Course, CourseClass, CourseClassAttachment, CourseNews, CourseProgramBinding,
+    CourseReview, CourseTeacher, Semester, get_semester_cache_key
+)
+from courses.services import bump_course_content_version, recalculate_semester_indexes
+from users.models import User
 
 
 @receiver(post_save, sender=Course)
@@ -17,3 +24,74 @@ def update_binding_timezones(sender, instance: Course, created, *args, **kwargs)
             .replace(tzinfo=instance.time_zone)
         )
         binding.save()
+
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def invalidate_semester_cache(sender, instance: Semester, *args, **kwargs):
+    cache.delete(get_semester_cache_key(instance.term_pair))
+
+
+@receiver(post_save, sender=Semester)
+def recalculate_semester_indexes_on_create(sender, instance: Semester, created,
+                                           *args, **kwargs):
+    # Semesters inserted by data migrations or bulk operations bypass
+    # `Semester.save`, fix their indexes along with a new semester
+    if created:
+        transaction.on_commit(recalculate_semester_indexes)
+
+
+@receiver(post_save, sender=Course)
+def bump_course_content_version_on_course_save(sender, instance: Course, update_fields=None,
+                                               *args, **kwargs):
+    # Derivable fields are not a part of the cached content
+    if update_fields and set(update_fields) <= set(Course.derivable_fields):
+        return
+    bump_course_content_version([instance.pk])
+
+
+@receiver(post_save, sender=CourseClass)
+@receiver(post_delete, sender=CourseClass)
+@receiver(post_save, sender=CourseNews)
+@receiver(post_delete, sender=CourseNews)
+@receiver(post_save, sender=CourseTeacher)
+@receiver(post_delete, sender=CourseTeacher)
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+def bump_course_content_version_on_change(sender, instance, *args, **kwargs):
+    bump_course_content_version([instance.course_id])
+
+
+@receiver(post_save, sender=CourseClassAttachment)
+@receiver(post_delete, sender=CourseClassAttachment)
+def bump_course_content_version_on_class_attachment_change(sender, instance: CourseClassAttachment,
+                                                           *args, **kwargs):
+    course_ids = (CourseClass.objects
+                  .filter(pk=instance.course_class_id)
+                  .values_list('course_id', flat=True))
+    bump_course_content_version(course_ids)
+
+
+@receiver(post_save, sender=CourseReview)
+@receiver(post_delete, sender=CourseReview)
+def bump_course_content_version_on_review_change(sender, instance: CourseReview, *args, **kwargs):
+    # Reviews are shown on the pages of all course offerings
+    meta_courses = (Course.objects
+                    .filter(pk=instance.course_id)
+                    .values('meta_course_id'))
+    course_ids = (Course.objects
+                  .filter(meta_course__in=meta_courses)
+                  .values_list('pk', flat=True))
+    bump_course_content_version(course_ids)
+
+
+@receiver(post_save, sender=User)
+def bump_course_content_version_on_teacher_change(sender, instance: User, created,
+                                                  update_fields=None, *args, **kwargs):
+    # Teacher cards with name, photo and bio are part of the cached content
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    course_ids = (Course.objects
+                  .filter(teachers=instance)
+                  .values_list('pk', flat=True))
+    bump_course_content_version(course_ids)
@@ -7,12 +7,12 @@ import logging
 from abc import ABCMeta, abstractmethod
 from typing import Dict, NamedTuple, Optional
 
-from django.db.models import Count
 from django.utils.functional import lazy
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import gettext_noop
 
-from courses.services import CourseService
+from courses.selectors import get_course_classes
+from courses.services import get_cached_course_content
 from courses.tabs_registry import register, registry
 
 # TODO: default tab implementation for `assignments` and `classes` + tests
@@ -341,8 +341,11 @@ class CourseClassesTab(CourseTab):
         return True
 
     def get_tab_panel(self, *, course, user) -> Optional[CourseTabPanel]:
-        classes = (CourseService.get_classes(course)
-                   .annotate(attachments_count=Count('courseclassattachment')))
+        classes = get_cached_course_content(course, 'classes',
+                                            lambda: get_course_classes(course))
+        for course_class in classes:
+            # Class URLs are built from the course URL parameters
+            course_class.course = course
         return CourseTabPanel(context={
             "items": classes
         })
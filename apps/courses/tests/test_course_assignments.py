@@ -21,8 +21,9 @@ from courses.permissions import (
 from courses.tests.factories import (
     AssignmentAttachmentFactory, AssignmentFactory, CourseFactory, CourseTeacherFactory
 )
-from learning.models import StudentGroup, StudentGroupTeacherBucket
-from learning.tests.factories import StudentGroupFactory
+from learning.models import StudentAssignment, StudentGroup, StudentGroupTeacherBucket
+from learning.settings import AssignmentPublicationStatuses
+from learning.tests.factories import EnrollmentFactory, StudentGroupFactory
 from users.tests.factories import CuratorFactory, TeacherFactory
 
 
@@ -76,6 +77,42 @@ def test_course_assignment_form_create(client):
     assert a2.ttc == datetime.timedelta(hours=2, minutes=42)
 
 
+@pytest.mark.django_db
+def test_course_assignment_create_publication(client, django_capture_on_commit_callbacks):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    EnrollmentFactory.create_batch(2, course=course)
+    form = factory.build(dict, FACTORY_CLASS=AssignmentFactory)
+    form.update({
+        'course': course.pk,
+        'opens_at_0': form['opens_at'].strftime(DATE_FORMAT_RU),
+        'opens_at_1': form['opens_at'].strftime(TIME_FORMAT_RU),
+        'deadline_at_0': form['deadline_at'].strftime(DATE_FORMAT_RU),
+        'deadline_at_1': form['deadline_at'].strftime(TIME_FORMAT_RU),
+        'time_zone': 'UTC',
+        'assignee_mode': AssigneeMode.STUDENT_GROUP_DEFAULT
+    })
+    client.login(teacher)
+    url = course.get_create_assignment_url()
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        response = client.post(url, prefixed_form(form, "assignment"))
+    assert response.status_code == 302
+    assignment = Assignment.objects.get(course=course)
+    # Personal assignments are generated by the background job
+    assert assignment.publication.status == AssignmentPublicationStatuses.PENDING
+    assert not StudentAssignment.objects.filter(assignment=assignment).exists()
+    response = client.get(assignment.get_teacher_url())
+    assert "alert-info" in response.content.decode('utf-8')
+    for callback in callbacks:
+        callback()
+    assignment.publication.refresh_from_db()
+    assert assignment.publication.status == AssignmentPublicationStatuses.COMPLETED
+    assert assignment.publication.processed == 2
+    assert StudentAssignment.objects.filter(assignment=assignment).count() == 2
+    response = client.get(assignment.get_teacher_url())
+    assert "alert-info" not in response.content.decode('utf-8')
+
+
 @pytest.mark.django_db
 def test_course_assignment_update_view_security(client, assert_login_redirect,
                                                 lms_resolver):
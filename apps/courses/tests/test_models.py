@@ -14,7 +14,9 @@ from core.timezone import UTC
 from courses.constants import (
     AssignmentFormat, AssignmentStatus, MaterialVisibilityTypes, SemesterTypes
 )
-from courses.models import Assignment, Course, CourseClass, CourseTeacher, CourseProgramBinding
+from courses.models import (
+    Assignment, Course, CourseClass, CourseProgramBinding, CourseTeacher, Semester
+)
 from courses.selectors import course_teachers_prefetch_queryset
 from courses.tests.factories import (
     AssignmentAttachmentFactory, AssignmentFactory, CourseClassAttachmentFactory,
@@ -137,6 +139,24 @@ def test_semester_cmp():
     assert s2013_summer < s2014_spring
 
 
+@pytest.mark.django_db
+def test_semester_get_current_cache(django_assert_num_queries):
+    current_semester = Semester.get_current()
+    # The first call makes a lookup, subsequent calls in this or
+    # other requests are served from cache
+    Semester.get_current()
+    with django_assert_num_queries(0):
+        assert Semester.get_current() == current_semester
+        assert Semester.get_current() == current_semester
+    # Cache is invalidated on update
+    current_semester.save()
+    with django_assert_num_queries(1):
+        assert Semester.get_current() == current_semester
+    current_semester.delete()
+    assert not Semester.objects.filter(pk=current_semester.pk).exists()
+    assert Semester.get_current().pk != current_semester.pk
+
+
 @pytest.mark.django_db
 def test_in_current_term(client):
     """
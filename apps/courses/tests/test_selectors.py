@@ -2,7 +2,10 @@ import pytest
 
 from core.tests.factories import AcademicProgramFactory
 from core.tests.settings import TEST_DOMAIN_ID
-from courses.tests.factories import CourseClassFactory, CourseFactory, CourseProgramBindingFactory
+from courses.selectors import get_course_classes
+from courses.tests.factories import (
+    CourseClassAttachmentFactory, CourseClassFactory, CourseFactory, CourseProgramBindingFactory
+)
 from learning.selectors import get_classes, get_teacher_classes
 from users.tests.factories import TeacherFactory
 
@@ -26,3 +29,23 @@ def test_get_classes_should_not_return_duplicate_classes():
     assert len(get_classes().in_programs([program1])) == 1
     assert len(get_classes().in_programs([program2])) == 1
     assert len(get_classes().in_programs([program1, program2])) == 1
+
+
+@pytest.mark.django_db
+def test_get_course_classes(django_assert_num_queries):
+    course = CourseFactory()
+    course_class1, course_class2 = CourseClassFactory.create_batch(2, course=course)
+    attachment1, attachment2 = CourseClassAttachmentFactory.create_batch(
+        2, course_class=course_class1)
+    CourseClassFactory(course=CourseFactory())
+    # Classes with venues + attachments
+    with django_assert_num_queries(2):
+        classes = get_course_classes(course)
+        for course_class in classes:
+            assert course_class.venue.location.name
+            course_class.get_available_materials()
+    assert {c.pk for c in classes} == {course_class1.pk, course_class2.pk}
+    classes = {c.pk: c for c in classes}
+    assert set(classes[course_class1.pk].attachments) == {attachment1, attachment2}
+    assert classes[course_class1.pk].attachments_count == 2
+    assert classes[course_class2.pk].attachments == []
@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+from django.core.management import call_command
+
+from courses.constants import SemesterTypes
+from courses.models import Semester
+from courses.services import recalculate_semester_indexes
+from courses.tests.factories import SemesterFactory
+from courses.utils import get_term_index
+
+
+@pytest.mark.django_db
+def test_recalculate_semester_indexes(django_assert_num_queries):
+    for year in range(2000, 2026):
+        for term_type in SemesterTypes.values:
+            SemesterFactory(year=year, type=term_type)
+    Semester.objects.filter(year__gte=2010).update(index=0)
+    with django_assert_num_queries(2):
+        assert recalculate_semester_indexes() == 16 * len(SemesterTypes.choices)
+    for semester in Semester.objects.all():
+        assert semester.index == get_term_index(semester.year, semester.type)
+    # Nothing to update
+    assert recalculate_semester_indexes() == 0
+    Semester.objects.filter(year=2020).update(index=0)
+    call_command("recalculate_semester_indexes", stdout=io.StringIO())
+    assert not Semester.objects.filter(index=0).exists()
+
+
+@pytest.mark.django_db
+def test_recalculate_semester_indexes_on_create(django_capture_on_commit_callbacks):
+    semester = SemesterFactory(year=2020, type=SemesterTypes.AUTUMN)
+    Semester.objects.filter(pk=semester.pk).update(index=0)
+    with django_capture_on_commit_callbacks(execute=True):
+        SemesterFactory(year=2021, type=SemesterTypes.SPRING)
+    semester.refresh_from_db()
+    assert semester.index == get_term_index(2020, SemesterTypes.AUTUMN)
@@ -5,7 +5,7 @@ import pytest
 
 from courses.constants import MONDAY_WEEKDAY, SUNDAY_WEEKDAY, SemesterTypes
 from courses.utils import (
-    MonthPeriod, TermIndexError, TermPair, extended_month_date_range,
+    MonthPeriod, TermIndexError, TermPair, date_to_term_pair, extended_month_date_range,
     get_current_term_pair, get_end_of_week, get_start_of_week, get_term_by_index,
     get_term_index
 )
@@ -67,6 +67,26 @@ def test_get_current_semester_pair(settings, mocker):
     assert TermPair(2015, SemesterTypes.AUTUMN) == get_current_term_pair(msk_tz)
 
 
+def test_get_current_term_pair_cache(mocker):
+    mocked_now = mocker.patch('courses.utils.now_local')
+    tz = ZoneInfo("Europe/Moscow")
+    mocked_now.return_value = datetime.datetime(2021, 6, 30, 23, 59, tzinfo=tz)
+    mocked_date_to_term_pair = mocker.patch('courses.utils.date_to_term_pair',
+                                            wraps=date_to_term_pair)
+    assert get_current_term_pair(tz) == TermPair(2021, SemesterTypes.SPRING)
+    assert get_current_term_pair(tz) == TermPair(2021, SemesterTypes.SPRING)
+    assert mocked_date_to_term_pair.call_count == 1
+    # Term boundary is crossed
+    mocked_now.return_value = datetime.datetime(2021, 7, 1, 0, 0, tzinfo=tz)
+    assert get_current_term_pair(tz) == TermPair(2021, SemesterTypes.SUMMER)
+    assert mocked_date_to_term_pair.call_count == 2
+    # Cache is per timezone
+    utc_now = datetime.datetime(2021, 6, 30, 21, 0, tzinfo=datetime.timezone.utc)
+    mocked_now.return_value = utc_now
+    assert get_current_term_pair(datetime.timezone.utc) == TermPair(2021, SemesterTypes.SPRING)
+    assert mocked_date_to_term_pair.call_count == 3
+
+
 def test_get_start_of_week():
     sunday_index = 6  # 0-based index of the week
     dt = datetime.date(2015, 9, 14)
@@ -15,7 +15,7 @@ from core.tests.factories import LocationFactory
 from core.timezone import UTC
 from core.urls import reverse
 from courses.constants import MaterialVisibilityTypes
-from courses.models import CourseTeacher
+from courses.models import Course, CourseTeacher
 from courses.permissions import ViewCourseClassMaterials
 from courses.tests.factories import (
     AssignmentFactory, CourseClassAttachmentFactory, CourseClassFactory, CourseFactory,
@@ -25,6 +25,7 @@ from files.response import XAccelRedirectFileResponse
 from files.views import ProtectedFileDownloadView
 from learning.invitation.views import create_invited_profile
 from learning.models import Enrollment
+from learning.services import membership_service
 from learning.settings import StudentStatuses
 from learning.tests.factories import CourseInvitationBindingFactory, EnrollmentFactory
 from users.constants import Roles
@@ -144,6 +145,28 @@ def test_download_course_class_attachment(client, lms_resolver, settings):
     assert isinstance(response, XAccelRedirectFileResponse)
 
 
+@pytest.mark.django_db
+def test_download_course_class_attachment_cached_access_role(client, settings, mocker):
+    settings.USE_CLOUD_STORAGE = False
+    course_class = CourseClassFactory(
+        materials_visibility=MaterialVisibilityTypes.COURSE_PARTICIPANTS)
+    attachment1, attachment2 = CourseClassAttachmentFactory.create_batch(
+        2, course_class=course_class)
+    student = StudentFactory()
+    client.login(student)
+    spy = mocker.spy(membership_service, 'course_access_role')
+    assert client.get(attachment1.get_download_url()).status_code == 403
+    assert client.get(attachment2.get_download_url()).status_code == 403
+    assert spy.call_count == 1
+    # Access role is invalidated on enrollment
+    EnrollmentFactory(student=student, course=course_class.course)
+    response = client.get(attachment1.get_download_url())
+    assert isinstance(response, XAccelRedirectFileResponse)
+    response = client.get(attachment2.get_download_url())
+    assert isinstance(response, XAccelRedirectFileResponse)
+    assert spy.call_count == 2
+
+
 @pytest.mark.django_db
 def test_course_update(client, assert_redirect):
     course = CourseFactory()
@@ -325,3 +348,42 @@ def test_view_course_student_faces_csv(client):
             assert row['First Name'] == student2.first_name
             assert row['Last Name'] == student2.last_name
             assert row['Telegram'] == student2.telegram_username
+
+
+@pytest.mark.django_db
+def test_view_course_detail_cached_content(client, django_assert_max_num_queries):
+    teacher, *other_teachers = TeacherFactory.create_batch(4)
+    course = CourseFactory(teachers=[teacher, *other_teachers])
+    CourseClassFactory(course=course, name="First class")
+    CourseNewsFactory(course=course, title="First news")
+    client.login(teacher)
+    course.refresh_from_db()
+    version = course.content_version
+    client.get(course.get_absolute_url())
+    # Doesn't depend on the number of course teachers
+    with django_assert_max_num_queries(14):
+        response = client.get(course.get_absolute_url())
+    content = response.content.decode('utf-8')
+    assert "First class" in content
+    assert "First news" in content
+    # Content version is bumped on changes
+    CourseClassFactory(course=course, name="Second class")
+    course.refresh_from_db()
+    assert course.content_version > version
+    response = client.get(course.get_absolute_url())
+    assert "Second class" in response.content.decode('utf-8')
+    CourseNewsFactory(course=course, title="Second news")
+    response = client.get(course.get_absolute_url())
+    assert "Second news" in response.content.decode('utf-8')
+    # Teacher profile has been changed
+    other_teacher = other_teachers[0]
+    other_teacher.first_name = "Renamed"
+    other_teacher.save()
+    response = client.get(course.get_absolute_url())
+    assert "Renamed" in response.content.decode('utf-8')
+    # Saving the outdated instance doesn't restore the previous version
+    version = Course.objects.get(pk=course.pk).content_version
+    assert course.content_version < version
+    course.save()
+    course.refresh_from_db()
+    assert course.content_version > version
@@ -1,12 +1,13 @@
 import datetime
 from calendar import monthrange
 from dataclasses import dataclass, field
-from typing import Iterator, Optional
+from typing import Dict, Iterator, NamedTuple, Optional
 
 import attr
 from dateutil import parser as dparser
 
 from django.conf import settings
+from django.db.models import Case, Expression, F, Value, When
 from django.utils import timezone
 
 from core.timezone import now_local, UTC
@@ -106,9 +107,29 @@ def date_to_term_pair(dt: datetime.datetime) -> TermPair:
     return TermPair(year, current_term)
 
 
+class _CachedTermPair(NamedTuple):
+    term_pair: TermPair
+    starts_at: datetime.datetime
+    ends_at: datetime.datetime
+
+
+# Term boundaries are known in advance, current term is cached per timezone
+# until the next term starts
+_current_term_pairs: Dict[str, _CachedTermPair] = {}
+
+
 def get_current_term_pair(tz: datetime.tzinfo = settings.DEFAULT_TIMEZONE) -> TermPair:
     dt_local = now_local(tz)
-    return date_to_term_pair(dt_local)
+    cache_key = str(tz)
+    cached = _current_term_pairs.get(cache_key)
+    if cached is not None and cached.starts_at <= dt_local < cached.ends_at:
+        return cached.term_pair
+    term_pair = date_to_term_pair(dt_local)
+    _current_term_pairs[cache_key] = _CachedTermPair(
+        term_pair=term_pair,
+        starts_at=term_pair.starts_at(dt_local.tzinfo),
+        ends_at=term_pair.get_next().starts_at(dt_local.tzinfo))
+    return term_pair
 
 
 def convert_term_parts_to_datetime(year, term_start,
@@ -152,6 +173,20 @@ def get_term_index(term_year, term_type) -> int:
     return year_portion + term_portion
 
 
+def get_term_index_expression(year_field: str = 'year',
+                              type_field: str = 'type') -> Expression:
+    """
+    Returns database expression of the term index, it's equivalent to
+    the `get_term_index` applied to the given fields.
+    """
+    terms_in_year = len(SemesterTypes.choices)
+    term_portion = Case(
+        *(When(**{type_field: t}, then=Value(index))
+          for index, (t, _) in enumerate(SemesterTypes.choices)),
+        default=None)
+    return (F(year_field) - _FIRST_TERM_YEAR) * terms_in_year + term_portion
+
+
 def get_term_by_index(term_index) -> TermPair:
     """Inverse func for `get_term_index`"""
     if term_index < 0:
@@ -14,7 +14,7 @@ from courses.permissions import (
     CreateAssignment, CreateCourseClass, EditCourse, ViewCourseContacts,
     ViewCourseInternalDescription, can_view_private_materials, ViewCourse, ViewAssignment
 )
-from courses.services import group_teachers
+from courses.services import CourseService, group_teachers
 from courses.tabs import CourseInfoTab, TabNotFound, get_course_tab_list
 from courses.views.mixins import CourseURLParamsMixin
 from learning.models import CourseNewsNotification
@@ -34,6 +34,7 @@ class CourseDetailView(PermissionRequiredMixin, CourseURLParamsMixin, DetailView
     request: AuthenticatedHttpRequest
 
     def get_course_queryset(self):
+        # Course teachers are used by permission checks
         teachers = Prefetch('course_teachers',
                             queryset=(CourseTeacher.objects
                                       .select_related("teacher")
@@ -58,7 +59,8 @@ class CourseDetailView(PermissionRequiredMixin, CourseURLParamsMixin, DetailView
         except TabNotFound:
             raise Redirect(to=redirect_to_login(self.request.get_full_path()))
         # Teachers
-        by_role = group_teachers(course.course_teachers.all())
+        course_teachers = CourseService.get_cached_teachers(course)
+        by_role = group_teachers(course_teachers)
         teachers = {'main': [], 'spectators': [], 'others': []}
         has_organizers = False
         for role, ts in by_role.items():
@@ -99,11 +101,11 @@ class CourseDetailView(PermissionRequiredMixin, CourseURLParamsMixin, DetailView
             'has_access_to_private_materials': can_view_private_materials(user, course),
             'ViewAssignment': ViewAssignment,
             'ViewOwnStudentAssignment': ViewOwnStudentAssignment,
-            **self._get_additional_context(course)
+            **self._get_additional_context(course, course_teachers)
         }
         return context
 
-    def _get_additional_context(self, course, **kwargs):
+    def _get_additional_context(self, course, course_teachers, **kwargs):
         request_user = self.request.user
         tz_override = request_user.time_zone
         if request_user.has_perm(ViewOwnEnrollments.name):
@@ -113,7 +115,8 @@ class CourseDetailView(PermissionRequiredMixin, CourseURLParamsMixin, DetailView
         # Attach unread notifications count if authenticated user is in
         # a mailing list
         unread_news = None
-        is_actual_teacher = course.is_actual_teacher(request_user.pk)
+        is_actual_teacher = any(ct.teacher_id == request_user.pk and not ct.roles.spectator
+                                for ct in course_teachers)
         if request_user_enrollment or is_actual_teacher:
             unread_news = (CourseNewsNotification.unread
                            .filter(course_offering_news__course=course,
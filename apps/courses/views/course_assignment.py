@@ -131,7 +131,6 @@ class AssignmentCreateView(AssignmentCreateUpdateBaseView):
         attachments = self.request.FILES.getlist('assignment-attachments')
         with transaction.atomic(savepoint=False):
             assignment = assignment_form.save()
-            AssignmentService.bulk_create_student_assignments(assignment)
             if assignment.assignee_mode == AssigneeMode.MANUAL:
                 data = responsible_teachers_form.to_internal()
                 AssignmentService.set_responsible_teachers(assignment,
@@ -143,6 +142,8 @@ class AssignmentCreateView(AssignmentCreateUpdateBaseView):
                 data = bucket_formset.to_internal()
                 StudentGroupService.set_bucket_assignation_for_assignment(assignment=assignment, data=data)
             AssignmentService.process_attachments(assignment, attachments)
+            # Personal assignments are generated in the background
+            AssignmentService.schedule_publication(assignment)
         return redirect(assignment.get_teacher_url())
 
 
@@ -178,9 +179,9 @@ class AssignmentUpdateView(AssignmentCreateUpdateBaseView):
             elif assignment.assignee_mode == AssigneeMode.STUDENT_GROUP_BALANCED:
                 data = bucket_formset.to_internal()
                 StudentGroupService.set_bucket_assignation_for_assignment(assignment=assignment, data=data)
-            # TODO: Call this one only if .restricted_to has changed
-            AssignmentService.sync_student_assignments(assignment)
             AssignmentService.process_attachments(assignment, attachments)
+            # TODO: Call this one only if .restricted_to has changed
+            AssignmentService.schedule_publication(assignment)
         return redirect(assignment.get_teacher_url())
 
 
@@ -22,6 +22,7 @@ from courses.models import CourseClass, CourseClassAttachment, Course
 from courses.permissions import (
     CreateCourseClass, DeleteCourseClass, EditCourseClass, ViewCourseClassMaterials
 )
+from courses.selectors import course_classes_queryset
 from courses.views.mixins import CourseURLParamsMixin
 from files.views import ProtectedFileDownloadView
 
@@ -47,17 +48,14 @@ class CourseClassDetailView(LoginRequiredMixin, generic.DetailView):
     def get_queryset(self):
         url_params = self.kwargs
         # FIXME: check course is available on current site
-        return (CourseClass.objects
-                .filter(course_id=url_params['course_id'])
+        return (course_classes_queryset(course_id=url_params['course_id'])
                 .select_related("course",
                                 "course__meta_course",
-                                "course__semester",
-                                "venue",
-                                "venue__location",))
+                                "course__semester"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['attachments'] = self.object.courseclassattachment_set.order_by("-created")
+        context['attachments'] = self.object.attachments
         return context
 
 
@@ -1,3 +1,4 @@
+import base64
 import datetime
 from decimal import Decimal
 
@@ -5,7 +6,7 @@ import pytest
 from rest_framework.fields import DateTimeField
 
 from core.urls import reverse
-from courses.constants import AssignmentFormat
+from courses.constants import AssignmentFormat, AssignmentStatus
 from courses.models import CourseTeacher
 from courses.tests.factories import (
     AssignmentFactory, CourseFactory, CourseTeacherFactory
@@ -13,11 +14,16 @@ from courses.tests.factories import (
 from learning.api.serializers import (
     BaseStudentAssignmentSerializer, CourseAssignmentSerializer, MyCourseSerializer
 )
-from learning.models import StudentAssignment
+from learning.models import Enrollment, StudentAssignment
+from learning.services import AssignmentService
 from learning.services.personal_assignment_service import (
     create_assignment_solution, update_personal_assignment_stats
 )
-from learning.tests.factories import EnrollmentFactory, StudentAssignmentFactory
+from learning.settings import AssignmentPublicationStatuses
+from learning.tests.factories import (
+    AssignmentNotificationFactory, EnrollmentFactory, StudentAssignmentFactory,
+    StudentGroupFactory
+)
 from learning.tests.jba.test_jba_submission_service import TEST_JBA_ACCOUNT, KOTLIN_KOANS_ID, mock_jba_service, HELLO_WORLD_TASK_ID
 from users.tests.factories import TeacherFactory
 
@@ -249,6 +255,122 @@ def test_api_view_personal_assignment_output_serializer(lms_resolver, django_cap
     assert student_assignment.stats['solutions']['last'] != student_assignment.stats['solutions']['first']
 
 
+@pytest.mark.django_db
+def test_api_view_personal_assignment_check_queue(client, django_assert_num_queries):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    course_teacher = CourseTeacher.objects.get(course=course, teacher=teacher)
+    assignment = AssignmentFactory(course=course)
+    now = datetime.datetime(2024, 3, 1, 12, 0, tzinfo=datetime.timezone.utc)
+    sa1, sa2, sa3, sa4 = StudentAssignmentFactory.create_batch(4, assignment=assignment)
+    StudentAssignment.objects.filter(pk=sa1.pk).update(solution_at=now, status=AssignmentStatus.ON_CHECKING)
+    StudentAssignment.objects.filter(pk=sa2.pk).update(solution_at=now + datetime.timedelta(hours=1),
+                                                       status=AssignmentStatus.ON_CHECKING,
+                                                       assignee=course_teacher)
+    StudentAssignment.objects.filter(pk=sa3.pk).update(solution_at=now,
+                                                       status=AssignmentStatus.NEED_FIXES)
+    StudentAssignmentFactory(solution_at=now)  # Personal assignment from another course
+    url = reverse('learning-api:v1:personal_assignments_check_queue', kwargs={
+        'course_id': course.pk
+    })
+    client.login(teacher)
+    # Auth and permission checks + one query for the queue page
+    with django_assert_num_queries(7):
+        response = client.get(url, {'assignments': str(assignment.pk)})
+    assert response.status_code == 200
+    json_data = response.json()
+    # Sorted by the latest solution, ties are broken by id
+    assert [r['id'] for r in json_data['results']] == [sa2.pk, sa3.pk, sa1.pk, sa4.pk]
+    assert json_data['results'][0]['assignee']['id'] == course_teacher.pk
+    assert json_data['results'][0]['solutionAt'] == DateTimeField().to_representation(now + datetime.timedelta(hours=1))
+    assert json_data['nextCursor'] is None
+    # Keyset pagination
+    ids = []
+    cursor = None
+    for _ in range(4):
+        params = {'page_size': 1, 'ordering': 'solution_asc'}
+        if cursor is not None:
+            params['cursor'] = cursor
+        json_data = client.get(url, params).json()
+        assert len(json_data['results']) == 1
+        ids.append(json_data['results'][0]['id'])
+        cursor = json_data['nextCursor']
+    assert ids == [sa1.pk, sa3.pk, sa2.pk, sa4.pk]
+    assert cursor is None
+    assert client.get(url, {'cursor': 'invalid'}).status_code == 400
+    malformed_cursor = base64.urlsafe_b64encode(f"yesterday|{sa1.pk}".encode()).decode()
+    assert client.get(url, {'cursor': malformed_cursor}).status_code == 400
+    # Filters
+    json_data = client.get(url, {'statuses': AssignmentStatus.ON_CHECKING}).json()
+    assert {r['id'] for r in json_data['results']} == {sa1.pk, sa2.pk}
+    json_data = client.get(url, {'assignees': 'unset'}).json()
+    assert {r['id'] for r in json_data['results']} == {sa1.pk, sa3.pk, sa4.pk}
+    json_data = client.get(url, {'assignees': f'{course_teacher.pk},unset'}).json()
+    assert len(json_data['results']) == 4
+    student_group = StudentGroupFactory(course=course)
+    Enrollment.objects.filter(course=course, student=sa3.student).update(student_group=student_group)
+    json_data = client.get(url, {'student_groups': str(student_group.pk)}).json()
+    assert [r['id'] for r in json_data['results']] == [sa3.pk]
+    AssignmentNotificationFactory(user=teacher, student_assignment=sa4, is_unread=True)
+    AssignmentNotificationFactory(student_assignment=sa1, is_unread=True)
+    json_data = client.get(url, {'has_unread': 'true'}).json()
+    assert [r['id'] for r in json_data['results']] == [sa4.pk]
+    assert json_data['results'][0]['hasUnread']
+    StudentAssignment.objects.filter(pk=sa2.pk).update(score=5)
+    json_data = client.get(url, {'graded': 'true'}).json()
+    assert [r['id'] for r in json_data['results']] == [sa2.pk]
+    json_data = client.get(url, {'graded': 'false'}).json()
+    assert {r['id'] for r in json_data['results']} == {sa1.pk, sa3.pk, sa4.pk}
+    assert client.get(url, {'statuses': 'unknown'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_api_view_personal_assignment_check_queue_counts(client):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    assignment = AssignmentFactory(course=course)
+    sa1, sa2, sa3 = StudentAssignmentFactory.create_batch(3, assignment=assignment)
+    StudentAssignment.objects.filter(pk__in=[sa1.pk, sa2.pk]).update(status=AssignmentStatus.ON_CHECKING)
+    AssignmentNotificationFactory(user=teacher, student_assignment=sa2, is_unread=True)
+    url = reverse('learning-api:v1:personal_assignments_check_queue', kwargs={
+        'course_id': course.pk
+    })
+    client.login(teacher)
+    response = client.get(url, {'counts_only': 'true'})
+    assert response.status_code == 200
+    assert response.json() == {
+        'total': 3,
+        'unread': 1,
+        'statuses': [
+            {'status': AssignmentStatus.NOT_SUBMITTED, 'total': 1},
+            {'status': AssignmentStatus.ON_CHECKING, 'total': 2},
+        ]
+    }
+
+
+@pytest.mark.django_db
+def test_api_view_assignment_publication(client):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    assignment = AssignmentFactory(course=course)
+    url = reverse('learning-api:v1:assignment_publication', kwargs={
+        'course_id': course.pk,
+        'assignment_id': assignment.pk
+    })
+    client.login(teacher)
+    response = client.get(url)
+    assert response.status_code == 404
+    EnrollmentFactory.create_batch(2, course=course)
+    AssignmentService.publish_student_assignments(assignment)
+    response = client.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data['status'] == AssignmentPublicationStatuses.COMPLETED
+    assert data['total'] == 2
+    assert data['processed'] == 2
+    assert data['progress'] == 100
+
+
 @pytest.mark.django_db
 def test_api_update_jba_progress(client, mock_jba_service):
     e = EnrollmentFactory(student__jetbrains_account=TEST_JBA_ACCOUNT)
@@ -11,6 +11,8 @@ urlpatterns = [
             path('courses/<int:course_id>/assignments/', v.CourseAssignmentList.as_view(), name='course_assignments'),
             path('courses/<int:course_id>/enrollments/', v.CourseStudentsList.as_view(), name='course_enrollments'),
             path('courses/<int:course_id>/personal-assignments/', v.PersonalAssignmentList.as_view(), name='personal_assignments'),
+            path('courses/<int:course_id>/personal-assignments/queue/', v.PersonalAssignmentCheckQueue.as_view(), name='personal_assignments_check_queue'),
+            path('courses/<int:course_id>/assignments/<int:assignment_id>/publication/', v.AssignmentPublicationDetail.as_view(), name='assignment_publication'),
             path('courses/<int:course_id>/assignments/<int:assignment_id>/students/<int:student_id>/', v.StudentAssignmentUpdate.as_view(), name='my_course_student_assignment_update'),
             path('courses/<int:course_id>/assignments/<int:assignment_id>/students/<int:student_id>/assignee', v.StudentAssignmentAssigneeUpdate.as_view(), name='my_course_student_assignment_assignee_update'),
         ])),
@@ -1,4 +1,6 @@
-from typing import Any, Dict, Optional, Type
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Type
 
 from djangorestframework_camel_case.render import (
     CamelCaseBrowsableAPIRenderer, CamelCaseJSONRenderer
@@ -9,6 +11,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext_lazy as _
 
 from api.mixins import ApiErrorsMixin
@@ -18,8 +21,9 @@ from api.views import APIBaseView
 from auth.mixins import RolePermissionRequiredMixin
 from core.api.fields import CharSeparatedField, ScoreField
 from core.http import AuthenticatedAPIRequest
+from courses.constants import AssignmentStatus
 from courses.models import Assignment, Course
-from courses.permissions import CreateAssignment
+from courses.permissions import CreateAssignment, ViewAssignment
 from courses.selectors import course_personal_assignments, get_course_teachers
 from learning.api.serializers import (
     BaseEnrollmentSerializer, BaseStudentAssignmentSerializer,
@@ -27,9 +31,14 @@ from learning.api.serializers import (
     UserSerializer
 )
 from learning.models import (
-    CourseNewsNotification, Enrollment, PersonalAssignmentActivity, StudentAssignment
+    AssignmentPublication, CourseNewsNotification, Enrollment, PersonalAssignmentActivity,
+    StudentAssignment
 )
 from learning.permissions import EditStudentAssignment, ViewEnrollments, ViewOwnStudentAssignment
+from learning.selectors import (
+    CHECK_QUEUE_SOLUTION_ASC, CHECK_QUEUE_SOLUTION_DESC, CheckQueueCursor,
+    get_check_queue_counts, get_check_queue_page, get_check_queue_personal_assignments
+)
 from learning.services.jba_service import JbaService
 from learning.views.views import StudentAssignmentURLParamsMixin
 
@@ -125,22 +134,12 @@ class PersonalAssignmentList(RolePermissionRequiredMixin, APIBaseView):
             "id": serializers.IntegerField(),
             "teacher": UserSerializer(fields=('id', 'first_name', 'last_name'))
         })
-        solution_at = serializers.SerializerMethodField()
 
         class Meta:
             model = StudentAssignment
             fields = ('id', 'assignment_id', 'score', 'status', 'student',
                       'assignee', 'solution_at')
 
-        def get_solution_at(self, obj: StudentAssignment) -> Optional[str]:
-            """Returns the datetime of the latest solution."""
-            if not obj.meta or 'stats' not in obj.meta:
-                return None
-            stats = obj.meta['stats']
-            if not stats or 'solutions' not in stats:
-                return None
-            return stats['solutions'].get('last', stats['solutions']['first'])
-
     def initial(self, request, *args, **kwargs):
         self.course = get_object_or_404(Course.objects.get_queryset(), pk=kwargs['course_id'])
         super().initial(request, *args, **kwargs)
@@ -157,6 +156,158 @@ class PersonalAssignmentList(RolePermissionRequiredMixin, APIBaseView):
         return Response(data)
 
 
+def _to_int_list(values: List[str]) -> List[int]:
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        raise serializers.ValidationError(_("A list of integers is expected"))
+
+
+class CheckQueueCursorField(serializers.CharField):
+    """Opaque base64-encoded position in the assignments check queue."""
+    def to_internal_value(self, data) -> CheckQueueCursor:
+        value = super().to_internal_value(data)
+        try:
+            decoded = base64.urlsafe_b64decode(value.encode()).decode()
+            solution_at, pk = decoded.split('|')
+            if solution_at:
+                solution_at = parse_datetime(solution_at)
+                if solution_at is None:
+                    raise ValueError("Malformed datetime")
+            else:
+                solution_at = None
+            return CheckQueueCursor(solution_at=solution_at, pk=int(pk))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise serializers.ValidationError(_("Invalid cursor"))
+
+    def to_representation(self, value: CheckQueueCursor) -> str:
+        solution_at = value.solution_at.isoformat() if value.solution_at else ''
+        return base64.urlsafe_b64encode(f"{solution_at}|{value.pk}".encode()).decode()
+
+
+class PersonalAssignmentCheckQueue(RolePermissionRequiredMixin, APIBaseView):
+    """
+    Assignments check queue of the course. Filtering, sorting by the
+    latest solution datetime and keyset pagination are made on the database
+    side, pass the `next_cursor` value to get the next page.
+    Set `counts_only` to get the number of personal assignments
+    by status instead of the list.
+    """
+    permission_classes = [CreateAssignment]
+    renderer_classes = (CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer)
+    default_page_size = 50
+    max_page_size = 500
+    course: Course
+
+    class FilterSerializer(serializers.Serializer):
+        assignments = CharSeparatedField(allow_blank=True, required=False)
+        statuses = CharSeparatedField(allow_blank=True, required=False)
+        assignees = CharSeparatedField(allow_blank=True, required=False,
+                                       help_text="Course teacher ids, "
+                                                 "`unset` for unassigned")
+        student_groups = CharSeparatedField(allow_blank=True, required=False)
+        has_unread = serializers.BooleanField(required=False, allow_null=True,
+                                              default=None)
+        graded = serializers.BooleanField(required=False, allow_null=True,
+                                          default=None)
+        ordering = serializers.ChoiceField(choices=(CHECK_QUEUE_SOLUTION_DESC,
+                                                    CHECK_QUEUE_SOLUTION_ASC),
+                                           default=CHECK_QUEUE_SOLUTION_DESC)
+        cursor = CheckQueueCursorField(required=False)
+        page_size = serializers.IntegerField(min_value=1, required=False)
+        counts_only = serializers.BooleanField(default=False)
+
+        def validate_assignments(self, value):
+            return _to_int_list(value)
+
+        def validate_student_groups(self, value):
+            return _to_int_list(value)
+
+        def validate_statuses(self, value):
+            for status_ in value:
+                if status_ not in AssignmentStatus.values:
+                    raise serializers.ValidationError(_("Unknown status %s") % status_)
+            return value
+
+        def validate_assignees(self, value):
+            assignees: List[Optional[int]] = _to_int_list([v for v in value if v != 'unset'])
+            if 'unset' in value:
+                assignees.append(None)
+            return assignees
+
+    class OutputSerializer(PersonalAssignmentList.OutputSerializer):
+        has_unread = serializers.BooleanField()
+
+        class Meta(PersonalAssignmentList.OutputSerializer.Meta):
+            fields = (*PersonalAssignmentList.OutputSerializer.Meta.fields, 'has_unread')
+
+    def initial(self, request, *args, **kwargs):
+        self.course = get_object_or_404(Course.objects.get_queryset(), pk=kwargs['course_id'])
+        super().initial(request, *args, **kwargs)
+
+    def get_permission_object(self) -> Course:
+        return self.course
+
+    def get(self, request: AuthenticatedAPIRequest, **kwargs: Any):
+        filters_serializer = self.FilterSerializer(data=request.query_params)
+        filters_serializer.is_valid(raise_exception=True)
+        filters = filters_serializer.validated_data
+        queryset = get_check_queue_personal_assignments(course=self.course,
+                                                        user=request.user,
+                                                        filters=filters)
+        if filters['counts_only']:
+            return Response(get_check_queue_counts(queryset))
+        page_size = min(filters.get('page_size', self.default_page_size),
+                        self.max_page_size)
+        queryset = (queryset
+                    .select_related('student', 'assignee', 'assignee__teacher')
+                    .only('pk', 'assignment_id', 'score', 'status', 'solution_at',
+                          'student__id', 'student__first_name', 'student__last_name',
+                          'student__username', 'assignee__id',
+                          'assignee__teacher__id', 'assignee__teacher__first_name',
+                          'assignee__teacher__last_name'))
+        personal_assignments, next_cursor = get_check_queue_page(
+            queryset, ordering=filters['ordering'], cursor=filters.get('cursor'),
+            page_size=page_size)
+        if next_cursor is not None:
+            next_cursor = CheckQueueCursorField().to_representation(next_cursor)
+        return Response({
+            'results': self.OutputSerializer(personal_assignments, many=True).data,
+            'next_cursor': next_cursor,
+        })
+
+
+class AssignmentPublicationDetail(RolePermissionRequiredMixin, APIBaseView):
+    """
+    Progress of generating personal assignments for students.
+    """
+    permission_classes = [ViewAssignment]
+    renderer_classes = (CamelCaseJSONRenderer, CamelCaseBrowsableAPIRenderer)
+    assignment: Assignment
+
+    class OutputSerializer(serializers.ModelSerializer):
+        class Meta:
+            model = AssignmentPublication
+            fields = ('status', 'total', 'processed', 'progress', 'error',
+                      'modified')
+
+    def initial(self, request, *args, **kwargs):
+        queryset = (Assignment.objects
+                    .filter(course_id=kwargs['course_id'])
+                    .select_related('course'))
+        self.assignment = get_object_or_404(queryset, pk=kwargs['assignment_id'])
+        super().initial(request, *args, **kwargs)
+
+    def get_permission_object(self) -> Course:
+        return self.assignment.course
+
+    def get(self, request: AuthenticatedAPIRequest, **kwargs: Any):
+        publication = get_object_or_404(AssignmentPublication.objects.all(),
+                                        assignment=self.assignment)
+        data = self.OutputSerializer(publication).data
+        return Response(data)
+
+
 class StudentAssignmentUpdate(UpdateAPIView):
     permission_classes = [EditStudentAssignment]
     serializer_class = BaseStudentAssignmentSerializer
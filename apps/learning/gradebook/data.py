@@ -170,7 +170,8 @@ def gradebook_data(course: Course, student_group: Optional[int] = None) -> Grade
     enrollments = (course_enrollments
                    .select_related("student",
                                    "student_profile__invitation",
-                                   "student_group")
+                                   "student_group",
+                                   "course_program_binding")
                    .order_by("student__last_name", "pk"))
     for index, e in enumerate(enrollments.iterator()):
         enrolled_students[e.student_id] = GradebookStudent(e, index)
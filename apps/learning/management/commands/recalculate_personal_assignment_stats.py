@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.models import Course
+from learning.services.personal_assignment_service import (
+    bulk_update_personal_assignment_stats
+)
+
+
+class Command(BaseCommand):
+    help = "Recalculates submission stats of all personal assignments of the course"
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int, help='Course ID')
+
+    def handle(self, *args, **options):
+        course_id = options['course_id']
+        if not Course.objects.filter(pk=course_id).exists():
+            raise CommandError(f"Course with id={course_id} not found")
+        updated = bulk_update_personal_assignment_stats(course_id=course_id)
+        self.stdout.write(f"Updated personal assignments: {updated}")
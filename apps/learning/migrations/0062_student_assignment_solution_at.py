@@ -0,0 +1,31 @@
+# Generated by Django 4.2.27 on 2026-10-19 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0061_remove_event_branch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentassignment',
+            name='solution_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Latest Solution At'),
+        ),
+        migrations.AddIndex(
+            model_name='studentassignment',
+            index=models.Index(models.OrderBy(models.F('solution_at'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='learning_sa_solution_at_idx'),
+        ),
+        migrations.RunSQL(
+            sql="""
+                update learning_studentassignment
+                set solution_at = coalesce(meta #>> '{stats,solutions,last}',
+                                           meta #>> '{stats,solutions,first}')::timestamptz
+                where jsonb_typeof(meta #> '{stats,solutions}') = 'object'
+            """,
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.27 on 2026-10-19 06:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0068_delete_coursebranch'),
+        ('learning', '0062_student_assignment_solution_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentPublication',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'Publishing'), ('completed', 'Published'), ('failed', 'Failed')], default='pending', max_length=12, verbose_name='Status')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total Students')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Processed Students')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='publication', to='courses.assignment', verbose_name='Assignment')),
+            ],
+            options={
+                'verbose_name': 'Assignment publication',
+                'verbose_name_plural': 'Assignment publications',
+            },
+        ),
+    ]
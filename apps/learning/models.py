@@ -10,7 +10,7 @@ from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Q, Sum
+from django.db.models import F, Q, Sum
 from django.utils import timezone
 from django.utils.encoding import smart_str
 from django.utils.timezone import now
@@ -23,7 +23,7 @@ from model_utils.models import TimeStampedModel
 from rest_framework.utils.encoders import JSONEncoder
 
 from core.db.fields import ScoreField
-from core.db.mixins import DerivableFieldsMixin
+from core.db.mixins import DerivableFieldAggregate, DerivableFieldsMixin
 from core.db.models import SoftDeletionModel
 from core.models import LATEX_MARKDOWN_HTML_ENABLED, Location, TimestampedModel, AcademicProgram, \
     AcademicProgramRun
@@ -40,7 +40,8 @@ from learning.managers import (
     StudentAssignmentManager
 )
 from learning.settings import (
-    AssignmentScoreUpdateSource, GradeTypes, GradingSystems, EnrollmentGradeUpdateSource
+    AssignmentPublicationStatuses, AssignmentScoreUpdateSource, GradeTypes, GradingSystems,
+    EnrollmentGradeUpdateSource
 )
 from learning.utils import humanize_duration
 from users.models import StudentProfile
@@ -505,10 +506,16 @@ class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
     )
     meta = models.JSONField(encoder=JSONEncoder, blank=True, null=True,
                             editable=False)
+    # Denormalized datetime of the latest solution from `meta.stats`,
+    # used for sorting in the assignments check queue
+    solution_at = models.DateTimeField(
+        verbose_name=_("Latest Solution At"),
+        blank=True, null=True,
+        editable=False)
 
     objects = StudentAssignmentManager()
 
-    tracker = FieldTracker(fields=['score'])
+    tracker = FieldTracker(fields=['score', 'execution_time'])
 
     derivable_fields = ['execution_time']
 
@@ -517,6 +524,10 @@ class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
         verbose_name = _("Personal Assignment")
         verbose_name_plural = _("Personal Assignments")
         unique_together = [['assignment', 'student']]
+        indexes = [
+            models.Index(F('solution_at').desc(nulls_last=True), F('id').desc(),
+                         name='learning_sa_solution_at_idx'),
+        ]
 
     def clean(self):
         if self.score and self.score > self.assignment.maximum_score:
@@ -539,6 +550,13 @@ class StudentAssignment(SoftDeletionModel, TimezoneAwareMixin, TimeStampedModel,
             return True
         return False
 
+    @classmethod
+    def _aggregate_execution_time(cls) -> DerivableFieldAggregate:
+        solutions = AssignmentComment.objects.filter(type=AssignmentSubmissionTypes.SOLUTION)
+        return DerivableFieldAggregate(queryset=solutions,
+                                       related_field='student_assignment',
+                                       aggregate=Sum('execution_time'))
+
     def get_teacher_url(self):
         return reverse('teaching:student_assignment_detail',
                        kwargs={"pk": self.pk})
@@ -855,6 +873,48 @@ class SubmissionAttachment(TimeStampedModel):
         })
 
 
+class AssignmentPublication(TimeStampedModel):
+    """
+    Tracks the background job that generates personal assignments
+    for students after the assignment has been created or
+    its visibility settings have been changed.
+    """
+    assignment = models.OneToOneField(
+        Assignment,
+        verbose_name=_("Assignment"),
+        related_name="publication",
+        on_delete=models.CASCADE)
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=12,
+        choices=AssignmentPublicationStatuses.choices,
+        default=AssignmentPublicationStatuses.PENDING)
+    total = models.PositiveIntegerField(_("Total Students"), default=0)
+    processed = models.PositiveIntegerField(_("Processed Students"), default=0)
+    error = models.TextField(_("Error"), blank=True)
+
+    class Meta:
+        verbose_name = _("Assignment publication")
+        verbose_name_plural = _("Assignment publications")
+
+    def __str__(self):
+        return f"{self.assignment_id} [{self.status}]"
+
+    @property
+    def is_in_progress(self) -> bool:
+        return self.status in (AssignmentPublicationStatuses.PENDING,
+                               AssignmentPublicationStatuses.IN_PROGRESS)
+
+    @property
+    def progress(self) -> int:
+        """Percentage of processed students"""
+        if self.status == AssignmentPublicationStatuses.COMPLETED:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.processed * 100 // self.total)
+
+
 class AssignmentNotification(TimezoneAwareMixin, TimeStampedModel):
     TIMEZONE_AWARE_FIELD_NAME = 'student_assignment'
 
@@ -245,6 +245,7 @@ class ProgressReportFull(ProgressReport):
                 "user__private_contacts",
                 "user__bio",
             )
+            .select_related("academic_program_enrollment__program")
             .prefetch_related(enrollments_prefetch)
             .annotate(success_enrollments=success_enrollments_total)
         )
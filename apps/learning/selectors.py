@@ -1,15 +1,24 @@
-from typing import List, Optional, Union
+import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
-from django.db.models import Q, QuerySet
+from django.db.models import (
+    Case, CharField, Count, Exists, F, OuterRef, Q, QuerySet, Value, When
+)
 
+from courses.constants import AssignmentStatus
 from courses.managers import AssignmentQuerySet, CourseClassQuerySet, CourseQuerySet
 from courses.models import Assignment, Course, CourseClass, CourseTeacher
-from learning.managers import EnrollmentQuerySet
-from learning.models import Enrollment, Event
+from learning.managers import EnrollmentQuerySet, StudentAssignmentQuerySet
+from learning.models import (
+    AssignmentComment, AssignmentNotification, Enrollment, Event, StudentAssignment
+)
 from users.models import User
 
 CourseID = int
 
+CHECK_QUEUE_SOLUTION_DESC = 'solution_desc'
+CHECK_QUEUE_SOLUTION_ASC = 'solution_asc'
+
 
 def get_enrollment(*, course: Course, student: User) -> Optional[Enrollment]:
     enrollment = (Enrollment.objects
@@ -87,3 +96,154 @@ def get_teacher_assignments(user):
             .select_related('course',
                             'course__meta_course',
                             'course__semester'))
+
+
+class CheckQueueCursor(NamedTuple):
+    """Position of the last personal assignment on the check queue page."""
+    solution_at: Optional[datetime.datetime]
+    pk: int
+
+
+def get_check_queue_personal_assignments(*, course: Course, user: User,
+                                         filters: Optional[Dict[str, Any]] = None
+                                         ) -> StudentAssignmentQuerySet:
+    """
+    Returns personal assignments of the course for the assignments check
+    queue of the *user*. Supported filters:
+        assignments: list of assignment ids
+        statuses: list of personal assignment statuses
+        assignees: list of course teacher ids, `None` matches personal
+            assignments without responsible teacher
+        student_groups: list of student group ids
+        has_unread: filter by unread notifications of the *user*
+        graded: filter by the presence of the score
+    """
+    filters = filters or {}
+    unread_notifications = (AssignmentNotification.unread
+                            .filter(user=user, student_assignment_id=OuterRef('pk')))
+    queryset = (StudentAssignment.objects
+                .filter(assignment__course=course)
+                .annotate(has_unread=Exists(unread_notifications)))
+    if filters.get('assignments'):
+        queryset = queryset.filter(assignment_id__in=filters['assignments'])
+    if filters.get('statuses'):
+        queryset = queryset.filter(status__in=filters['statuses'])
+    if filters.get('assignees'):
+        assignees = filters['assignees']
+        assignee_filter = Q(assignee_id__in=[a for a in assignees if a is not None])
+        if None in assignees:
+            assignee_filter |= Q(assignee_id__isnull=True)
+        queryset = queryset.filter(assignee_filter)
+    if filters.get('student_groups'):
+        enrollments = (Enrollment.active
+                       .filter(course=course,
+                               student_id=OuterRef('student_id'),
+                               student_group_id__in=filters['student_groups']))
+        queryset = queryset.filter(Exists(enrollments))
+    if filters.get('has_unread') is not None:
+        queryset = queryset.filter(has_unread=filters['has_unread'])
+    if filters.get('graded') is not None:
+        queryset = queryset.filter(score__isnull=not filters['graded'])
+    return queryset.order_by()
+
+
+def get_check_queue_page(queryset: StudentAssignmentQuerySet, *,
+                         ordering: str = CHECK_QUEUE_SOLUTION_DESC,
+                         cursor: Optional[CheckQueueCursor] = None,
+                         page_size: int
+                         ) -> Tuple[List[StudentAssignment], Optional[CheckQueueCursor]]:
+    """
+    Returns the page of the check queue sorted by the datetime of the
+    latest solution (personal assignments without solutions go last)
+    and the cursor of the next page.
+
+    Uses keyset pagination: the next page starts right after the *cursor*
+    position, so the cost of the query doesn't depend on the page number.
+    """
+    if ordering == CHECK_QUEUE_SOLUTION_DESC:
+        order_by = [F('solution_at').desc(nulls_last=True), F('pk').desc()]
+        solution_at_after, pk_after = 'solution_at__lt', 'pk__lt'
+    elif ordering == CHECK_QUEUE_SOLUTION_ASC:
+        order_by = [F('solution_at').asc(nulls_last=True), F('pk').asc()]
+        solution_at_after, pk_after = 'solution_at__gt', 'pk__gt'
+    else:
+        raise ValueError(f"Unknown ordering {ordering}")
+    if cursor is not None:
+        if cursor.solution_at is None:
+            after_cursor = Q(solution_at__isnull=True, **{pk_after: cursor.pk})
+        else:
+            after_cursor = (Q(**{solution_at_after: cursor.solution_at}) |
+                            Q(solution_at=cursor.solution_at, **{pk_after: cursor.pk}) |
+                            Q(solution_at__isnull=True))
+        queryset = queryset.filter(after_cursor)
+    items = list(queryset.order_by(*order_by)[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = CheckQueueCursor(solution_at=last.solution_at, pk=last.pk)
+    return items, next_cursor
+
+
+def get_check_queue_counts(queryset: StudentAssignmentQuerySet) -> Dict[str, Any]:
+    """
+    Returns the number of personal assignments in the check queue
+    grouped by status and the number of personal assignments with
+    unread notifications.
+    """
+    rows = (queryset
+            .values('status')
+            .annotate(total=Count('pk'),
+                      unread=Count('pk', filter=Q(has_unread=True)))
+            .order_by('status'))
+    counts: Dict[str, Any] = {'total': 0, 'unread': 0, 'statuses': []}
+    for row in rows:
+        counts['statuses'].append({'status': row['status'], 'total': row['total']})
+        counts['total'] += row['total']
+        counts['unread'] += row['unread']
+    return counts
+
+
+STATUS_LOG_ACTIONS = {
+    'grade_updated': 'Grade updated',
+    'solution_submitted': 'Solution submitted for review',
+    'need_fixes': 'New comment received from reviewer',
+}
+
+
+def get_assignment_status_log(assignment: Assignment, *,
+                              date_from: Optional[datetime.date] = None,
+                              date_to: Optional[datetime.date] = None) -> QuerySet:
+    """
+    Returns published comments of the assignment with status transitions.
+    Each comment is annotated with `status_log_action`, a key of
+    the `STATUS_LOG_ACTIONS`.
+    """
+    status_changed = ~Q(meta__status=F('meta__status_old'))
+    status_log_action = Case(
+        When(status_changed & Q(meta__status=AssignmentStatus.COMPLETED),
+             then=Value('grade_updated')),
+        When(Q(author_id=F('student_assignment__student_id'),
+               meta__status=AssignmentStatus.ON_CHECKING),
+             then=Value('solution_submitted')),
+        When(status_changed & Q(meta__status=AssignmentStatus.NEED_FIXES),
+             then=Value('need_fixes')),
+        default=None,
+        output_field=CharField())
+    queryset = (AssignmentComment.objects
+                .filter(is_published=True,
+                        student_assignment__assignment=assignment,
+                        meta__has_keys=['status', 'status_old'])
+                .annotate(status_log_action=status_log_action)
+                .filter(status_log_action__isnull=False))
+    if date_from is not None:
+        queryset = queryset.filter(created__date__gte=date_from)
+    if date_to is not None:
+        queryset = queryset.filter(created__date__lte=date_to)
+    return (queryset
+            .select_related('author', 'student_assignment__student')
+            .only('created', 'author__username', 'author__first_name',
+                  'author__last_name', 'student_assignment__student__username',
+                  'student_assignment__student__first_name',
+                  'student_assignment__student__last_name')
+            .order_by('student_assignment__student', 'created'))
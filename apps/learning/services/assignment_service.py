@@ -1,8 +1,8 @@
 from datetime import timedelta
 from django.core.files.uploadedfile import UploadedFile
-from django.db import router
-from django.db.models import Avg, Q
-from typing import Iterable, List, Optional, Union
+from django.db import router, transaction
+from django.db.models import F, Q
+from typing import Iterable, List, Optional, Set, Tuple, Union
 
 from django_rq import get_queue
 
@@ -10,11 +10,16 @@ from core.services import SoftDeleteService
 from core.utils import chunks
 from courses.models import Assignment, AssignmentAttachment
 from learning.models import (
-    AssignmentNotification, Enrollment, StudentAssignment, StudentGroup
+    AssignmentNotification, AssignmentPublication, Enrollment, StudentAssignment,
+    StudentGroup
 )
-from learning.settings import StudentStatuses
+from learning.services.execution_time_stats import compute_execution_time_stats
+from learning.settings import AssignmentPublicationStatuses, StudentStatuses
 from notifications.tasks import send_assignment_notifications
 
+# Number of students processed in one transaction on assignment publication
+PUBLICATION_BATCH_SIZE = 500
+
 
 class AssignmentService:
     @staticmethod
@@ -55,20 +60,9 @@ class AssignmentService:
             # TODO: reset score? execution_time?
             student_assignment.restore()
 
-    # TODO: send notification to teachers
     @classmethod
-    def bulk_create_student_assignments(cls, assignment: Assignment,
-                                        for_groups: Iterable[Union[int, None]] = None):
-        """
-        Generates personal assignments to store student progress.
-        By default it creates record for each enrolled student who's not
-        expelled or on academic leave and the assignment is available for
-        the student group in which the student participates in the course.
-
-        You can process students from the specific groups only by setting
-        `for_groups`. Special value `for_groups=[..., None]` - includes
-        enrollments without student group.
-        """
+    def _get_student_ids(cls, assignment: Assignment,
+                         for_groups: Iterable[Union[int, None]] = None) -> List[int]:
         filters = [
             Q(course_id=assignment.course_id),
             ~Q(student_profile__status__in=StudentStatuses.inactive_statuses)
@@ -86,9 +80,36 @@ class AssignmentService:
             filters.append(groups_q)
         elif restrict_to:
             filters.append(Q(student_group_id__in=restrict_to))
-        students = list(Enrollment.active
-                        .filter(*filters)
-                        .values_list("student_id", flat=True))
+        return list(Enrollment.active
+                    .filter(*filters)
+                    .order_by('student_id')
+                    .values_list("student_id", flat=True))
+
+    # TODO: send notification to teachers
+    @classmethod
+    def bulk_create_student_assignments(cls, assignment: Assignment,
+                                        for_groups: Iterable[Union[int, None]] = None):
+        """
+        Generates personal assignments to store student progress.
+        By default it creates record for each enrolled student who's not
+        expelled or on academic leave and the assignment is available for
+        the student group in which the student participates in the course.
+
+        You can process students from the specific groups only by setting
+        `for_groups`. Special value `for_groups=[..., None]` - includes
+        enrollments without student group.
+        """
+        students = cls._get_student_ids(assignment, for_groups=for_groups)
+        cls._create_student_assignments(assignment, students)
+
+    @classmethod
+    def _create_student_assignments(cls, assignment: Assignment,
+                                    students: List[int]) -> None:
+        """
+        Creates missing or restores deleted personal assignments for
+        the given students. Students who already have personal assignment
+        are skipped, so it's safe to call it again for the same students.
+        """
         # Records could exist in case of transferring students from one
         # group to another
         already_exist = set(StudentAssignment.objects
@@ -108,7 +129,8 @@ class AssignmentService:
                 for student_id in to_create)
         for batch in chunks(objs, batch_size):
             batch = [x for x in batch if x is not None]
-            StudentAssignment.objects.bulk_create(batch, batch_size)
+            StudentAssignment.objects.bulk_create(batch, batch_size,
+                                                  ignore_conflicts=True)
         # TODO: move to the separated method
         # Generate notifications
         to_notify = [sid for sid in students if sid not in already_exist]
@@ -139,6 +161,63 @@ class AssignmentService:
                 # Running tests
                 queue.enqueue(send_assignment_notifications, ids)
 
+    @staticmethod
+    def schedule_publication(assignment: Assignment) -> AssignmentPublication:
+        """
+        Resets publication progress and enqueues the job that generates
+        personal assignments after the current transaction is committed.
+        """
+        from learning.tasks import publish_assignment
+        publication, _ = AssignmentPublication.objects.update_or_create(
+            assignment=assignment,
+            defaults={
+                "status": AssignmentPublicationStatuses.PENDING,
+                "total": 0,
+                "processed": 0,
+                "error": "",
+            })
+        transaction.on_commit(
+            lambda: publish_assignment.delay(assignment_id=assignment.pk))
+        return publication
+
+    @classmethod
+    def publish_student_assignments(cls, assignment: Assignment, *,
+                                    batch_size: int = PUBLICATION_BATCH_SIZE) -> AssignmentPublication:
+        """
+        Removes personal assignments of students from the groups the
+        assignment is not available anymore and creates missing ones
+        for the rest of the students.
+
+        Students are processed in batches, each batch is committed
+        separately and updates publication progress. Existing personal
+        assignments are skipped, so retrying a failed job doesn't
+        produce duplicates.
+        """
+        publication, _ = AssignmentPublication.objects.get_or_create(assignment=assignment)
+        publications = AssignmentPublication.objects.filter(pk=publication.pk)
+        try:
+            _, groups_remove = cls._get_sync_groups(assignment)
+            if groups_remove:
+                cls.bulk_remove_student_assignments(assignment,
+                                                    for_groups=groups_remove)
+            students = cls._get_student_ids(assignment)
+            publications.update(status=AssignmentPublicationStatuses.IN_PROGRESS,
+                                total=len(students), processed=0, error="")
+            for batch in chunks(students, batch_size):
+                batch = [x for x in batch if x is not None]
+                with transaction.atomic():
+                    # Serializes concurrent jobs for the same assignment
+                    publications.select_for_update().get()
+                    cls._create_student_assignments(assignment, batch)
+                    publications.update(processed=F('processed') + len(batch))
+        except Exception as e:
+            publications.update(status=AssignmentPublicationStatuses.FAILED,
+                                error=str(e))
+            raise
+        publications.update(status=AssignmentPublicationStatuses.COMPLETED)
+        publication.refresh_from_db()
+        return publication
+
     @classmethod
     def bulk_remove_student_assignments(cls, assignment: Assignment,
                                         for_groups: Iterable[Union[int, None]] = None):
@@ -176,10 +255,10 @@ class AssignmentService:
          .delete())
 
     @classmethod
-    def sync_student_assignments(cls, assignment: Assignment):
+    def _get_sync_groups(cls, assignment: Assignment) -> Tuple[Set[Optional[int]], Set[Optional[int]]]:
         """
-        Sync student assignments by deleting or creating missing records
-        after assignment visibility settings have been changed.
+        Returns student groups without personal assignments that must
+        be processed and groups that lost access to the assignment.
         """
         ss = (StudentAssignment.objects
               .filter(assignment=assignment)
@@ -199,35 +278,27 @@ class AssignmentService:
             # Special case - students without student group
             restricted_to_groups.add(None)
         groups_add = restricted_to_groups.difference(existing_groups)
+        groups_remove = existing_groups.difference(restricted_to_groups)
+        return groups_add, groups_remove
+
+    @classmethod
+    def sync_student_assignments(cls, assignment: Assignment):
+        """
+        Sync student assignments by deleting or creating missing records
+        after assignment visibility settings have been changed.
+        """
+        groups_add, groups_remove = cls._get_sync_groups(assignment)
         if groups_add:
             cls.bulk_create_student_assignments(assignment,
                                                 for_groups=groups_add)
-        groups_remove = existing_groups.difference(restricted_to_groups)
         if groups_remove:
             cls.bulk_remove_student_assignments(assignment,
                                                 for_groups=groups_remove)
 
     @classmethod
-    def get_mean_execution_time(cls, assignment: Assignment):
-        stats = (StudentAssignment.objects
-                 .filter(assignment=assignment)
-                 .aggregate(mean=Avg('execution_time')))
-        return stats['mean']
+    def get_mean_execution_time(cls, assignment: Assignment) -> Optional[timedelta]:
+        return compute_execution_time_stats(assignment).mean
 
     @classmethod
-    def get_median_execution_time(cls, assignment: Assignment):
-        queryset = (StudentAssignment.objects
-                    .filter(assignment=assignment)
-                    .exclude(execution_time__isnull=True))
-        count = queryset.count()
-        if not count:
-            return None
-        # TODO: perf: combine with queryset.count()
-        values = (queryset
-                  .values_list('execution_time', flat=True)
-                  .order_by('execution_time'))
-        if count % 2 == 1:
-            return values[count // 2]
-        else:
-            mid = count // 2
-            return sum(values[mid - 1:mid + 1], timedelta()) / 2
+    def get_median_execution_time(cls, assignment: Assignment) -> Optional[timedelta]:
+        return compute_execution_time_stats(assignment).median
@@ -0,0 +1,85 @@
+"""
+Statistics of the time students spent on assignments. Mean and quantiles
+are computed by the database with one grouped query for all assignments
+of the course. Results are cached and invalidated when
+the execution time of a personal assignment is changed (see receivers
+in `learning.signals`).
+"""
+from datetime import timedelta
+from typing import Dict, NamedTuple, Optional
+
+from django.db.models import Avg, Count, QuerySet
+
+from core.cache import CachedValue, reports_cache
+from core.db.functions import PercentileCont
+from courses.models import Assignment
+from learning.models import StudentAssignment
+
+EXECUTION_TIME_STATS_CACHE_VERSION = 2
+EXECUTION_TIME_STATS_CACHE_TIMEOUT = 24 * 3600
+
+
+class ExecutionTimeStats(NamedTuple):
+    count: int
+    mean: Optional[timedelta]
+    median: Optional[timedelta]
+    p90: Optional[timedelta]
+
+
+EMPTY_EXECUTION_TIME_STATS = ExecutionTimeStats(count=0, mean=None, median=None, p90=None)
+
+
+def _get_stats_aggregates() -> Dict:
+    return {
+        'count': Count('execution_time'),
+        'mean': Avg('execution_time'),
+        'median': PercentileCont('execution_time', 0.5),
+        'p90': PercentileCont('execution_time', 0.9),
+    }
+
+
+def _to_stats(values: Dict) -> ExecutionTimeStats:
+    return ExecutionTimeStats(count=values['count'], mean=values['mean'],
+                              median=values['median'], p90=values['p90'])
+
+
+def _get_queryset() -> QuerySet:
+    return StudentAssignment.objects.filter(execution_time__isnull=False).order_by()
+
+
+def compute_execution_time_stats(assignment: Assignment) -> ExecutionTimeStats:
+    stats = (_get_queryset()
+             .filter(assignment=assignment)
+             .aggregate(**_get_stats_aggregates()))
+    return _to_stats(stats)
+
+
+def compute_course_execution_time_stats(course_id: int) -> Dict[int, ExecutionTimeStats]:
+    """
+    Returns stats of the course assignments with at least one reported
+    execution time.
+    """
+    rows = (_get_queryset()
+            .filter(assignment__course_id=course_id)
+            .values('assignment_id')
+            .annotate(**_get_stats_aggregates()))
+    return {row['assignment_id']: _to_stats(row) for row in rows}
+
+
+_course_execution_time_stats: CachedValue[Dict[int, ExecutionTimeStats]] = CachedValue(
+    "execution_time_stats:{version}:{course_id}", version=EXECUTION_TIME_STATS_CACHE_VERSION,
+    timeout=EXECUTION_TIME_STATS_CACHE_TIMEOUT, cache=reports_cache)
+
+
+def get_course_execution_time_stats(course_id: int) -> Dict[int, ExecutionTimeStats]:
+    return _course_execution_time_stats.get(
+        lambda: compute_course_execution_time_stats(course_id), course_id=course_id)
+
+
+def get_execution_time_stats(assignment: Assignment) -> ExecutionTimeStats:
+    stats = get_course_execution_time_stats(assignment.course_id)
+    return stats.get(assignment.pk, EMPTY_EXECUTION_TIME_STATS)
+
+
+def invalidate_execution_time_stats(course_id: int) -> None:
+    _course_execution_time_stats.invalidate(course_id=course_id)
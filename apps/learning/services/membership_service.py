@@ -0,0 +1,82 @@
+"""
+Ids of the courses the user is enrolled in or teaches. This information
+is needed on almost every page (e.g. to render the top menu), so it's
+stored in cache and invalidated by signals on enrollment and course
+teacher changes. User roles are cached in the identity snapshot, see
+`users.identity`.
+
+Course access roles of the user are cached along with membership since
+they depend on the same data, e.g. access to the course class materials is
+checked on each file download. Each role is stored under its own key
+with the data version of the user and the global one, the latter changes
+on course program binding and invitation changes.
+"""
+from typing import FrozenSet, NamedTuple
+
+from core.cache import CachedValue, DataVersion, permissions_cache
+from courses.models import CourseTeacher
+from learning.models import Enrollment
+from learning.services.misc import CourseRole, course_access_role
+
+USER_MEMBERSHIP_CACHE_VERSION = 2
+USER_MEMBERSHIP_CACHE_TIMEOUT = 24 * 3600
+# Access role also depends on the course completion date which is not
+# tracked by signals
+COURSE_ACCESS_ROLES_CACHE_TIMEOUT = 300
+
+
+class UserMembership(NamedTuple):
+    enrolled_in: FrozenSet[int]
+    teaching: FrozenSet[int]
+
+
+def _load_user_membership(user_id: int) -> UserMembership:
+    enrolled_in = (Enrollment.active
+                   .filter(student_id=user_id)
+                   .values_list('course_id', flat=True))
+    teaching = (CourseTeacher.objects
+                .filter(teacher_id=user_id)
+                .values_list('course_id', flat=True))
+    return UserMembership(enrolled_in=frozenset(enrolled_in),
+                          teaching=frozenset(teaching))
+
+
+_user_membership: CachedValue[UserMembership] = CachedValue(
+    "user_membership:{version}:{user_id}", version=USER_MEMBERSHIP_CACHE_VERSION,
+    timeout=USER_MEMBERSHIP_CACHE_TIMEOUT, cache=permissions_cache)
+_course_access_roles_version = DataVersion(
+    "course_access_roles:{version}:data_version",
+    version=USER_MEMBERSHIP_CACHE_VERSION, cache=permissions_cache)
+_user_course_access_roles_version = DataVersion(
+    "course_access_roles:{version}:{user_id}:data_version",
+    version=USER_MEMBERSHIP_CACHE_VERSION, cache=permissions_cache)
+_course_access_role: CachedValue[CourseRole] = CachedValue(
+    "course_access_role:{version}:{data_version}:{user_id}:{user_data_version}:{course_id}",
+    version=USER_MEMBERSHIP_CACHE_VERSION, timeout=COURSE_ACCESS_ROLES_CACHE_TIMEOUT,
+    cache=permissions_cache)
+
+
+def get_user_membership(user_id: int) -> UserMembership:
+    return _user_membership.get(lambda: _load_user_membership(user_id), user_id=user_id)
+
+
+def get_cached_course_access_role(*, course, user) -> CourseRole:
+    """Cached version of `learning.services.misc.course_access_role`"""
+    if not user.is_authenticated:
+        return CourseRole.NO_ROLE
+    return _course_access_role.get(
+        lambda: course_access_role(course=course, user=user),
+        data_version=_course_access_roles_version.get(),
+        user_id=user.pk,
+        user_data_version=_user_course_access_roles_version.get(user_id=user.pk),
+        course_id=course.pk)
+
+
+def invalidate_user_membership(user_id: int) -> None:
+    _user_membership.invalidate(user_id=user_id)
+    _user_course_access_roles_version.invalidate(user_id=user_id)
+
+
+def invalidate_course_access_roles() -> None:
+    """Invalidates course access roles of all users"""
+    _course_access_roles_version.invalidate()
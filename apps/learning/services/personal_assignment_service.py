@@ -1,20 +1,22 @@
 import logging
 from collections import defaultdict
-from datetime import timedelta
+from datetime import datetime, timedelta
 from decimal import Decimal
-from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Literal
 
 from django.core.exceptions import ValidationError, MultipleObjectsReturned
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
 from django.db.models import (
-    Case, Count, DateTimeField, F, IntegerField, Max, Min, When, Window
+    Case, Count, DateTimeField, F, IntegerField, Max, Min, OuterRef, Q, Subquery, When,
+    Window
 )
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from markupsafe import Markup
 
+from core.db.functions import JSONBDeleteKey
+from core.locks import acquire_cache_lock
 from core.timezone import get_now_utc
 from core.typings import assert_never
 from core.utils import _empty
@@ -31,11 +33,16 @@ from users.models import User
 
 logger = logging.getLogger(__name__)
 
+PERSONAL_ASSIGNMENT_STATS_LOCK = "personal_assignment_stats_{}"
+# Max delay of the stats recalculation if the job has been lost
+PERSONAL_ASSIGNMENT_STATS_LOCK_TIMEOUT = 300
+
 
 def update_personal_assignment_stats(*, personal_assignment: StudentAssignment) -> None:
     """
     Calculates personal assignment stats and saves it in a `stats` property
-    of the .meta json field.
+    of the .meta json field. Datetime of the latest solution is also
+    copied to the `solution_at` column.
 
     Full Example:
         {
@@ -73,38 +80,216 @@ def update_personal_assignment_stats(*, personal_assignment: StudentAssignment)
                          .order_by('created')
                          .last())
     if latest_submission is None:
+        # All submissions have been deleted or unpublished
+        meta = personal_assignment.meta
+        if meta:
+            meta.pop('stats', None)
+        (StudentAssignment.objects
+         .filter(pk=personal_assignment.pk)
+         .update(meta=meta, solution_at=None))
+        personal_assignment.solution_at = None
         return
 
-    if latest_submission.type == AssignmentSubmissionTypes.SOLUTION:
-        latest_activity = PersonalAssignmentActivity.SOLUTION
-    elif latest_submission.type == AssignmentSubmissionTypes.COMMENT:
-        is_student = latest_submission.author_id == personal_assignment.student_id
-        if is_student:
-            latest_activity = PersonalAssignmentActivity.STUDENT_COMMENT
-        else:
-            latest_activity = PersonalAssignmentActivity.TEACHER_COMMENT
-    else:
-        raise ValueError('Unknown submission type')
+    latest_activity = get_personal_assignment_activity(submission_type=latest_submission.type,
+                                                       author_id=latest_submission.author_id,
+                                                       student_id=personal_assignment.student_id)
     # Django 3.2 doesn't support partial update of the json field,
     # better to select_for_update
     meta = personal_assignment.meta or {}
-    new_stats = {'activity': str(latest_activity)}
-    comments_total = latest_submission.submissions_total - latest_submission.solutions_total
+    meta['stats'] = _build_personal_assignment_stats(
+        activity=latest_activity,
+        submissions_total=latest_submission.submissions_total,
+        solutions_total=latest_submission.solutions_total,
+        solution_first=latest_submission.solution_first,
+        solution_latest=latest_submission.solution_latest)
+    solution_at = _get_solution_at(latest_submission.solution_latest)
+    (StudentAssignment.objects
+     .filter(pk=personal_assignment.pk)
+     .update(meta=meta, solution_at=solution_at))
+    personal_assignment.solution_at = solution_at
+
+
+def get_personal_assignment_activity(*, submission_type: str, author_id: Optional[int],
+                                     student_id: int) -> PersonalAssignmentActivity:
+    if submission_type == AssignmentSubmissionTypes.SOLUTION:
+        return PersonalAssignmentActivity.SOLUTION
+    elif submission_type == AssignmentSubmissionTypes.COMMENT:
+        if author_id == student_id:
+            return PersonalAssignmentActivity.STUDENT_COMMENT
+        return PersonalAssignmentActivity.TEACHER_COMMENT
+    raise ValueError('Unknown submission type')
+
+
+def _build_personal_assignment_stats(*, activity: PersonalAssignmentActivity,
+                                     submissions_total: int,
+                                     solutions_total: int,
+                                     solution_first: Optional[datetime],
+                                     solution_latest: Optional[datetime]) -> Dict[str, Any]:
+    new_stats: Dict[str, Any] = {'activity': str(activity)}
+    comments_total = submissions_total - solutions_total
     if comments_total:
         new_stats['comments'] = comments_total
     # Omit default or null values to save space
-    if latest_submission.solutions_total:
+    if solutions_total:
         solution_stats = {
-            'count': latest_submission.solutions_total,
-            'first': latest_submission.solution_first.replace(microsecond=0),
+            'count': solutions_total,
+            'first': solution_first.replace(microsecond=0),
         }
-        if latest_submission.solutions_total > 1:
-            solution_stats['last'] = latest_submission.solution_latest.replace(microsecond=0)
+        if solutions_total > 1:
+            solution_stats['last'] = solution_latest.replace(microsecond=0)
         new_stats['solutions'] = solution_stats
-    meta['stats'] = new_stats
+    return new_stats
+
+
+def _get_solution_at(solution_latest: Optional[datetime]) -> Optional[datetime]:
+    """
+    Returns value of the `StudentAssignment.solution_at` column which
+    must be in sync with the latest solution datetime stored in stats.
+    """
+    if solution_latest is None:
+        return None
+    return solution_latest.replace(microsecond=0)
+
+
+def apply_personal_assignment_stats_delta(*, personal_assignment: StudentAssignment,
+                                          submission: AssignmentComment) -> bool:
+    """
+    Incrementally updates stats in the .meta json field of the personal
+    assignment with a just published *submission* instead of recalculating
+    them over all published submissions.
+
+    Stats that have never been calculated (e.g. on the first submission)
+    are calculated in place for this personal assignment.
+
+    Returns False if stats can't be updated incrementally (e.g. stats are
+    stored in a legacy format or the submission is older than the latest
+    known solution), full recalculation should be scheduled in that case.
+    """
+    with transaction.atomic():
+        locked_personal_assignment = (StudentAssignment.objects
+                                      .select_for_update()
+                                      .only('pk', 'student_id', 'meta')
+                                      .get(pk=personal_assignment.pk))
+        meta = locked_personal_assignment.meta or {}
+        if 'stats' not in meta:
+            update_personal_assignment_stats(personal_assignment=locked_personal_assignment)
+            personal_assignment.meta = locked_personal_assignment.meta
+            personal_assignment.solution_at = locked_personal_assignment.solution_at
+            return True
+        stats = meta['stats']
+        if not isinstance(stats, dict):
+            return False
+        solution_stats = stats.get('solutions', {})
+        if not isinstance(solution_stats, dict):
+            return False
+        created = submission.created.replace(microsecond=0)
+        update_fields: Dict[str, Any] = {}
+        new_stats = {
+            **stats,
+            'activity': str(get_personal_assignment_activity(
+                submission_type=submission.type,
+                author_id=submission.author_id,
+                student_id=locked_personal_assignment.student_id))
+        }
+        if submission.type == AssignmentSubmissionTypes.SOLUTION:
+            solutions_total = solution_stats.get('count', 0)
+            if solutions_total:
+                solution_latest = solution_stats.get('last', solution_stats.get('first'))
+                if isinstance(solution_latest, str):
+                    solution_latest = datetime.fromisoformat(solution_latest.replace('Z', '+00:00'))
+                if solution_latest is None or created < solution_latest:
+                    return False
+                new_stats['solutions'] = {**solution_stats,
+                                          'count': solutions_total + 1,
+                                          'last': created}
+            else:
+                new_stats['solutions'] = {'count': 1, 'first': created}
+            update_fields['solution_at'] = created
+        else:
+            new_stats['comments'] = stats.get('comments', 0) + 1
+        meta['stats'] = new_stats
+        update_fields['meta'] = meta
+        (StudentAssignment.objects
+         .filter(pk=personal_assignment.pk)
+         .update(**update_fields))
+    for field_name, value in update_fields.items():
+        setattr(personal_assignment, field_name, value)
+    return True
+
+
+def schedule_personal_assignment_stats_update(personal_assignment_id: int) -> None:
+    """
+    Enqueues full stats recalculation on transaction commit. Subsequent
+    calls are coalesced into one job until the job is started.
+    """
+    from learning.tasks import update_student_assignment_stats
+
+    def enqueue():
+        lock_name = PERSONAL_ASSIGNMENT_STATS_LOCK.format(personal_assignment_id)
+        if acquire_cache_lock(lock_name, timeout=PERSONAL_ASSIGNMENT_STATS_LOCK_TIMEOUT):
+            update_student_assignment_stats.delay(personal_assignment_id)
+    transaction.on_commit(enqueue)
+
+
+def on_submission_published(*, personal_assignment: StudentAssignment,
+                            submission: AssignmentComment) -> None:
+    applied = apply_personal_assignment_stats_delta(personal_assignment=personal_assignment,
+                                                    submission=submission)
+    if not applied:
+        schedule_personal_assignment_stats_update(personal_assignment.pk)
+
+
+def bulk_update_personal_assignment_stats(*, course_id: int) -> int:
+    """
+    Recalculates stats of all personal assignments of the course
+    with a single grouped query. Returns the number of updated records.
+    """
+    is_solution = Q(type=AssignmentSubmissionTypes.SOLUTION)
+    latest_submission = (AssignmentComment.published
+                         .filter(student_assignment_id=OuterRef('student_assignment_id'))
+                         .order_by('-created'))
+    aggregated = (AssignmentComment.published
+                  .filter(student_assignment__assignment__course_id=course_id)
+                  .values('student_assignment_id', 'student_assignment__student_id')
+                  .annotate(submissions_total=Count('*'),
+                            solutions_total=Count('pk', filter=is_solution),
+                            solution_first=Min('created', filter=is_solution),
+                            solution_latest=Max('created', filter=is_solution),
+                            latest_type=Subquery(latest_submission.values('type')[:1]),
+                            latest_author_id=Subquery(latest_submission.values('author_id')[:1]))
+                  .order_by())
+    stats_by_personal_assignment = {}
+    for row in aggregated:
+        activity = get_personal_assignment_activity(submission_type=row['latest_type'],
+                                                    author_id=row['latest_author_id'],
+                                                    student_id=row['student_assignment__student_id'])
+        stats = _build_personal_assignment_stats(activity=activity,
+                                                 submissions_total=row['submissions_total'],
+                                                 solutions_total=row['solutions_total'],
+                                                 solution_first=row['solution_first'],
+                                                 solution_latest=row['solution_latest'])
+        solution_at = _get_solution_at(row['solution_latest'])
+        stats_by_personal_assignment[row['student_assignment_id']] = (stats, solution_at)
+    personal_assignments = list(StudentAssignment.objects
+                                .filter(pk__in=stats_by_personal_assignment)
+                                .only('pk', 'meta', 'solution_at'))
+    for personal_assignment in personal_assignments:
+        stats, solution_at = stats_by_personal_assignment[personal_assignment.pk]
+        meta = personal_assignment.meta or {}
+        meta['stats'] = stats
+        personal_assignment.meta = meta
+        personal_assignment.solution_at = solution_at
+    StudentAssignment.objects.bulk_update(personal_assignments,
+                                          fields=['meta', 'solution_at'],
+                                          batch_size=1000)
+    # Submissions of the rest personal assignments have been deleted
+    # or unpublished
     (StudentAssignment.objects
-     .filter(pk=personal_assignment.pk)
-     .update(meta=meta))
+     .filter(Q(solution_at__isnull=False) | Q(meta__has_key='stats'),
+             assignment__course_id=course_id)
+     .exclude(pk__in=stats_by_personal_assignment)
+     .update(meta=JSONBDeleteKey('meta', 'stats'), solution_at=None))
+    return len(personal_assignments)
 
 
 def create_assignment_solution(*, personal_assignment: StudentAssignment,
@@ -136,9 +321,8 @@ def create_assignment_solution(*, personal_assignment: StudentAssignment,
                                  meta=meta,
                                  attached_file=attachment)
     solution.save()
-    from learning.tasks import update_student_assignment_stats
-    update_stats = partial(update_student_assignment_stats.delay, personal_assignment.pk)
-    transaction.on_commit(update_stats)
+    on_submission_published(personal_assignment=personal_assignment,
+                            submission=solution)
 
     return solution
 
@@ -194,10 +378,9 @@ def create_assignment_comment(*, personal_assignment: StudentAssignment,
             **meta
         }
     comment.save()
-
-    from learning.tasks import update_student_assignment_stats
-    update_stats = partial(update_student_assignment_stats.delay, personal_assignment.pk)
-    transaction.on_commit(update_stats)
+    if comment.is_published:
+        on_submission_published(personal_assignment=personal_assignment,
+                                submission=comment)
 
     return comment
 
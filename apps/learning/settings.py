@@ -161,3 +161,10 @@ class AssignmentScoreUpdateSource(TextChoices):
     FORM_GRADEBOOK = 'gradebook', _("Gradebook")
     WEBHOOK_GERRIT = 'webhook-gerrit', _("Gerrit Webhook")
     JBA_SUBMISSION = 'jba-submission', _("JetBrains Academy Submission")
+
+
+class AssignmentPublicationStatuses(TextChoices):
+    PENDING = 'pending', _("Pending")
+    IN_PROGRESS = 'in_progress', _("Publishing")
+    COMPLETED = 'completed', _("Published")
+    FAILED = 'failed', _("Failed")
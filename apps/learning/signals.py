@@ -1,4 +1,6 @@
-from django.db.models.signals import post_delete, post_save
+from typing import Any
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django_rq import get_queue
 
@@ -9,15 +11,20 @@ from courses.models import (
 )
 from learning.models import (
     AssignmentComment, AssignmentNotification, AssignmentSubmissionTypes,
-    CourseNewsNotification, Enrollment, StudentAssignment, StudentGroup
+    CourseNewsNotification, Enrollment, Invitation, StudentAssignment, StudentGroup
 )
 from learning.services import StudentGroupService
 from learning.services.enrollment_service import update_course_learners_count
+from learning.services.execution_time_stats import invalidate_execution_time_stats
 from learning.services.jba_service import JbaService
+from learning.services.membership_service import (
+    invalidate_course_access_roles, invalidate_user_membership
+)
 # FIXME: post_delete нужен? Что лучше - удалять StudentGroup + SET_NULL у Enrollment или делать soft-delete?
 # FIXME: группу лучше удалить, т.к. она будет предлагаться для новых заданий, хотя типа уже удалена.
 from learning.tasks import convert_assignment_submission_ipynb_file_to_html
 from notifications.tasks import send_assignment_notifications, send_course_news_notifications
+from users.models import StudentProfile, UserGroup
 
 
 @receiver(post_save, sender=Course)
@@ -186,13 +193,39 @@ def convert_ipynb_files(sender, instance: AssignmentComment, *args, **kwargs):
         convert_assignment_submission_ipynb_file_to_html.delay(**kwargs)
 
 
+def _invalidate_execution_time_stats(**assignment_filters: Any) -> None:
+    course_id = (Assignment.objects
+                 .filter(**assignment_filters)
+                 .values_list('course_id', flat=True)
+                 .first())
+    if course_id is not None:
+        invalidate_execution_time_stats(course_id)
+
+
+def _update_execution_time(solution: AssignmentComment) -> None:
+    personal_assignments = StudentAssignment.objects.filter(pk=solution.student_assignment_id)
+    updated = StudentAssignment.bulk_compute_fields(personal_assignments, 'execution_time')
+    execution_time = updated['execution_time']
+    if solution.student_assignment_id not in execution_time:
+        return
+    # Sync cached personal assignment instance
+    if AssignmentComment.student_assignment.is_cached(solution):
+        student_assignment = solution.student_assignment
+        student_assignment.execution_time = execution_time[student_assignment.pk]
+        student_assignment.tracker.set_saved_fields(fields=['execution_time'])
+        if StudentAssignment.assignment.is_cached(student_assignment):
+            invalidate_execution_time_stats(student_assignment.assignment.course_id)
+            return
+    _invalidate_execution_time_stats(studentassignment=solution.student_assignment_id)
+
+
 # TODO: move to the create_assignment_solution service method
 @receiver(post_save, sender=AssignmentComment)
 def save_student_solution(sender, instance: AssignmentComment, *args, **kwargs):
     """Updates aggregated execution time value on StudentAssignment model"""
     if instance.type != AssignmentSubmissionTypes.SOLUTION:
         return
-    instance.student_assignment.compute_fields('execution_time')
+    _update_execution_time(instance)
 
 
 @receiver(post_delete, sender=AssignmentComment)
@@ -201,4 +234,72 @@ def delete_student_solution(sender, instance: AssignmentComment,
     """Updates aggregated execution time value on StudentAssignment model"""
     if instance.type != AssignmentSubmissionTypes.SOLUTION:
         return
-    instance.student_assignment.compute_fields('execution_time')
+    _update_execution_time(instance)
+
+
+@receiver(post_save, sender=StudentAssignment)
+def invalidate_execution_time_stats_on_change(sender, instance: StudentAssignment,
+                                              created, *args, **kwargs):
+    """
+    Covers changes made with the admin. Deleted personal assignments
+    are not tracked, stats expire after the cache timeout.
+    """
+    if created:
+        if instance.execution_time is None:
+            return
+    elif not instance.tracker.has_changed('execution_time'):
+        return
+    if StudentAssignment.assignment.is_cached(instance):
+        invalidate_execution_time_stats(instance.assignment.course_id)
+    else:
+        _invalidate_execution_time_stats(pk=instance.assignment_id)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_student_membership(sender, instance: Enrollment, *args, **kwargs):
+    invalidate_user_membership(instance.student_id)
+
+
+@receiver(post_save, sender=CourseTeacher)
+@receiver(post_delete, sender=CourseTeacher)
+def invalidate_teacher_membership(sender, instance: CourseTeacher, *args, **kwargs):
+    invalidate_user_membership(instance.teacher_id)
+
+
+@receiver(m2m_changed, sender=Course.teachers.through)
+def invalidate_teachers_membership(sender, instance, action, reverse, pk_set, *args, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        user_ids = [instance.pk]
+    elif action == 'pre_clear':
+        user_ids = list(instance.teachers.values_list('pk', flat=True))
+    else:
+        user_ids = pk_set
+    for user_id in user_ids:
+        invalidate_user_membership(user_id)
+
+
+@receiver(post_save, sender=UserGroup)
+@receiver(post_delete, sender=UserGroup)
+def invalidate_user_course_access_roles(sender, instance: UserGroup, *args, **kwargs):
+    # Course access role depends on the user roles
+    invalidate_user_membership(instance.user_id)
+
+
+@receiver(post_save, sender=StudentProfile)
+def invalidate_student_course_access_roles(sender, instance: StudentProfile,
+                                           *args, **kwargs):
+    # Course access role depends on the student status
+    invalidate_user_membership(instance.user_id)
+
+
+@receiver(post_save, sender=CourseProgramBinding)
+@receiver(post_delete, sender=CourseProgramBinding)
+@receiver(post_save, sender=Invitation)
+@receiver(post_delete, sender=Invitation)
+@receiver(m2m_changed, sender=Invitation.enrolled_students.through)
+def invalidate_all_course_access_roles(sender, *args, **kwargs):
+    # Course bindings and invitations define who can enroll in the course
+    invalidate_course_access_roles()
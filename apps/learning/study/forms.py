@@ -4,6 +4,7 @@ from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Div, Layout, Submit, Row
 
 from django import forms
+from django.db.models import TextChoices
 from django.forms import SelectMultiple
 from django.utils.translation import gettext_lazy as _
 
@@ -56,6 +57,12 @@ class AssignmentCommentForm(forms.ModelForm):
         return cleaned_data
 
 
+class DeadlineWindow(TextChoices):
+    WEEK = 'week', _("Next 7 days")
+    MONTH = 'month', _("Next 30 days")
+    PAST = 'past', _("Past deadline")
+
+
 class StudentAssignmentListFilter(forms.Form):
 
     format = forms.MultipleChoiceField(
@@ -82,18 +89,26 @@ class StudentAssignmentListFilter(forms.Form):
         widget=forms.Select(attrs={"class": "form-control"})
     )
 
+    deadline = forms.ChoiceField(
+        label=_("Deadline"),
+        choices=[('', _("Any time")), *DeadlineWindow.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control"})
+    )
+
     def __init__(self, enrolled_in: List[int], **kwargs):
         super().__init__(**kwargs)
         self.helper = FormHelper(self)
         self.helper.layout = Layout(
             Row(
-                Div('format', css_class='col-xs-3'),
+                Div('format', css_class='col-xs-2'),
                 Div('status', css_class='col-xs-3'),
                 Div('course', css_class='col-xs-3'),
+                Div('deadline', css_class='col-xs-2'),
                 Div(Submit('apply', _('Apply'),
                            css_class="btn btn-primary btn-outline "
                                      "btn-block -inline-submit"),
-                    css_class="col-xs-3"),
+                    css_class="col-xs-2"),
             ))
         courses = (Course.objects.filter(pk__in=enrolled_in).select_related("meta_course"))
         self.fields['course'].choices = [
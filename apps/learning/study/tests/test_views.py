@@ -1020,6 +1020,80 @@ def test_student_assignment_list_filters_cleared_when_empty(client):
     assert filter_form['status'].value() == []
 
 
+@pytest.mark.django_db
+def test_student_assignment_list_pagination(client, mocker):
+    mocker.patch('learning.study.views.StudentAssignmentListView.paginate_by', 2)
+    course = CourseFactory(semester=SemesterFactory.create_current())
+    student = StudentFactory()
+    EnrollmentFactory(course=course, student=student)
+    now = timezone.now()
+    open_assignments = [AssignmentFactory(course=course, deadline_at=now + timedelta(days=d))
+                        for d in range(1, 4)]
+    archive_assignments = [AssignmentFactory(course=course, deadline_at=now - timedelta(days=d))
+                           for d in range(1, 3)]
+    url = reverse('study:assignment_list')
+    client.login(student)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.context['assignment_list_open_page'].paginator.count == 3
+    assert [sa.assignment for sa in response.context['assignment_list_open']] == open_assignments[:2]
+    assert response.context['assignment_list_archive_page'].paginator.count == 2
+    assert [sa.assignment for sa in response.context['assignment_list_archive']] == archive_assignments
+    response = client.get(url, {'open_page': 2})
+    assert [sa.assignment for sa in response.context['assignment_list_open']] == open_assignments[2:]
+    # Saved filters are applied if query contains the page number only
+    client.post(url, {"format": [AssignmentFormat.EXTERNAL]})
+    response = client.get(url, {'open_page': 2})
+    assert response.context['assignment_list_open_page'].paginator.count == 0
+    assert STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY in client.session
+
+
+@pytest.mark.django_db
+def test_student_assignment_list_filters_no_session_write(client, mocker):
+    course = CourseFactory(semester=SemesterFactory.create_current())
+    student = StudentFactory()
+    EnrollmentFactory(course=course, student=student)
+    url = reverse('study:assignment_list')
+    client.login(student)
+    client.post(url, {"format": [AssignmentFormat.ONLINE]})
+    mocked_save = mocker.patch('django.contrib.sessions.backends.db.SessionStore.save')
+    response = client.get(url)
+    assert response.status_code == 200
+    response = client.get(url, {"format": [AssignmentFormat.ONLINE]})
+    assert response.status_code == 200
+    mocked_save.assert_not_called()
+    client.get(url, {"format": [AssignmentFormat.EXTERNAL]})
+    mocked_save.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_student_assignment_list_deadline_filter(client):
+    course = CourseFactory(semester=SemesterFactory.create_current())
+    student = StudentFactory()
+    EnrollmentFactory(course=course, student=student)
+    now = timezone.now()
+    this_week = AssignmentFactory(course=course, deadline_at=now + timedelta(days=3))
+    this_month = AssignmentFactory(course=course, deadline_at=now + timedelta(days=20))
+    AssignmentFactory(course=course, deadline_at=now + timedelta(days=60))
+    past = AssignmentFactory(course=course, deadline_at=now - timedelta(days=1))
+    url = reverse('study:assignment_list')
+    client.login(student)
+    response = client.get(url, {'deadline': 'week'})
+    assert [sa.assignment for sa in response.context['assignment_list_open']] == [this_week]
+    assert not response.context['assignment_list_archive']
+    response = client.get(url, {'deadline': 'month'})
+    assert [sa.assignment for sa in response.context['assignment_list_open']] == [this_week, this_month]
+    response = client.get(url, {'deadline': 'past'})
+    assert not response.context['assignment_list_open']
+    assert [sa.assignment for sa in response.context['assignment_list_archive']] == [past]
+    assert client.session[STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY]['deadline'] == 'past'
+    # Saved filter is applied
+    response = client.get(url)
+    assert [sa.assignment for sa in response.context['assignment_list_archive']] == [past]
+    response = client.post(url, {'deadline': 'week'})
+    assert 'deadline=week' in response.url
+
+
 @pytest.mark.django_db
 def test_draft_comment_with_file(client, assert_redirect):
     student_profile = StudentProfileFactory()
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 from typing import Iterable, List
 from urllib import parse
 
@@ -7,6 +7,7 @@ from isoweek import Week
 from vanilla import GenericModelView, TemplateView
 
 from django.contrib import messages
+from django.core.paginator import Page, Paginator
 from django.db import transaction
 from django.db.models import Prefetch, Q
 from django.http import HttpResponseBadRequest, HttpResponseRedirect, QueryDict
@@ -26,7 +27,6 @@ from courses.utils import MonthPeriod, extended_month_date_range, get_current_te
 from courses.views import MonthEventsCalendarView, WeekEventsView
 from info_blocks.constants import CurrentInfoBlockTags
 from info_blocks.models import InfoBlock
-from learning import utils
 from learning.calendar import get_all_calendar_events, get_student_calendar_events
 from learning.models import Enrollment, StudentAssignment
 from learning.permissions import (
@@ -39,7 +39,9 @@ from learning.services.jba_service import JbaService, UnknownLanguage
 from learning.services.personal_assignment_service import (
     get_assignment_update_history_message, get_draft_comment
 )
-from learning.study.forms import AssignmentCommentForm, StudentAssignmentListFilter
+from learning.study.forms import (
+    AssignmentCommentForm, DeadlineWindow, StudentAssignmentListFilter
+)
 from learning.study.services import get_solution_form, save_solution_form, get_current_semester_active_courses
 from learning.views import AssignmentSubmissionBaseView
 from learning.views.views import (
@@ -98,67 +100,115 @@ class TimetableView(PermissionRequiredMixin, WeekEventsView):
 
 
 STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY = "student_assignment_filters"
+DEADLINE_WINDOW_DAYS = {
+    DeadlineWindow.WEEK: 7,
+    DeadlineWindow.MONTH: 30,
+}
 
 
 class StudentAssignmentListView(PermissionRequiredMixin, TemplateView):
     """Shows assignments for the current term."""
     template_name = "lms/study/assignment_list.html"
     permission_required = ViewOwnStudentAssignments.name
+    paginate_by = 50
+    open_page_kwarg = 'open_page'
+    archive_page_kwarg = 'archive_page'
 
     def get_queryset(self, current_term):
         today = get_now_utc().date()
-        left_enrollments = Enrollment.objects.filter(
-            student=self.request.user,
-            is_deleted=True,
-            course__completed_at__gt=today
-        )
-        left_courses = [e.course_id for e in left_enrollments]
+        left_courses = (Enrollment.objects
+                        .filter(student=self.request.user,
+                                is_deleted=True,
+                                course__completed_at__gt=today)
+                        .values('course_id'))
         return (StudentAssignment.objects
                 .for_student(self.request.user)
                 .filter(assignment__course__completed_at__gt=today)
-                .exclude(assignment__course__pk__in=left_courses)
-                .order_by('assignment__deadline_at',
-                          'assignment__course__meta_course__name',
-                          'pk'))
+                .exclude(assignment__course__in=left_courses))
 
     def get_context_data(self, filter_form: StudentAssignmentListFilter,
                          enrolled_in_courses: List[int],
                          current_term: Semester, **kwargs):
         student = self.request.user
+        self.filter_form = filter_form
         filter_course = kwargs.get("course", None)
         filter_formats = kwargs.get("formats", [])
         filter_statuses = kwargs.get("statuses", [])
-        assignment_list = filter(
-            lambda sa:
-            (filter_course is None or sa.assignment.course_id == filter_course) and
-            (not filter_formats or sa.assignment.submission_type in filter_formats) and
-            (not filter_statuses or sa.status in filter_statuses),
-            self.get_queryset(current_term)
-        )
-        in_progress, archive = utils.split_on_condition(
-            assignment_list,
-            lambda sa: not sa.assignment.deadline_is_exceeded and
-                       sa.assignment.course_id in enrolled_in_courses)
-        archive.reverse()
+        filter_deadline = kwargs.get("deadline", "")
+        queryset = self.get_queryset(current_term)
+        if filter_course is not None:
+            queryset = queryset.filter(assignment__course_id=filter_course)
+        if filter_formats:
+            queryset = queryset.filter(assignment__submission_type__in=filter_formats)
+        if filter_statuses:
+            queryset = queryset.filter(status__in=filter_statuses)
+        if filter_deadline:
+            queryset = queryset.filter(self._get_deadline_filter(filter_deadline))
+        in_progress = Q(assignment__deadline_at__gte=get_now_utc(),
+                        assignment__course__in=enrolled_in_courses)
+        open_page = self._paginate(
+            queryset.filter(in_progress)
+            .order_by('assignment__deadline_at',
+                      'assignment__course__meta_course__name',
+                      'pk'),
+            self.open_page_kwarg)
+        archive_page = self._paginate(
+            queryset.exclude(in_progress)
+            .order_by('-assignment__deadline_at',
+                      '-assignment__course__meta_course__name',
+                      '-pk'),
+            self.archive_page_kwarg)
         context = {
             'filter_form': filter_form,
-            'assignment_list_open': in_progress,
-            'assignment_list_archive': archive,
+            'assignment_list_open': open_page.object_list,
+            'assignment_list_open_page': open_page,
+            'assignment_list_archive': archive_page.object_list,
+            'assignment_list_archive_page': archive_page,
+            'page_url': self._get_page_url,
             'tz_override': student.time_zone,
             'ViewOwnStudentAssignment': ViewOwnStudentAssignment,
         }
         return context
 
-    def _save_filters(self, request, *, course, formats, statuses):
-        filters_empty = course is None and not formats and not statuses
+    @staticmethod
+    def _get_deadline_filter(deadline: str) -> Q:
+        now = get_now_utc()
+        if deadline == DeadlineWindow.PAST:
+            return Q(assignment__deadline_at__lt=now)
+        window_end = now + timedelta(days=DEADLINE_WINDOW_DAYS[deadline])
+        return Q(assignment__deadline_at__gte=now,
+                 assignment__deadline_at__lt=window_end)
+
+    def _paginate(self, queryset, page_kwarg) -> Page:
+        paginator = Paginator(queryset, self.paginate_by)
+        page = paginator.get_page(self.request.GET.get(page_kwarg))
+        page.object_list = list(page.object_list)
+        return page
+
+    def _get_page_url(self, page_kwarg: str, page_number: int) -> str:
+        query = self.request.GET.copy()
+        # Filters could be restored from the session
+        if self.filter_form.is_bound:
+            for field_name in self.filter_form.fields:
+                query.setlist(field_name, self.filter_form.data.getlist(field_name))
+        query[page_kwarg] = page_number
+        return f"{reverse('study:assignment_list')}?{query.urlencode()}"
+
+    def _save_filters(self, request, *, course, formats, statuses, deadline):
+        filters_empty = course is None and not formats and not statuses and not deadline
         if filters_empty:
+            # Session is marked as modified only if the key exists
             request.session.pop(STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY, None)
             return
-        request.session[STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY] = {
+        saved_filters = {
             "course": None if course is None else str(course),
             "format": list(formats),
             "status": list(statuses),
+            "deadline": deadline,
         }
+        # Avoid session write on every visit of the page
+        if request.session.get(STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY) != saved_filters:
+            request.session[STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY] = saved_filters
 
     def _build_querydict_from_session(self, request):
         saved_filters = request.session.get(STUDENT_ASSIGNMENT_FILTERS_SESSION_KEY)
@@ -172,30 +222,36 @@ class StudentAssignmentListView(PermissionRequiredMixin, TemplateView):
             values = saved_filters.get(key) or []
             if values:
                 saved_query.setlist(key, values)
+        deadline = saved_filters.get("deadline")
+        if deadline:
+            saved_query.setlist("deadline", [deadline])
         return saved_query if saved_query else None
 
     def get(self, request, *args, **kwargs):
         current_term = Semester.get_current()
         enrolled_in = get_current_semester_active_courses(request.user, current_term)
         query_data = request.GET
-        if not request.GET:
+        if not any(f in request.GET for f in StudentAssignmentListFilter.base_fields):
             saved_query = self._build_querydict_from_session(request)
             if saved_query:
                 query_data = saved_query
         filter_form = StudentAssignmentListFilter(enrolled_in, data=query_data)
-        filter_formats, filter_statuses, filter_course = [], [], None
+        filter_formats, filter_statuses, filter_course, filter_deadline = [], [], None, ""
         if filter_form.is_valid():
             filter_formats = filter_form.cleaned_data["format"]
             filter_statuses = filter_form.cleaned_data["status"]
             filter_course = filter_form.cleaned_data["course"]
+            filter_deadline = filter_form.cleaned_data["deadline"]
             self._save_filters(request, course=filter_course,
-                               formats=filter_formats, statuses=filter_statuses)
+                               formats=filter_formats, statuses=filter_statuses,
+                               deadline=filter_deadline)
         context = self.get_context_data(filter_form=filter_form,
                                         enrolled_in_courses=enrolled_in,
                                         current_term=current_term,
                                         course=filter_course,
                                         formats=filter_formats,
                                         statuses=filter_statuses,
+                                        deadline=filter_deadline,
                                         **kwargs)
         return self.render_to_response(context)
 
@@ -209,13 +265,16 @@ class StudentAssignmentListView(PermissionRequiredMixin, TemplateView):
             filter_course = filter_form.cleaned_data["course"]
             filter_formats = filter_form.cleaned_data["format"]
             filter_statuses = filter_form.cleaned_data["status"]
+            filter_deadline = filter_form.cleaned_data["deadline"]
             self._save_filters(request, course=filter_course,
-                               formats=filter_formats, statuses=filter_statuses)
+                               formats=filter_formats, statuses=filter_statuses,
+                               deadline=filter_deadline)
             url = reverse('study:assignment_list')
             params = parse.urlencode({
                 'course': [] if filter_course is None else filter_course,
                 'format': filter_formats,
-                'status': filter_statuses
+                'status': filter_statuses,
+                'deadline': [filter_deadline] if filter_deadline else [],
             }, doseq=True)
             return redirect(f"{url}?{params}")
         context = self.get_context_data(filter_form=filter_form,
@@ -308,7 +367,7 @@ class StudentAssignmentSolutionCreateView(PermissionRequiredMixin,
                                                 personal_assignment=self.student_assignment,
                                                 created_by=request.user)
             if submission.text:
-                comment_persistence.add_to_gc(submission.text)
+                comment_persistence.add_to_gc(request.user.pk, submission.text)
             msg = _("Solution successfully saved")
             messages.success(self.request, msg)
             redirect_to = self.student_assignment.get_student_url()
@@ -5,7 +5,7 @@ from django.db.models import Prefetch
 from django.utils.translation import gettext_noop
 
 from courses.models import Assignment, AssignmentAttachment
-from courses.services import CourseService
+from courses.services import CourseService, get_cached_course_content
 from courses.tabs import CourseTab, CourseTabPanel
 from courses.tabs_registry import register
 from learning.permissions import ViewCourseNews, ViewCourseReviews
@@ -42,7 +42,9 @@ class CourseNewsTab(CourseTab):
         return user.has_perm(ViewCourseNews.name, course)
 
     def get_tab_panel(self, *, course, user) -> Optional[CourseTabPanel]:
-        return CourseTabPanel(context={"items": CourseService.get_news(course)})
+        news = get_cached_course_content(course, 'news',
+                                         lambda: list(CourseService.get_news(course)))
+        return CourseTabPanel(context={"items": news})
 
 
 @register
@@ -57,8 +59,10 @@ class CourseReviewsTab(CourseTab):
         return user.has_perm(ViewCourseReviews.name, course)
 
     def get_tab_panel(self, *, course, user) -> Optional[CourseTabPanel]:
+        reviews = get_cached_course_content(course, 'reviews',
+                                            lambda: CourseService.get_reviews(course))
         return CourseTabPanel(context={
-            "items": CourseService.get_reviews(course)
+            "items": reviews
         })
 
 
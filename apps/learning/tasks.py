@@ -1,10 +1,12 @@
 import logging
 from django_rq import job
 
+from core.locks import release_cache_lock
+from courses.models import Assignment
 from files.utils import convert_ipynb_to_html
 from learning.models import AssignmentComment, StudentAssignment, SubmissionAttachment, AssignmentNotification
 from learning.services.personal_assignment_service import (
-    update_personal_assignment_stats
+    PERSONAL_ASSIGNMENT_STATS_LOCK, update_personal_assignment_stats
 )
 
 logger = logging.getLogger(__file__)
@@ -34,9 +36,23 @@ def convert_assignment_submission_ipynb_file_to_html(*, assignment_submission_id
 
 @job('default')
 def update_student_assignment_stats(student_assignment_id: int) -> None:
+    # Changes made after this point must schedule a new job
+    release_cache_lock(PERSONAL_ASSIGNMENT_STATS_LOCK.format(student_assignment_id))
     student_assignment = (StudentAssignment.objects
                           .filter(pk=student_assignment_id)
                           .first())
     if not student_assignment:
         return
     update_personal_assignment_stats(personal_assignment=student_assignment)
+
+
+@job('default')
+def publish_assignment(*, assignment_id: int) -> None:
+    from learning.services import AssignmentService
+    assignment = (Assignment.objects
+                  .filter(pk=assignment_id)
+                  .first())
+    if not assignment:
+        logger.debug(f"Assignment with id={assignment_id} not found")
+        return
+    AssignmentService.publish_student_assignments(assignment)
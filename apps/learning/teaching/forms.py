@@ -56,3 +56,15 @@ class StudentGroupStudentsTransferForm(forms.Form):
         self.helper = FormHelper(self)
         self.helper.form_tag = False
 
+
+class AssignmentStatusLogFilterForm(forms.Form):
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get('date_from')
+        date_to = cleaned_data.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError("date_from must not be later than date_to")
+        return cleaned_data
@@ -16,7 +16,7 @@ from courses.permissions import ViewAssignment
 from courses.tests.factories import (
     AssignmentFactory, CourseFactory, CourseTeacherFactory, SemesterFactory
 )
-from learning.models import StudentAssignment, AssignmentSubmissionTypes
+from learning.models import AssignmentComment, StudentAssignment, AssignmentSubmissionTypes
 from learning.permissions import ViewStudentAssignment, ViewStudentAssignmentList
 from learning.services.personal_assignment_service import create_assignment_solution, create_personal_assignment_review
 from learning.settings import AssignmentScoreUpdateSource
@@ -364,7 +364,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
     response = client.get(csv_download_url)
     assert response.status_code == 200
     assert response['Content-Type'] == 'text/csv; charset=utf-8'
-    status_log_csv = response.content.decode('utf-8')
+    status_log_csv = b''.join(response.streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     assert data == [table_headers]
 
@@ -373,13 +373,13 @@ def test_view_assignment_status_log_csv_online_assignments(client):
 
     # just student comment
     AssignmentCommentFactory(student_assignment=sa_one, author=student_one)
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = b''.join(client.get(csv_download_url).streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     assert data == [table_headers]
 
     AssignmentCommentFactory(student_assignment=sa_one, author=student_one,
                              type=AssignmentSubmissionTypes.SOLUTION)
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = b''.join(client.get(csv_download_url).streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_created_student1_row = [
         student_one.get_short_name(),
@@ -395,7 +395,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
     # submission
     AssignmentCommentFactory(student_assignment=sa_two, author=student_two,
                              type=AssignmentSubmissionTypes.SOLUTION)
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = b''.join(client.get(csv_download_url).streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_created_student2_row = [
         student_two.get_short_name(),
@@ -420,7 +420,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
                                       status_new=sa_one.status,
                                       source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT
                                       )
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = b''.join(client.get(csv_download_url).streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     assert len(data) == 3
     assert data[1][:-1] == expected_created_student1_row
@@ -437,7 +437,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
                                       status_new=AssignmentStatus.NEED_FIXES,
                                       source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT
                                       )
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = b''.join(client.get(csv_download_url).streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_need_fixes_row = [
         student_one.get_short_name(),
@@ -464,7 +464,7 @@ def test_view_assignment_status_log_csv_online_assignments(client):
                                       status_new=AssignmentStatus.COMPLETED,
                                       source=AssignmentScoreUpdateSource.FORM_ASSIGNMENT
                                       )
-    status_log_csv = client.get(csv_download_url).content.decode('utf-8')
+    status_log_csv = b''.join(client.get(csv_download_url).streaming_content).decode('utf-8')
     data = [s for s in csv.reader(io.StringIO(status_log_csv)) if s]
     expected_completed_row = [
         student_two.get_short_name(),
@@ -479,3 +479,40 @@ def test_view_assignment_status_log_csv_online_assignments(client):
     assert data[2][:-1] == expected_need_fixes_row
     assert data[3][:-1] == expected_created_student2_row
     assert data[4][:-1] == expected_completed_row
+
+
+@pytest.mark.django_db
+def test_view_assignment_status_log_csv_date_range(client):
+    teacher = TeacherFactory()
+    student = StudentFactory()
+    course = CourseFactory(teachers=[teacher])
+    EnrollmentFactory(course=course, student=student)
+    assignment = AssignmentFactory(course=course, submission_type=AssignmentFormat.ONLINE)
+    student_assignment = StudentAssignment.objects.get(student=student)
+    old_solution, new_solution = AssignmentCommentFactory.create_batch(
+        2, student_assignment=student_assignment, author=student,
+        type=AssignmentSubmissionTypes.SOLUTION)
+    created = datetime.datetime(2021, 3, 10, 12, 0, tzinfo=pytz.UTC)
+    AssignmentComment.objects.filter(pk=old_solution.pk).update(created=created)
+    AssignmentComment.objects.filter(pk=new_solution.pk).update(
+        created=created + datetime.timedelta(days=10))
+    url = reverse('teaching:assignment_status_log_csv', args=[assignment.pk])
+    client.login(teacher)
+
+    def get_rows(**params):
+        response = client.get(url, params)
+        assert response.status_code == 200
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return [s for s in csv.reader(io.StringIO(content)) if s][1:]
+
+    assert len(get_rows()) == 2
+    rows = get_rows(date_from='2021-03-15')
+    assert len(rows) == 1
+    assert rows[0][-1].startswith('2021-03-20')
+    assert len(get_rows(date_to='2021-03-10')) == 1
+    assert len(get_rows(date_from='2021-03-10', date_to='2021-03-20')) == 2
+    assert get_rows(date_from='2021-03-11', date_to='2021-03-19') == []
+    response = client.get(url, {'date_from': '2021-03-20', 'date_to': '2021-03-10'})
+    assert response.status_code == 400
+    response = client.get(url, {'date_from': 'not a date'})
+    assert response.status_code == 400
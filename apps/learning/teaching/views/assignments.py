@@ -1,4 +1,3 @@
-import csv
 import datetime
 import os.path
 import tempfile
@@ -23,8 +22,10 @@ from core import comment_persistence
 from core.api.fields import CharSeparatedField
 from core.exceptions import Redirect
 from core.http import HttpRequest
+from core.markdown import render_markdown_cached
+from core.reports import csv_streaming_response
 from core.urls import reverse
-from core.utils import bucketize, render_markdown
+from core.utils import bucketize
 from courses.constants import AssignmentStatus, AssignmentFormat
 from courses.models import Assignment, Course, CourseTeacher
 from courses.permissions import DeleteAssignment, EditAssignment, ViewAssignment
@@ -34,19 +35,23 @@ from courses.selectors import (
 from courses.services import CourseService
 from learning.forms import AssignmentModalCommentForm, AssignmentReviewForm
 from learning.models import (
-    AssignmentComment, AssignmentSubmissionTypes, Enrollment, StudentAssignment
+    AssignmentComment, AssignmentPublication, AssignmentSubmissionTypes, Enrollment, StudentAssignment
 )
 from learning.permissions import (
     CreateAssignmentComment, DownloadAssignmentSolutions, EditStudentAssignment,
     ViewStudentAssignment, ViewStudentAssignmentList, ViewOwnStudentAssignment
 )
-from learning.selectors import get_enrollment, get_teacher_not_spectator_courses
-from learning.services import AssignmentService
+from learning.selectors import (
+    STATUS_LOG_ACTIONS, get_assignment_status_log, get_enrollment,
+    get_teacher_not_spectator_courses
+)
+from learning.services.execution_time_stats import get_execution_time_stats
 from learning.services.personal_assignment_service import (
     create_personal_assignment_review, get_assignment_update_history_message,
     get_draft_comment
 )
 from learning.settings import AssignmentScoreUpdateSource
+from learning.teaching.forms import AssignmentStatusLogFilterForm
 from learning.utils import humanize_duration
 from learning.views import AssignmentCommentUpsertView, AssignmentSubmissionBaseView
 
@@ -159,7 +164,7 @@ class AssignmentCommentUpdateView(generic.UpdateView):
 
     def form_valid(self, form):
         self.object = form.save()
-        html = render_markdown(self.object.text)
+        html = render_markdown_cached(self.object.text)
         return JsonResponse({"success": 1,
                              "id": self.object.pk,
                              "html": html})
@@ -220,12 +225,13 @@ class AssignmentDetailView(PermissionRequiredMixin, generic.DetailView):
                             'student')
             .prefetch_related('student__groups')
             .order_by('student__last_name', 'student__first_name'))
-        # Note: it's possible to return values instead and
-        # making 1 db hit instead of 3
-        exec_mean = AssignmentService.get_mean_execution_time(self.object)
-        exec_median = AssignmentService.get_median_execution_time(self.object)
-        context["execution_time_mean"] = humanize_duration(exec_mean)
-        context["execution_time_median"] = humanize_duration(exec_median)
+        execution_time_stats = get_execution_time_stats(self.object)
+        context["execution_time_mean"] = humanize_duration(execution_time_stats.mean)
+        context["execution_time_median"] = humanize_duration(execution_time_stats.median)
+        context["execution_time_p90"] = humanize_duration(execution_time_stats.p90)
+        context["publication"] = (AssignmentPublication.objects
+                                  .filter(assignment=self.object)
+                                  .first())
         context["can_edit_assignment"] = self.request.user.has_perm(EditAssignment.name, self.object)
         context["can_delete_assignment"] = self.request.user.has_perm(DeleteAssignment.name, self.object)
         context["can_download_status_report"] = self.object.submission_type == AssignmentFormat.ONLINE
@@ -244,11 +250,18 @@ class AssignmentStatusLogCSVView(PermissionRequiredMixin, generic.DetailView):
         assignment = self.get_object()
         if assignment.submission_type != AssignmentFormat.ONLINE:
             return HttpResponseBadRequest()
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        filter_form = AssignmentStatusLogFilterForm(data=request.GET)
+        if not filter_form.is_valid():
+            return HttpResponseBadRequest(filter_form.errors.as_text())
+        comments = get_assignment_status_log(assignment,
+                                             date_from=filter_form.cleaned_data['date_from'],
+                                             date_to=filter_form.cleaned_data['date_to'])
         filename = f"{datetime.date.today()}-status-changes_pk-{assignment.pk}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        writer = csv.writer(response)
-        headers = [
+        return csv_streaming_response(self._get_rows(assignment, comments), filename)
+
+    @staticmethod
+    def _get_rows(assignment: Assignment, comments):
+        yield [
             "student",
             "student_id",
             "task",
@@ -257,41 +270,13 @@ class AssignmentStatusLogCSVView(PermissionRequiredMixin, generic.DetailView):
             "action",
             "comment_posted_ISO"
         ]
-        writer.writerow(headers)
-        comments = (AssignmentComment.objects
-                    .filter(is_published=True,
-                            student_assignment__assignment=assignment)
-                    .select_related('author',
-                                    'student_assignment__student')
-                    .order_by('student_assignment__student', 'created'))
-        for comment in comments:
-            title = assignment.title
+        for comment in comments.iterator(chunk_size=2000):
             student = comment.student_assignment.student
             comment_author = comment.author
-            created = comment.created.isoformat()
-            action_text = None
-            if not isinstance(comment.meta, dict) or \
-                'status' not in comment.meta or 'status_old' not in comment.meta:
-                continue
-            is_comment_from_student = comment_author == student
-            is_publish_online_solution = is_comment_from_student and \
-                                         assignment.submission_type == AssignmentFormat.ONLINE and \
-                                         comment.meta['status'] == AssignmentStatus.ON_CHECKING
-            is_status_changed_on_needfixes = comment.meta['status'] != comment.meta['status_old'] and \
-                                             comment.meta['status'] == AssignmentStatus.NEED_FIXES
-            is_status_changed_on_completed = comment.meta['status'] != comment.meta['status_old'] and \
-                                             comment.meta['status'] == AssignmentStatus.COMPLETED
-            if is_status_changed_on_completed:
-                action_text = 'Grade updated'
-            elif is_publish_online_solution:
-                action_text = 'Solution submitted for review'
-            elif is_status_changed_on_needfixes:
-                action_text = 'New comment received from reviewer'
-            if action_text is not None:
-                writer.writerow([student.get_short_name(), student.pk, title,
-                                 comment_author.get_short_name(), comment_author.pk,
-                                 action_text, created])
-        return response
+            yield [student.get_short_name(), student.pk, assignment.title,
+                   comment_author.get_short_name(), comment_author.pk,
+                   STATUS_LOG_ACTIONS[comment.status_log_action],
+                   comment.created.isoformat()]
 
 
 class StudentAssignmentDetailView(PermissionRequiredMixin,
@@ -368,7 +353,8 @@ class StudentAssignmentDetailView(PermissionRequiredMixin,
                         message=form.cleaned_data['text'],
                         attachment=form.cleaned_data['attached_file'])
                 if form.cleaned_data['text']:
-                    comment_persistence.add_to_gc(form.cleaned_data['text'])
+                    comment_persistence.add_to_gc(self.request.user.pk,
+                                                  form.cleaned_data['text'])
                 message = "Data saved successfully"
                 messages.success(self.request, message=message, extra_tags='timeout')
                 return redirect(sa.get_teacher_url())
@@ -230,7 +230,7 @@ def test_assignment_attachment_inactive_student(inactive_status, client,
 
 
 @pytest.mark.django_db
-def test_create_assignment_admin_form(client):
+def test_create_assignment_admin_form(client, django_capture_on_commit_callbacks):
     """
     Student assignments should be generated after creating assignment.
     """
@@ -254,7 +254,8 @@ def test_create_assignment_admin_form(client):
     }
     assert StudentAssignment.objects.count() == 0
     url = course.get_create_assignment_url()
-    response = client.post(url, post_data)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(url, post_data)
     assert response.status_code == 302
     assert Assignment.objects.count() == 1
     assert StudentAssignment.objects.count() == 1
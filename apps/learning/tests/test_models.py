@@ -3,6 +3,7 @@ from datetime import timedelta
 from decimal import Decimal
 
 import pytest
+from django.core import management
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
 from django.db.models import ProtectedError
@@ -10,7 +11,7 @@ from django.utils.encoding import smart_str
 
 from core.tests.factories import LocationFactory
 from courses.constants import AssignmentFormat, AssignmentStatus
-from courses.models import CourseGroupModes, CourseNews, Semester, StudentGroupTypes, CourseProgramBinding
+from courses.models import Course, CourseGroupModes, CourseNews, Semester, StudentGroupTypes, CourseProgramBinding
 from courses.tests.factories import (
     AssignmentFactory, CourseClassAttachmentFactory, CourseClassFactory, CourseFactory,
     CourseNewsFactory, CourseTeacherFactory, LearningSpaceFactory, MetaCourseFactory,
@@ -241,6 +242,55 @@ def test_student_assignment_execution_time():
     assert student_assignment.execution_time == timedelta(hours=2)
 
 
+@pytest.mark.django_db
+def test_student_assignment_bulk_compute_execution_time(django_assert_num_queries):
+    student_assignment1, student_assignment2, student_assignment3 = StudentAssignmentFactory.create_batch(3)
+    AssignmentCommentFactory(student_assignment=student_assignment1,
+                             type=AssignmentSubmissionTypes.SOLUTION,
+                             execution_time=timedelta(hours=2))
+    AssignmentCommentFactory(student_assignment=student_assignment1,
+                             type=AssignmentSubmissionTypes.SOLUTION,
+                             execution_time=timedelta(minutes=3))
+    AssignmentCommentFactory(student_assignment=student_assignment2,
+                             type=AssignmentSubmissionTypes.SOLUTION,
+                             execution_time=timedelta(minutes=5))
+    StudentAssignment.objects.update(execution_time=timedelta(minutes=1))
+    queryset = StudentAssignment.objects.all()
+    with django_assert_num_queries(1):
+        updated = StudentAssignment.bulk_compute_fields(queryset, 'execution_time')
+    assert updated == {'execution_time': {
+        student_assignment1.pk: timedelta(hours=2, minutes=3),
+        student_assignment2.pk: timedelta(minutes=5),
+        student_assignment3.pk: None,
+    }}
+    for student_assignment in (student_assignment1, student_assignment2, student_assignment3):
+        execution_time = student_assignment.execution_time
+        student_assignment.refresh_from_db()
+        assert student_assignment.execution_time == execution_time
+    # Unchanged values are not updated
+    updated = StudentAssignment.bulk_compute_fields(queryset, 'execution_time')
+    assert updated == {'execution_time': {}}
+
+
+@pytest.mark.django_db
+def test_command_update_derivable_fields_bulk():
+    course1, course2 = CourseFactory.create_batch(2)
+    EnrollmentFactory.create_batch(2, course=course1)
+    EnrollmentFactory(course=course2)
+    EnrollmentFactory(course=course2, is_deleted=True)
+    Course.objects.update(learners_count=42)
+    management.call_command("update_derivable_fields", "courses", "Course",
+                            "-n", "learners_count", "-f", f"id__in=[{course1.pk}]")
+    course1.refresh_from_db()
+    course2.refresh_from_db()
+    assert course1.learners_count == 2
+    assert course2.learners_count == 42
+    management.call_command("update_derivable_fields", "courses", "Course",
+                            "-n", "learners_count")
+    course2.refresh_from_db()
+    assert course2.learners_count == 1
+
+
 @pytest.mark.django_db
 def test_student_group_assignee_model_constraint_unique_teacher_per_student_group():
     course = CourseFactory(group_mode=CourseGroupModes.MANUAL)
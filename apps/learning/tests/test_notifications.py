@@ -34,7 +34,7 @@ def _get_unread(client, url):
 
 
 @pytest.mark.django_db
-def test_view_new_assignment(client):
+def test_view_new_assignment(client, django_capture_on_commit_callbacks):
     teacher1 = TeacherFactory()
     teacher2 = TeacherFactory()
     course = CourseFactory(teachers=[teacher1, teacher2])
@@ -61,7 +61,8 @@ def test_view_new_assignment(client):
         f'responsible-teacher-{course_teacher2.pk}-active': True
     })
     client.login(teacher1)
-    response = client.post(course.get_create_assignment_url(), form_prefixed)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(course.get_create_assignment_url(), form_prefixed)
     assert response.status_code == 302
     assignments = course.assignment_set.all()
     assert len(assignments) == 1
@@ -23,6 +23,8 @@ from learning.permissions import (
     ViewStudentAssignment, ViewStudentGroup, ViewStudentGroupAsTeacher
 )
 from learning.services import CourseRole, EnrollmentService, course_access_role
+from learning.services import membership_service
+from learning.services.membership_service import get_cached_course_access_role
 from learning.settings import GradeTypes, StudentStatuses
 from learning.tests.factories import (
     AssignmentCommentFactory, EnrollmentFactory,
@@ -218,6 +220,30 @@ def test_course_access_role_student(inactive_status, settings):
     assert role == CourseRole.STUDENT_RESTRICT
 
 
+@pytest.mark.django_db
+def test_cached_course_access_role(mocker, django_capture_on_commit_callbacks):
+    course, other_course = CourseFactory.create_batch(2)
+    student = StudentFactory()
+    spy = mocker.spy(membership_service, 'course_access_role')
+    assert get_cached_course_access_role(course=course, user=student) == CourseRole.NO_ROLE
+    assert get_cached_course_access_role(course=course, user=student) == CourseRole.NO_ROLE
+    assert spy.call_count == 1
+    assert get_cached_course_access_role(course=other_course, user=student) == CourseRole.NO_ROLE
+    assert spy.call_count == 2
+    # Course bindings affect roles of all users
+    program = student.get_student_profile().academic_program_enrollment.program
+    with django_capture_on_commit_callbacks(execute=True):
+        CourseProgramBindingFactory(course=course, program=program)
+    get_cached_course_access_role(course=course, user=student)
+    get_cached_course_access_role(course=other_course, user=student)
+    assert spy.call_count == 4
+    with django_capture_on_commit_callbacks(execute=True):
+        EnrollmentFactory(student=student, course=course)
+    delete_enrollment_cache(student, course)
+    assert get_cached_course_access_role(course=course, user=student) == CourseRole.STUDENT_REGULAR
+    assert spy.call_count == 5
+
+
 @pytest.mark.django_db
 def test_enroll_in_course(program_cub001, program_run_cub, program_nup001, program_run_nup):
     today = datetime.date.today()
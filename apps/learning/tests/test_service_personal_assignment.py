@@ -4,10 +4,13 @@ from typing import List, Dict, Tuple, Set
 
 import pytest
 
+from django.core import management
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
+from django.utils import timezone
 
+from core.locks import release_cache_lock
 from courses.constants import AssigneeMode, AssignmentFormat, AssignmentStatus
 from courses.models import CourseGroupModes, CourseTeacher
 from courses.tests.factories import AssignmentFactory, CourseFactory, CourseTeacherFactory, CourseProgramBindingFactory
@@ -21,7 +24,8 @@ from learning.services.personal_assignment_service import (
     create_personal_assignment_review, resolve_assignees_for_personal_assignment,
     update_personal_assignment_score, update_personal_assignment_stats,
     update_personal_assignment_status, get_assignee_with_minimal_load,
-    calculate_teachers_overall_expected_load_in_bucket
+    calculate_teachers_overall_expected_load_in_bucket,
+    schedule_personal_assignment_stats_update, PERSONAL_ASSIGNMENT_STATS_LOCK
 )
 from learning.settings import AssignmentScoreUpdateSource
 from learning.tests.factories import (
@@ -104,10 +108,10 @@ def test_service_update_personal_assignment_stats_published(django_capture_on_co
     curator = CuratorFactory()
     student_assignment = StudentAssignmentFactory()
     with django_capture_on_commit_callbacks(execute=True):
-        comment1 = create_assignment_comment(personal_assignment=student_assignment,
-                                             is_draft=False,
-                                             created_by=curator,
-                                             message='Comment1 message')
+        create_assignment_comment(personal_assignment=student_assignment,
+                                  is_draft=False,
+                                  created_by=curator,
+                                  message='Comment1 message')
     student_assignment.refresh_from_db()
     assert isinstance(student_assignment.meta, dict)
     assert student_assignment.meta['stats']['comments'] == 1
@@ -149,11 +153,124 @@ def test_service_update_personal_assignment_stats_published(django_capture_on_co
     assert 'count' in solutions_stats
     assert solutions_stats['count'] == 2
     assert 'first' in solutions_stats
-    assert solutions_stats['first'] == comment1.created.replace(microsecond=0)
+    assert solutions_stats['first'] == solution1.created.replace(microsecond=0)
     assert 'last' in solutions_stats
     assert solutions_stats['last'] == fixed_dt.replace(microsecond=0)
 
 
+@pytest.mark.django_db
+def test_service_personal_assignment_stats_delta():
+    """Incremental stats update gives the same result as full recalculation."""
+    curator = CuratorFactory()
+    student_assignment = StudentAssignmentFactory()
+    student = student_assignment.student
+    with transaction.atomic():
+        create_assignment_comment(personal_assignment=student_assignment,
+                                  is_draft=False, created_by=curator,
+                                  message='Comment1 message')
+    student_assignment.refresh_from_db()
+    assert student_assignment.stats == {
+        'activity': PersonalAssignmentActivity.TEACHER_COMMENT,
+        'comments': 1
+    }
+    with transaction.atomic():
+        create_assignment_solution(personal_assignment=student_assignment,
+                                   created_by=student, message="solution1")
+        create_assignment_comment(personal_assignment=student_assignment,
+                                  is_draft=False, created_by=student,
+                                  message='Comment2 message')
+        create_assignment_solution(personal_assignment=student_assignment,
+                                   created_by=student, message="solution2")
+    student_assignment.refresh_from_db()
+    stats = student_assignment.stats
+    assert stats['activity'] == PersonalAssignmentActivity.SOLUTION
+    assert stats['comments'] == 2
+    assert stats['solutions']['count'] == 2
+    solution_at = student_assignment.solution_at
+    assert solution_at == stats['solutions']['last']
+    update_personal_assignment_stats(personal_assignment=student_assignment)
+    student_assignment.refresh_from_db()
+    assert student_assignment.stats == stats
+    assert student_assignment.solution_at == solution_at
+
+
+@pytest.mark.django_db
+def test_service_update_personal_assignment_stats_no_submissions():
+    student_assignment = StudentAssignmentFactory()
+    with transaction.atomic():
+        solution = create_assignment_solution(personal_assignment=student_assignment,
+                                              created_by=student_assignment.student,
+                                              message="solution")
+    student_assignment.refresh_from_db()
+    assert student_assignment.solution_at is not None
+    solution.delete()
+    update_personal_assignment_stats(personal_assignment=student_assignment)
+    assert student_assignment.solution_at is None
+    student_assignment.refresh_from_db()
+    assert student_assignment.solution_at is None
+    assert 'stats' not in student_assignment.meta
+
+
+@pytest.mark.django_db
+def test_schedule_personal_assignment_stats_update(mocker, django_capture_on_commit_callbacks):
+    mocked = mocker.patch('learning.tasks.update_student_assignment_stats.delay')
+    student_assignment = StudentAssignmentFactory()
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(3):
+                schedule_personal_assignment_stats_update(student_assignment.pk)
+        mocked.assert_called_once_with(student_assignment.pk)
+    finally:
+        release_cache_lock(PERSONAL_ASSIGNMENT_STATS_LOCK.format(student_assignment.pk))
+
+
+@pytest.mark.django_db
+def test_command_recalculate_personal_assignment_stats():
+    curator = CuratorFactory()
+    student_assignment1, student_assignment2 = StudentAssignmentFactory.create_batch(2)
+    AssignmentFactory(course=student_assignment1.assignment.course)
+    student_assignment2.assignment = AssignmentFactory(course=student_assignment1.assignment.course)
+    student_assignment2.save()
+    for student_assignment in (student_assignment1, student_assignment2):
+        create_assignment_comment(personal_assignment=student_assignment,
+                                  is_draft=False, created_by=curator,
+                                  message='Comment message')
+        create_assignment_solution(personal_assignment=student_assignment,
+                                   created_by=student_assignment.student,
+                                   message="solution")
+    create_assignment_comment(personal_assignment=student_assignment1,
+                              is_draft=False, created_by=student_assignment1.student,
+                              message='Comment message')
+    expected = {}
+    for student_assignment in (student_assignment1, student_assignment2):
+        update_personal_assignment_stats(personal_assignment=student_assignment)
+        student_assignment.refresh_from_db()
+        expected[student_assignment.pk] = student_assignment.stats
+    StudentAssignment.objects.update(meta=None, solution_at=None)
+    # Submissions of the personal assignments have been deleted
+    student_assignment3, student_assignment4 = StudentAssignmentFactory.create_batch(
+        2, assignment=student_assignment2.assignment)
+    (StudentAssignment.objects
+     .filter(pk=student_assignment3.pk)
+     .update(meta={'stats': expected[student_assignment2.pk], 'other': 1},
+             solution_at=timezone.now()))
+    (StudentAssignment.objects
+     .filter(pk=student_assignment4.pk)
+     .update(meta={'stats': {'activity': 'sc', 'comments': 1}}))
+    management.call_command("recalculate_personal_assignment_stats",
+                            student_assignment1.assignment.course_id)
+    for student_assignment in (student_assignment1, student_assignment2):
+        student_assignment.refresh_from_db()
+        assert student_assignment.stats == expected[student_assignment.pk]
+        assert student_assignment.solution_at == student_assignment.stats['solutions']['last']
+    assert student_assignment1.stats['activity'] == PersonalAssignmentActivity.STUDENT_COMMENT
+    student_assignment3.refresh_from_db()
+    assert student_assignment3.solution_at is None
+    assert student_assignment3.meta == {'other': 1}
+    student_assignment4.refresh_from_db()
+    assert student_assignment4.meta == {}
+
+
 @pytest.mark.django_db
 def test_maybe_set_assignee_for_personal_assignment_already_assigned():
     """Don't overwrite assignee if someone was set before student activity."""
@@ -291,6 +408,9 @@ def test_update_personal_assignment_status(django_capture_on_commit_callbacks):
         AssignmentCommentFactory(student_assignment=sa,
                                  type=AssignmentSubmissionTypes.SOLUTION)
     assert len(callbacks) == 1
+    # Stats are calculated in place, the only callback invalidates cached
+    # identity of the new comment author
+    assert callbacks[0].key.startswith('identity:')
     sa.refresh_from_db()
     # it changes status automatically
     assert sa.status == AssignmentStatus.ON_CHECKING
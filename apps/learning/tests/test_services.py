@@ -12,12 +12,18 @@ from courses.tests.factories import (
     AssignmentFactory, CourseFactory, CourseTeacherFactory
 )
 from learning.models import (
-    AssignmentNotification, Enrollment, StudentAssignment, StudentGroup, EnrollmentGradeLog
+    AssignmentNotification, AssignmentSubmissionTypes, Enrollment, StudentAssignment, StudentGroup, EnrollmentGradeLog
 )
 from learning.services import AssignmentService
 from learning.services.enrollment_service import update_enrollment_grade
+from learning.services.execution_time_stats import (
+    EMPTY_EXECUTION_TIME_STATS, ExecutionTimeStats, get_course_execution_time_stats,
+    get_execution_time_stats
+)
 from learning.services.notification_service import generate_notifications_about_new_submission
-from learning.settings import StudentStatuses, GradeTypes, EnrollmentGradeUpdateSource
+from learning.settings import (
+    AssignmentPublicationStatuses, StudentStatuses, GradeTypes, EnrollmentGradeUpdateSource
+)
 from learning.tests.factories import (
     AssignmentCommentFactory, AssignmentNotificationFactory, EnrollmentFactory,
     StudentAssignmentFactory, StudentGroupAssigneeFactory
@@ -161,6 +167,50 @@ def test_assignment_service_bulk_create_personal_assignments_notifications(setti
     assert AssignmentNotification.objects.count() == 2
 
 
+@pytest.mark.django_db
+def test_assignment_service_publish_student_assignments(mocker):
+    course = CourseFactory(group_mode=CourseGroupModes.MANUAL)
+    EnrollmentFactory.create_batch(5, course=course)
+    assignment = AssignmentFactory(course=course)
+    StudentAssignment.objects.all().delete()
+    AssignmentNotification.objects.all().delete()
+    publication = AssignmentService.publish_student_assignments(assignment, batch_size=2)
+    assert publication.status == AssignmentPublicationStatuses.COMPLETED
+    assert publication.total == 5
+    assert publication.processed == 5
+    assert publication.progress == 100
+    assert StudentAssignment.objects.filter(assignment=assignment).count() == 5
+    assert AssignmentNotification.objects.count() == 5
+    # Retry doesn't produce duplicates
+    publication = AssignmentService.publish_student_assignments(assignment, batch_size=2)
+    assert publication.status == AssignmentPublicationStatuses.COMPLETED
+    assert StudentAssignment.objects.filter(assignment=assignment).count() == 5
+    assert AssignmentNotification.objects.count() == 5
+    # Failed batch keeps progress of the committed batches
+    StudentAssignment.objects.filter(assignment=assignment).delete()
+    create = AssignmentService._create_student_assignments
+    batches = []
+
+    def create_or_fail(assignment, students):
+        batches.append(students)
+        if len(batches) > 1:
+            raise ValueError("boom")
+        create(assignment, students)
+    mocker.patch.object(AssignmentService, '_create_student_assignments',
+                        side_effect=create_or_fail)
+    with pytest.raises(ValueError):
+        AssignmentService.publish_student_assignments(assignment, batch_size=2)
+    publication.refresh_from_db()
+    assert publication.status == AssignmentPublicationStatuses.FAILED
+    assert publication.processed == 2
+    assert publication.error == "boom"
+    assert StudentAssignment.objects.filter(assignment=assignment).count() == 2
+    mocker.stopall()
+    publication = AssignmentService.publish_student_assignments(assignment, batch_size=2)
+    assert publication.status == AssignmentPublicationStatuses.COMPLETED
+    assert StudentAssignment.objects.filter(assignment=assignment).count() == 5
+
+
 @pytest.mark.django_db
 def test_assignment_service_remove_personal_assignments():
     course = CourseFactory(group_mode=CourseGroupModes.PROGRAM)
@@ -258,6 +308,61 @@ def test_median_execution_time():
     assert AssignmentService.get_median_execution_time(assignment) == timedelta(hours=1, minutes=30)
 
 
+@pytest.mark.django_db
+def test_course_execution_time_stats(django_assert_num_queries):
+    course = CourseFactory()
+    assignment1, assignment2, assignment3 = AssignmentFactory.create_batch(3, course=course)
+    for minutes in (30, 90, 150, 600, 1200):
+        StudentAssignmentFactory(assignment=assignment1,
+                                 execution_time=timedelta(minutes=minutes))
+    StudentAssignmentFactory(assignment=assignment2,
+                             execution_time=timedelta(hours=3))
+    StudentAssignmentFactory(assignment=assignment2, execution_time=None)
+    with django_assert_num_queries(1):
+        stats = get_course_execution_time_stats(course.pk)
+    assert set(stats) == {assignment1.pk, assignment2.pk}
+    assert stats[assignment1.pk] == ExecutionTimeStats(
+        count=5,
+        mean=timedelta(minutes=414),
+        median=timedelta(minutes=150),
+        p90=timedelta(minutes=960))
+    assert stats[assignment2.pk].count == 1
+    assert stats[assignment2.pk].median == timedelta(hours=3)
+    with django_assert_num_queries(0):
+        assert get_execution_time_stats(assignment3) == EMPTY_EXECUTION_TIME_STATS
+    # New solution invalidates cached stats
+    student_assignment = StudentAssignmentFactory(assignment=assignment3)
+    AssignmentCommentFactory(student_assignment=student_assignment,
+                             type=AssignmentSubmissionTypes.SOLUTION,
+                             execution_time=timedelta(minutes=40))
+    stats = get_execution_time_stats(assignment3)
+    assert stats.count == 1
+    assert stats.mean == timedelta(minutes=40)
+
+
+@pytest.mark.django_db
+def test_course_execution_time_stats_invalidation(django_capture_on_commit_callbacks):
+    course = CourseFactory()
+    assignment = AssignmentFactory(course=course)
+    student_assignment1, student_assignment2 = StudentAssignmentFactory.create_batch(
+        2, assignment=assignment, execution_time=timedelta(hours=1))
+    assert get_execution_time_stats(assignment).count == 2
+    # Edited with the admin
+    student_assignment1.execution_time = timedelta(hours=3)
+    student_assignment1.save()
+    assert get_execution_time_stats(assignment).mean == timedelta(hours=2)
+    # Execution time is not changed
+    with django_capture_on_commit_callbacks() as callbacks:
+        student_assignment2.score = 3
+        student_assignment2.save()
+    assert not callbacks
+    # New solution
+    AssignmentCommentFactory(student_assignment=student_assignment2,
+                             type=AssignmentSubmissionTypes.SOLUTION,
+                             execution_time=timedelta(minutes=30))
+    assert get_execution_time_stats(assignment).mean == timedelta(hours=1, minutes=45)
+
+
 @pytest.mark.django_db
 def test_create_notifications_about_new_submission():
     course = CourseFactory()
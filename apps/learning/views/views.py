@@ -13,6 +13,7 @@ from django.views import generic
 
 from core import comment_persistence
 from core.http import AuthenticatedHttpRequest
+from core.markdown import render_markdown_many
 from core.utils import sqids
 from core.views import LoginRequiredMixin
 from courses.models import AssignmentAttachment
@@ -75,7 +76,7 @@ class AssignmentCommentUpsertView(StudentAssignmentURLParamsMixin, GenericModelV
                                                     message=form.cleaned_data['text'],
                                                     attachment=form.cleaned_data['attached_file'])
         if new_comment.text:
-            comment_persistence.add_to_gc(new_comment.text)
+            comment_persistence.add_to_gc(self.request.user.pk, new_comment.text)
         return HttpResponseRedirect(self.get_success_url())
 
     def form_invalid(self, form):
@@ -127,12 +128,16 @@ class AssignmentSubmissionBaseView(StudentAssignmentURLParamsMixin,
         cs_after_deadline = (c for c in sa.assignmentcomment_set.all() if
                              c.created >= deadline_at)
         first_comment_after_deadline = next(cs_after_deadline, None)
+        comments = sa.assignmentcomment_set.all()
+        comments_html = dict(zip((c.pk for c in comments),
+                                 render_markdown_many(c.text for c in comments)))
         context = {
             'a_s': sa,
             'time_zone': user.time_zone,
             'first_comment_after_deadline': first_comment_after_deadline,
+            'comments_html': comments_html,
             'one_teacher': len(sa.assignment.course.course_teachers.all()) == 1,
-            'hashes_json': comment_persistence.get_garbage_collection(),
+            'hashes_json': comment_persistence.get_garbage_collection(user.pk),
             'get_comment_element_class': self.get_comment_element_class,
         }
         return context
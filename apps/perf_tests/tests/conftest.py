@@ -0,0 +1,155 @@
+"""
+Performance budget tests are run on a large dataset, so they're disabled
+by default. Run them separately (without xdist):
+
+    PERF_TESTS=1 pytest apps/perf_tests
+
+Dataset size could be adjusted with PERF_STUDENTS, PERF_ASSIGNMENTS and
+PERF_COMMENTS environment variables. Timings are saved as JSON to the
+file set by PERF_REPORT (`perf-report.json` by default).
+
+`test_connections` compares request latency with and without persistent
+database connections, the number of requests is set by PERF_REQUESTS.
+"""
+import datetime
+import json
+import os
+import random
+import statistics
+from typing import Any, Dict, List, NamedTuple
+
+import pytest
+
+from django.db import connection, transaction
+
+from courses.constants import AssignmentFormat, AssignmentStatus
+from courses.models import Assignment, Course
+from courses.tests.factories import (
+    AssignmentFactory, CourseClassFactory, CourseFactory, CourseNewsFactory,
+    CourseProgramBindingFactory, SemesterFactory
+)
+from learning.models import AssignmentComment, StudentAssignment
+from learning.tests.factories import EnrollmentFactory
+from users.models import User
+from users.tests.factories import CuratorFactory, StudentFactory, TeacherFactory
+
+
+def _get_size(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+class PerfDataset(NamedTuple):
+    course: Course
+    teacher: User
+    curator: User
+    students: List[User]
+    assignments: List[Assignment]
+    # Personal assignment of the first student with the largest number
+    # of comments
+    student_assignment: StudentAssignment
+
+
+def seed_perf_dataset(program_run, *, students_total: int,
+                      assignments_total: int,
+                      comments_total: int) -> PerfDataset:
+    term = SemesterFactory.create_current()
+    teacher = TeacherFactory()
+    curator = CuratorFactory()
+    course = CourseFactory(semester=term, teachers=[teacher])
+    course_program_binding = CourseProgramBindingFactory(course=course,
+                                                         program=program_run.program)
+    CourseClassFactory.create_batch(10, course=course)
+    CourseNewsFactory.create_batch(5, course=course)
+    students = []
+    for _ in range(students_total):
+        student = StudentFactory(student_profile__academic_program_enrollment=program_run)
+        EnrollmentFactory(student=student, student_profile=student.get_student_profile(),
+                          course=course, course_program_binding=course_program_binding)
+        students.append(student)
+    formats = [AssignmentFormat.ONLINE, AssignmentFormat.EXTERNAL,
+               AssignmentFormat.NO_SUBMIT]
+    assignments = [AssignmentFactory(course=course, submission_type=formats[i % len(formats)])
+                   for i in range(assignments_total)]
+    student_assignments = list(StudentAssignment.objects
+                               .filter(assignment__course=course)
+                               .order_by('pk'))
+    main_student_assignment = next(sa for sa in student_assignments
+                                   if sa.student_id == students[0].pk)
+    rnd = random.Random(42)
+    comments = []
+    for i in range(comments_total):
+        # Half of the comments go to a single personal assignment
+        if i % 2 == 0:
+            student_assignment = main_student_assignment
+        else:
+            student_assignment = rnd.choice(student_assignments)
+        author = teacher if i % 3 == 0 else student_assignment.student
+        comments.append(AssignmentComment(student_assignment=student_assignment,
+                                          author=author,
+                                          text=f"Perf comment {i}",
+                                          is_published=True))
+    AssignmentComment.objects.bulk_create(comments, batch_size=1000)
+    (StudentAssignment.objects
+     .filter(pk__in=[sa.pk for sa in student_assignments[::3]])
+     .update(status=AssignmentStatus.ON_CHECKING))
+    # Planner statistics are stale for the freshly inserted rows
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return PerfDataset(course=course, teacher=teacher, curator=curator,
+                       students=students, assignments=assignments,
+                       student_assignment=main_student_assignment)
+
+
+@pytest.fixture(scope="module")
+def perf_dataset(django_db_setup, django_db_blocker):
+    """
+    Dataset is created once per module inside the transaction that
+    is rolled back at the end, so it doesn't leak into the reused test
+    database.
+    """
+    from core.tests.factories import AcademicProgramRunFactory
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            program_run = AcademicProgramRunFactory()
+            yield seed_perf_dataset(
+                program_run,
+                students_total=_get_size("PERF_STUDENTS", 500),
+                assignments_total=_get_size("PERF_ASSIGNMENTS", 30),
+                comments_total=_get_size("PERF_COMMENTS", 10_000))
+            transaction.set_rollback(True)
+
+
+class PerfReport:
+    def __init__(self):
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, *, timings: List[float], **metrics: Any):
+        self.results[name] = {
+            **metrics,
+            "rounds": len(timings),
+            "min": min(timings),
+            "max": max(timings),
+            "mean": statistics.mean(timings),
+            "median": statistics.median(timings),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "started_at": self.started_at.isoformat(),
+            "dataset": {
+                "students": _get_size("PERF_STUDENTS", 500),
+                "assignments": _get_size("PERF_ASSIGNMENTS", 30),
+                "comments": _get_size("PERF_COMMENTS", 10_000),
+            },
+            "results": self.results,
+        }, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope="session")
+def perf_report():
+    report = PerfReport()
+    yield report
+    if report.results:
+        with open(os.environ.get("PERF_REPORT", "perf-report.json"), "w") as f:
+            f.write(report.to_json())
@@ -0,0 +1,97 @@
+import os
+import time
+from typing import Callable, NamedTuple
+
+import pytest
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.urls import reverse
+
+from .conftest import PerfDataset
+
+pytestmark = [
+    pytest.mark.perf,
+    pytest.mark.skipif(not os.environ.get("PERF_TESTS"),
+                       reason="Set PERF_TESTS=1 to run performance tests"),
+]
+
+TIMING_ROUNDS = 5
+
+
+class Endpoint(NamedTuple):
+    name: str
+    # Who makes the request: "teacher", "curator" or "student" (the first one)
+    user: str
+    get_url: Callable[[PerfDataset], str]
+    # Max number of SQL queries with the cold cache, mustn't depend on
+    # the dataset size
+    query_budget: int
+
+
+ENDPOINTS = [
+    Endpoint("course_detail", "teacher",
+             lambda d: d.course.get_absolute_url(),
+             query_budget=28),
+    Endpoint("gradebook", "teacher",
+             lambda d: d.course.get_gradebook_url(),
+             query_budget=18),
+    Endpoint("gradebook_csv", "teacher",
+             lambda d: d.course.get_gradebook_url(format="csv"),
+             query_budget=10),
+    Endpoint("check_queue", "teacher",
+             lambda d: f"{reverse('teaching:assignments_check_queue')}?course={d.course.pk}",
+             query_budget=14),
+    Endpoint("check_queue_api", "teacher",
+             lambda d: reverse("learning-api:v1:personal_assignments_check_queue",
+                               kwargs={"course_id": d.course.pk},
+                               subdomain=settings.LMS_SUBDOMAIN),
+             query_budget=8),
+    Endpoint("teaching_student_assignment_detail", "teacher",
+             lambda d: d.student_assignment.get_teacher_url(),
+             query_budget=20),
+    Endpoint("study_student_assignment_detail", "student",
+             lambda d: d.student_assignment.get_student_url(),
+             query_budget=16),
+    Endpoint("study_assignment_list", "student",
+             lambda d: reverse("study:assignment_list"),
+             query_budget=15),
+    Endpoint("teaching_calendar", "teacher",
+             lambda d: reverse("teaching:calendar"),
+             query_budget=10),
+    Endpoint("study_calendar", "student",
+             lambda d: reverse("study:calendar"),
+             query_budget=11),
+    Endpoint("progress_report", "curator",
+             lambda d: reverse("staff:students_progress_report",
+                               kwargs={"output_format": "csv", "on_duplicate": "last"}),
+             query_budget=7),
+]
+
+
+def _get_user(dataset: PerfDataset, attr: str):
+    if attr == "student":
+        return dataset.students[0]
+    return getattr(dataset, attr)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("endpoint", ENDPOINTS, ids=[e.name for e in ENDPOINTS])
+def test_endpoint_budget(client, perf_dataset, perf_report, endpoint):
+    client.login(_get_user(perf_dataset, endpoint.user))
+    url = endpoint.get_url(perf_dataset)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    queries = len(context.captured_queries)
+    timings = []
+    for _ in range(TIMING_ROUNDS):
+        started_at = time.perf_counter()
+        client.get(url)
+        timings.append(time.perf_counter() - started_at)
+    perf_report.add(endpoint.name, queries=queries,
+                    query_budget=endpoint.query_budget, timings=timings)
+    assert queries <= endpoint.query_budget, (
+        f"{endpoint.name}: {queries} queries, budget is {endpoint.query_budget}")
@@ -0,0 +1,53 @@
+import os
+import time
+
+import pytest
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import RequestFactory
+
+from core.db.connections import get_connection_stats
+
+pytestmark = [
+    pytest.mark.perf,
+    pytest.mark.skipif(not os.environ.get("PERF_TESTS"),
+                       reason="Set PERF_TESTS=1 to run performance tests"),
+]
+
+
+def _get_opened_connections() -> int:
+    return next(s.opened for s in get_connection_stats() if s.alias == connection.alias)
+
+
+# Test client doesn't close connections at the end of the request and
+# the test transaction must not be closed, so requests are served by
+# the wsgi handler in autocommit mode
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("conn_max_age", [0, 60], ids=["new_connection", "reuse"])
+def test_connection_reuse_latency(perf_report, conn_max_age):
+    requests_total = int(os.environ.get("PERF_REQUESTS", 200))
+    handler = WSGIHandler()
+    environ = RequestFactory().get("/readiness/").environ
+    settings_dict = connection.settings_dict
+    saved_conn_max_age = settings_dict["CONN_MAX_AGE"]
+    settings_dict["CONN_MAX_AGE"] = conn_max_age
+    connection.close()
+    try:
+        opened_before = _get_opened_connections()
+        timings = []
+        for _ in range(requests_total):
+            started_at = time.perf_counter()
+            response = handler(environ, lambda status, headers: None)
+            # Fires `request_finished`
+            response.close()
+            timings.append(time.perf_counter() - started_at)
+            assert response.status_code == 200
+        opened = _get_opened_connections() - opened_before
+    finally:
+        settings_dict["CONN_MAX_AGE"] = saved_conn_max_age
+        connection.close()
+    perf_report.add(f"readiness_conn_max_age_{conn_max_age}",
+                    connections_opened=opened, timings=timings)
+    expected = 1 if conn_max_age else requests_total
+    assert opened == expected
@@ -1,27 +1,28 @@
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import ListAPIView
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
+from api.pagination import KeysetPagination
 from api.permissions import CuratorAccessPermission
 from auth.mixins import RolePermissionRequiredMixin
 from core.api.serializers import AcademicProgramRunSerializer
 from core.models import AcademicProgramRun
 from learning.api.serializers import StudentProfileSerializer
-from users.filters import StudentFilter
+from users.filters import STUDENT_SEARCH_ORDERING, StudentFilter
 from users.models import StudentProfile
 
 
-class StudentOffsetPagination(LimitOffsetPagination):
-    default_limit = 500
+class StudentKeysetPagination(KeysetPagination):
+    page_size = 500
+    ordering = STUDENT_SEARCH_ORDERING
 
 
 class StudentSearchJSONView(ListAPIView):
     permission_classes = [CuratorAccessPermission]
-    pagination_class = StudentOffsetPagination
+    pagination_class = StudentKeysetPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = StudentFilter
 
@@ -37,7 +38,7 @@ class StudentSearchJSONView(ListAPIView):
             StudentProfile.objects
             .select_related('user')
             .only('user__username', 'user__first_name', 'user__last_name', 'user_id')
-            .order_by('user__last_name', 'user__first_name', 'user_id')
+            .order_by(*STUDENT_SEARCH_ORDERING)
         )
 
 
@@ -13,7 +13,8 @@ from staff.views import (
     EnrollmentInvitationListView, ExportsView,
     GradeBookListView,
     HintListView, InvitationStudentsProgressReportView,
-    ProgressReportForSemesterView, ProgressReportFullView, StudentFacesView,
+    ProgressReportForSemesterView, ProgressReportFullView, RequestProfileView,
+    StudentFacesView,
     StudentSearchCSVView, StudentSearchView
 )
 
@@ -71,6 +72,7 @@ urlpatterns = [
 
 
         path('warehouse/', HintListView.as_view(), name='staff_warehouse'),
+        path('request-profile/', RequestProfileView.as_view(), name='request_profile'),
     ])),
 
     path('', include('staff.api.urls')),
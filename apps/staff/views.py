@@ -12,7 +12,12 @@ from rest_framework import serializers
 from vanilla import TemplateView
 
 import core.utils
+from api.pagination import iterate_keyset
 from core.models import University, AcademicProgram
+from core.profiling import (
+    ENDPOINT_SORT_KEYS, REQUEST_PROFILE_WINDOWS_TOTAL, get_worst_endpoints,
+    request_profile_stats
+)
 from core.reports import dataframe_to_response
 from core.urls import reverse
 from courses.constants import SemesterTypes
@@ -28,10 +33,12 @@ from learning.reports import (
 from learning.settings import StudentStatuses
 from staff.filters import EnrollmentInvitationFilter, StudentProfileFilter
 from staff.models import Hint
-from users.filters import StudentFilter
+from users.filters import STUDENT_SEARCH_ORDERING, StudentFilter
 from users.mixins import CuratorOnlyMixin
 from users.models import StudentProfile, StudentTypes
 
+STUDENT_SEARCH_CSV_BATCH_SIZE = 1000
+
 
 class StudentSearchCSVView(CuratorOnlyMixin, BaseFilterView):
     context_object_name = "applicants"
@@ -55,7 +62,11 @@ class StudentSearchCSVView(CuratorOnlyMixin, BaseFilterView):
             queryset = self.filterset.queryset.none()
         report = ProgressReportFull()
         custom_qs = report.get_queryset(base_queryset=queryset)
-        df = report.generate(queryset=custom_qs)
+        # Columns depend on the courses of all students, so the report
+        # is built in memory but the rows are fetched by index in batches
+        student_profiles = list(iterate_keyset(custom_qs, STUDENT_SEARCH_ORDERING,
+                                               batch_size=STUDENT_SEARCH_CSV_BATCH_SIZE))
+        df = report.generate(queryset=student_profiles)
         today = datetime.datetime.now().strftime("%d.%m.%Y")
         file_name = f"sheet_{today}"
         return dataframe_to_response(df, "csv", file_name)
@@ -162,6 +173,25 @@ class HintListView(CuratorOnlyMixin, generic.ListView):
         return Hint.objects.order_by("sort")
 
 
+class RequestProfileView(CuratorOnlyMixin, generic.TemplateView):
+    """Shows the slowest endpoints recorded by the request profiler"""
+    template_name = "staff/request_profile.html"
+
+    def get_context_data(self, **kwargs):
+        sort_by = self.request.GET.get("sort")
+        if sort_by not in ENDPOINT_SORT_KEYS:
+            sort_by = "total_time"
+        stats = request_profile_stats.totals()
+        context = {
+            "endpoints": get_worst_endpoints(stats, sort_by=sort_by, limit=50),
+            "sort_by": sort_by,
+            "sort_keys": ENDPOINT_SORT_KEYS,
+            "sample_rate": settings.REQUEST_PROFILER_SAMPLE_RATE,
+            "windows": REQUEST_PROFILE_WINDOWS_TOTAL,
+        }
+        return context
+
+
 class StudentFacesView(CuratorOnlyMixin, TemplateView):
     """Photo + names to memorize newbies"""
 
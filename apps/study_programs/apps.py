@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class StudyProgramsConfig(AppConfig):
     name = 'study_programs'
     verbose_name = _("Study Programs")
+
+    def ready(self):
+        from . import signals
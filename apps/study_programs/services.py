@@ -0,0 +1,67 @@
+"""
+Syllabus is the list of study programs of the admission year with their
+core course groups. Study programs change only a few times a year, so
+the prebuilt syllabus is cached per year and shared by all students
+admitted that year. Cached data is stored under the data version that
+changes every time a study program or core courses have been modified.
+"""
+from typing import Dict, Iterable, List
+
+from django.core.cache import cache
+
+from core.cache import CachedValue, DataVersion
+from core.utils import bucketize
+from study_programs.models import StudyProgram
+
+SYLLABUS_CACHE_VERSION = 1
+SYLLABUS_CACHE_TIMEOUT = 7 * 24 * 3600
+
+_syllabus_data_version = DataVersion("syllabus:{version}:data_version",
+                                     version=SYLLABUS_CACHE_VERSION)
+_syllabus: CachedValue[List[StudyProgram]] = CachedValue(
+    "syllabus:{version}:{data_version}:{year}", version=SYLLABUS_CACHE_VERSION,
+    timeout=SYLLABUS_CACHE_TIMEOUT)
+
+
+def get_syllabus_version() -> int:
+    return _syllabus_data_version.get()
+
+
+def get_syllabuses(years: Iterable[int]) -> Dict[int, List[StudyProgram]]:
+    """
+    Returns study programs with prefetched core course groups by year.
+    Missing years are fetched with one query.
+    """
+    data_version = get_syllabus_version()
+    cache_keys = {_syllabus.get_key(data_version=data_version, year=year): year
+                  for year in set(years)}
+    if not cache_keys:
+        return {}
+    syllabuses = {cache_keys[k]: v for k, v in cache.get_many(list(cache_keys)).items()}
+    missing_years = [year for year in cache_keys.values() if year not in syllabuses]
+    if missing_years:
+        queryset = (StudyProgram.objects
+                    .select_related("academic_discipline")
+                    .prefetch_core_courses_groups()
+                    .filter(year__in=missing_years)
+                    .order_by('academic_discipline__name', 'pk'))
+        study_programs = bucketize(queryset, key=lambda sp: sp.year)
+        fetched = {year: study_programs.get(year, []) for year in missing_years}
+        cache.set_many({_syllabus.get_key(data_version=data_version, year=year): syllabus
+                        for year, syllabus in fetched.items()},
+                       timeout=SYLLABUS_CACHE_TIMEOUT)
+        syllabuses.update(fetched)
+    return syllabuses
+
+
+def get_syllabus(year: int) -> List[StudyProgram]:
+    return get_syllabuses([year])[year]
+
+
+def invalidate_syllabus() -> None:
+    """
+    Syllabus of any year could be affected by the changes (e.g. saving
+    active study program deactivates programs of other years), so the
+    whole cache is invalidated by changing the data version.
+    """
+    _syllabus_data_version.invalidate()
@@ -0,0 +1,26 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from courses.models import MetaCourse
+from study_programs.models import (
+    AcademicDiscipline, StudyProgram, StudyProgramCourseGroup
+)
+from study_programs.services import invalidate_syllabus
+
+
+@receiver(post_save, sender=StudyProgram)
+@receiver(post_delete, sender=StudyProgram)
+@receiver(post_save, sender=StudyProgramCourseGroup)
+@receiver(post_delete, sender=StudyProgramCourseGroup)
+@receiver(post_save, sender=AcademicDiscipline)
+@receiver(post_delete, sender=AcademicDiscipline)
+@receiver(post_save, sender=MetaCourse)
+@receiver(post_delete, sender=MetaCourse)
+def invalidate_syllabus_cache(sender, *args, **kwargs):
+    invalidate_syllabus()
+
+
+@receiver(m2m_changed, sender=StudyProgramCourseGroup.courses.through)
+def invalidate_syllabus_on_core_courses_change(sender, action, *args, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_syllabus()
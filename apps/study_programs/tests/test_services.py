@@ -0,0 +1,53 @@
+import pytest
+
+from courses.tests.factories import MetaCourseFactory
+from study_programs.services import get_syllabus, get_syllabuses
+from study_programs.tests.factories import (
+    StudyProgramCourseGroupFactory, StudyProgramFactory
+)
+
+
+@pytest.mark.django_db
+def test_get_syllabus_cache(django_assert_num_queries):
+    meta_course = MetaCourseFactory()
+    group = StudyProgramCourseGroupFactory(study_program__year=2024,
+                                           courses=[meta_course])
+    study_program = group.study_program
+    # Study program + course groups + core courses
+    with django_assert_num_queries(3):
+        syllabus = get_syllabus(2024)
+    assert syllabus == [study_program]
+    assert list(syllabus[0].course_groups.all()[0].courses.all()) == [meta_course]
+    with django_assert_num_queries(0):
+        syllabus = get_syllabus(2024)
+        syllabuses = get_syllabuses([2024])
+    assert syllabuses == {2024: [study_program]}
+    assert list(syllabus[0].course_groups.all()[0].courses.all()) == [meta_course]
+    # Unknown year is cached too
+    assert get_syllabus(2025) == []
+    with django_assert_num_queries(0):
+        assert get_syllabus(2025) == []
+
+
+@pytest.mark.django_db
+def test_get_syllabus_cache_invalidation():
+    group = StudyProgramCourseGroupFactory(study_program__year=2024)
+    assert get_syllabus(2024) == [group.study_program]
+    assert get_syllabus(2025) == []
+    study_program = StudyProgramFactory(year=2025)
+    assert get_syllabus(2025) == [study_program]
+    meta_course = MetaCourseFactory()
+    group.courses.add(meta_course)
+    syllabus = get_syllabus(2024)
+    assert list(syllabus[0].course_groups.all()[0].courses.all()) == [meta_course]
+    meta_course.name = 'New Name'
+    meta_course.save()
+    syllabus = get_syllabus(2024)
+    assert syllabus[0].course_groups.all()[0].courses.all()[0].name == 'New Name'
+    group.courses.clear()
+    syllabus = get_syllabus(2024)
+    assert not syllabus[0].course_groups.all()[0].courses.all()
+    group.delete()
+    assert not get_syllabus(2024)[0].course_groups.all()
+    study_program.delete()
+    assert get_syllabus(2025) == []
@@ -18,6 +18,11 @@ class PhotoSerializerField(serializers.Field):
         pass
 
     def to_representation(self, obj):
+        # URLs could be resolved in advance for all objects on the page,
+        # see `users.thumbnails.get_user_thumbnail_urls`
+        photo_urls = self.context.get("photo_urls")
+        if photo_urls is not None and obj.pk in photo_urls:
+            return photo_urls[obj.pk]
         thumbnail_options = {"use_stub": True, **self.thumbnail_options}
         image = obj.get_thumbnail(self.photo_dimensions, **thumbnail_options)
         return image.url
@@ -1,9 +1,14 @@
-from django.db.models import Case, Count, F, Q, Value, When
+from django.db import connection
+from django.db.models import (
+    Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce
 from django.forms import SelectMultiple
 from django_filters.fields import MultipleChoiceField
 from django_filters.rest_framework import CharFilter, FilterSet
 
 from core.filters import CharInFilter, NumberInFilter
+from learning.models import Enrollment
 from learning.settings import StudentStatuses, GradingSystems
 from users.models import StudentProfile
 
@@ -39,6 +44,22 @@ def replace_single_quotes(column_name):
     return f"replace({column_name}, '''', '')"
 
 
+# Unique ordering of the student search results
+STUDENT_SEARCH_ORDERING = ('user__last_name', 'user__first_name', 'user_id')
+
+_pg_extensions = {}
+
+
+def has_pg_extension(name: str) -> bool:
+    """Checks whether postgres extension is installed in the current database"""
+    key = (connection.settings_dict['NAME'], name)
+    if key not in _pg_extensions:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = %s", [name])
+            _pg_extensions[key] = cursor.fetchone() is not None
+    return _pg_extensions[key]
+
+
 class StudentFilter(FilterSet):
     ENROLLMENTS_MAX = 12
 
@@ -77,15 +98,22 @@ class StudentFilter(FilterSet):
         except ValueError:
             return queryset
 
-        passing_grade = GradingSystems.get_passing_grade_expr('user__enrollment')
+        # Correlated subquery is evaluated only for the rows passed other
+        # filters instead of joining all enrollments of all students
+        passing_grade = GradingSystems.get_passing_grade_expr()
+        courses_total = (Enrollment.objects
+                         .filter(student_id=OuterRef('user_id'))
+                         .order_by()
+                         .values('student_id')
+                         # Remove unsuccessful grades, then distinctly count by pk
+                         .annotate(total=Count(Case(
+                             When(grade__lt=passing_grade, then=Value(None)),
+                             default=F("course__meta_course_id")
+                         ), distinct=True))
+                         .values('total'))
         queryset = queryset.annotate(
-            courses_total=
-            # Remove unsuccessful grades, then distinctly count by pk
-            Count(Case(
-                When(user__enrollment__grade__lt=passing_grade,
-                     then=Value(None)),
-                default=F("user__enrollment__course__meta_course_id")
-            ), distinct=True)
+            courses_total=Coalesce(Subquery(courses_total,
+                                            output_field=IntegerField()), 0)
         )
         condition = Q(courses_total__in=[v for v in value_list
                                          if v <= self.ENROLLMENTS_MAX])
@@ -106,16 +134,18 @@ class StudentFilter(FilterSet):
         tsquery = self._form_name_tsquery(qstr)
         if tsquery is None:
             return queryset
-        else:
-            tsvector_text = (f"{replace_single_quotes('users_user.first_name')}"
-                             f" || ' ' || "
-                             f"{replace_single_quotes('users_user.last_name')}")
-            qs = (queryset
-                  .extra(where=[f"to_tsvector({tsvector_text}) @@ to_tsquery({replace_single_quotes('%s')})"],
-                         params=[tsquery])
-                  .exclude(user__first_name__exact='',
-                           user__last_name__exact=''))
-            return qs
+        # `users_user.search_vector` is maintained by the database trigger
+        condition = f"users_user.search_vector @@ to_tsquery('simple', {replace_single_quotes('%s')})"
+        params = [tsquery]
+        if has_pg_extension('pg_trgm'):
+            # Typo tolerant search, see `users_user_name_trgm_idx` index
+            condition = (f"({condition} OR "
+                         f"(users_user.first_name || ' ' || users_user.last_name) %% %s)")
+            params.append(qstr)
+        return (queryset
+                .extra(where=[condition], params=params)
+                .exclude(user__first_name__exact='',
+                         user__last_name__exact=''))
 
     def _form_name_tsquery(self, qstr):
         if qstr is None or not (2 <= len(qstr) < 100):
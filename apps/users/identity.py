@@ -0,0 +1,75 @@
+"""
+Identity snapshot contains everything the authentication middleware and
+permission checks need about the user: core fields of the account, roles
+and the active student profile. It's stored in cache, so a warm request
+doesn't hit the database to identify the user. Invalidated on user, role
+and student profile changes.
+"""
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional
+
+from core.cache import CachedValue, permissions_cache
+from core.utils import instance_memoize
+from users.models import StudentProfile, User
+
+# Bump the version after changing `IDENTITY_DEFERRED_FIELDS` too
+IDENTITY_SNAPSHOT_CACHE_VERSION = 2
+IDENTITY_SNAPSHOT_CACHE_TIMEOUT = 3600
+# These fields are loaded from the database on first access
+IDENTITY_DEFERRED_FIELDS = ('password', 'search_vector')
+
+
+class IdentitySnapshot(NamedTuple):
+    # Field values by attribute name
+    fields: Dict[str, Any]
+    # Verifies session without storing the password hash in cache
+    session_auth_hash: str
+    roles: FrozenSet[int]
+    # Field values of the active student profile
+    student_profile_fields: Optional[Dict[str, Any]]
+
+    def to_user(self) -> User:
+        """
+        Returns user instance with deferred `IDENTITY_DEFERRED_FIELDS`.
+        Saving the instance updates loaded fields only.
+        """
+        user = User.from_db(User.objects.db, list(self.fields), list(self.fields.values()))
+        user.__dict__['roles'] = set(self.roles)
+        student_profile = None
+        if self.student_profile_fields is not None:
+            fields = self.student_profile_fields
+            student_profile = StudentProfile.from_db(StudentProfile.objects.db,
+                                                     list(fields), list(fields.values()))
+            student_profile.user = user
+        instance_memoize.set_cache(user, User.get_student_profile, student_profile)
+        return user
+
+
+_identity_snapshot: CachedValue[IdentitySnapshot] = CachedValue(
+    "identity:{version}:{user_id}", version=IDENTITY_SNAPSHOT_CACHE_VERSION,
+    timeout=IDENTITY_SNAPSHOT_CACHE_TIMEOUT, cache=permissions_cache)
+
+
+def _load_identity_snapshot(user_id: int) -> Optional[IdentitySnapshot]:
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return None
+    fields = {f.attname: getattr(user, f.attname) for f in User._meta.concrete_fields
+              if f.attname not in IDENTITY_DEFERRED_FIELDS}
+    student_profile = user.get_student_profile()
+    student_profile_fields = None
+    if student_profile is not None:
+        student_profile_fields = {f.attname: getattr(student_profile, f.attname)
+                                  for f in StudentProfile._meta.concrete_fields}
+    return IdentitySnapshot(
+        fields=fields,
+        session_auth_hash=user.get_session_auth_hash(),
+        roles=frozenset(user.roles),
+        student_profile_fields=student_profile_fields)
+
+
+def get_identity_snapshot(user_id: int) -> Optional[IdentitySnapshot]:
+    return _identity_snapshot.get(lambda: _load_identity_snapshot(user_id), user_id=user_id)
+
+
+def invalidate_identity_snapshot(user_id: int) -> None:
+    _identity_snapshot.invalidate(user_id=user_id)
@@ -14,8 +14,10 @@ def get_enrollments_progress(lookup='enrollment_set',
     queryset = (Enrollment.active
                 .filter(*filters)
                 .select_related('course__meta_course',
-                                'course__semester')
-                .only('pk', 'created', 'student_id', 'course_id', 'grade'))
+                                'course__semester',
+                                'course_program_binding')
+                .only('pk', 'created', 'student_id', 'course_id', 'grade',
+                      'course_program_binding_id'))
     return Prefetch(lookup, queryset=queryset, to_attr=to_attr)
 
 
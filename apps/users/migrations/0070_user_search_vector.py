@@ -0,0 +1,73 @@
+# Generated by Django 4.2.27 on 2026-10-19 07:03
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import DatabaseError, migrations, transaction
+
+# Keep in sync with `users.filters.StudentFilter.name_filter`
+SEARCH_VECTOR_TRIGGER = """
+CREATE OR REPLACE FUNCTION users_user_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector(
+        'simple',
+        replace(coalesce(NEW.first_name, ''), '''', '') || ' ' ||
+        replace(coalesce(NEW.last_name, ''), '''', '')
+    );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER users_user_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF first_name, last_name, search_vector ON users_user
+    FOR EACH ROW EXECUTE FUNCTION users_user_search_vector_update();
+
+UPDATE users_user SET search_vector = NULL;
+"""
+
+SEARCH_VECTOR_TRIGGER_REVERSE = """
+DROP TRIGGER IF EXISTS users_user_search_vector_trigger ON users_user;
+DROP FUNCTION IF EXISTS users_user_search_vector_update();
+"""
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Trigram index makes the name search tolerant to typos. It's optional
+    since `pg_trgm` extension could be unavailable on the database server.
+    """
+    connection = schema_editor.connection
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE INDEX IF NOT EXISTS users_user_name_trgm_idx ON users_user "
+                       "USING gin ((first_name || ' ' || last_name) gin_trgm_ops)")
+
+
+def drop_trigram_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS users_user_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0069_remove_studentprofile_unique_regular_student_per_admission_campaign_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='users_user_search_idx'),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGER, SEARCH_VECTOR_TRIGGER_REVERSE),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
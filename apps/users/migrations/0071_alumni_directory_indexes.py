@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-19 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0070_user_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(condition=models.Q(('type', 'alumni')), fields=['alumni_consent', 'user'], name='student_profiles_alumni_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(condition=models.Q(('status', 'graduated')), fields=['academic_program_enrollment', 'year_of_graduation', 'user'], name='student_profiles_graduated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='users_user_name_idx'),
+        ),
+    ]
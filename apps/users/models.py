@@ -9,6 +9,8 @@ from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import AnonymousUser, PermissionsMixin, _user_has_perm
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
@@ -41,6 +43,7 @@ from learning.managers import EnrollmentQuerySet
 from learning.settings import StudentStatuses
 from notifications.base_models import EmailAddressSuspension
 from study_programs.models import StudyProgram, AcademicDiscipline
+from study_programs.services import get_syllabus
 from users.constants import GenderTypes
 from users.constants import Roles
 from users.constants import Roles as UserRoles
@@ -346,6 +349,9 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
 
     calendar_key = models.CharField(unique=True, max_length=DIGEST_MAX_LENGTH,
                                     blank=True)
+    # Full text search document of the user name. Maintained by the
+    # database trigger, see `users_user_search_vector_trigger`
+    search_vector = SearchVectorField(null=True, editable=False)
 
     objects = CustomUserManager()
 
@@ -353,6 +359,12 @@ class User(TimezoneAwareMixin, LearningPermissionsMixin, StudentProfileAbstract,
         db_table = 'users_user'
         verbose_name = _("CSCUser|user")
         verbose_name_plural = _("CSCUser|users")
+        indexes = [
+            GinIndex(fields=['search_vector'], name='users_user_search_idx'),
+            # Alumni directory ordering
+            models.Index(fields=['last_name', 'first_name', 'id'],
+                         name='users_user_name_idx'),
+        ]
 
     def get_group_permissions(self, obj=None):
         return PermissionsMixin.get_group_permissions(self, obj)
@@ -730,6 +742,15 @@ class StudentProfile(TimeStampedModel):
                 condition=Q(type=StudentTypes.ALUMNI)
             ),
         ]
+        indexes = [
+            # Alumni directory filters, see `alumni.selectors.alumni_queryset`
+            models.Index(fields=['alumni_consent', 'user'],
+                         name='student_profiles_alumni_idx',
+                         condition=Q(type=StudentTypes.ALUMNI)),
+            models.Index(fields=['academic_program_enrollment', 'year_of_graduation', 'user'],
+                         name='student_profiles_graduated_idx',
+                         condition=Q(status=StudentStatuses.GRADUATED)),
+        ]
 
     def save(self, **kwargs):
         from users.services import get_student_profile_priority
@@ -778,10 +799,7 @@ class StudentProfile(TimeStampedModel):
         # into student profile objects.
         if not self.academic_program_enrollment or self.type == StudentTypes.INVITED:
             return None
-        return list(StudyProgram.objects
-                    .select_related("academic_discipline")
-                    .prefetch_core_courses_groups()
-                    .filter(year=self.academic_program_enrollment.start_year))
+        return get_syllabus(self.academic_program_enrollment.start_year)
 
     @cached_property
     def academic_discipline(self) -> AcademicDiscipline:
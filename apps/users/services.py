@@ -1,6 +1,5 @@
 import datetime
 from enum import Enum, auto
-from itertools import islice
 from typing import Any, List, Optional
 
 from django.core.exceptions import ValidationError
@@ -9,9 +8,8 @@ from registration.models import RegistrationProfile
 
 from auth.registry import role_registry
 from core.timezone import get_now_utc, UTC
-from core.utils import bucketize
 from learning.settings import StudentStatuses
-from study_programs.models import StudyProgram
+from study_programs.services import get_syllabuses
 from users.constants import GenderTypes, Roles
 from users.models import StudentProfile, StudentStatusLog, StudentTypes, User, UserGroup
 
@@ -98,26 +96,14 @@ def get_student_profiles(*, user: User,
                             .filter(user=user)
                             .select_related('academic_program_enrollment')
                             .order_by('priority', '-year_of_admission', '-pk'))
-    syllabus_data = [
-        sp.academic_program_enrollment.start_year if sp.academic_program_enrollment else None
-        for sp in student_profiles
-    ]
-    if syllabus_data:
-        academic_program_start_year = syllabus_data[0]
-        in_array = Q(year=academic_program_start_year)
-        for academic_program_start_year in islice(syllabus_data, 1, None):
-            in_array |= Q(year=academic_program_start_year)
-        queryset = (StudyProgram.objects
-                    .select_related("academic_discipline")
-                    .prefetch_core_courses_groups()
-                    .filter(in_array)
-                    .order_by('academic_discipline__name'))
-        syllabus = bucketize(queryset, key=lambda sp: sp.year)
-        for sp in student_profiles:
-            # XXX: Keep in sync with StudentProfile.syllabus implementation
-            key = sp.academic_program_enrollment.start_year if sp.academic_program_enrollment else None
-            if sp.type != StudentTypes.INVITED:
-                sp.__dict__['syllabus'] = syllabus.get(key, None)
+    years = {sp.academic_program_enrollment.start_year for sp in student_profiles
+             if sp.academic_program_enrollment}
+    syllabus = get_syllabuses(years)
+    for sp in student_profiles:
+        # XXX: Keep in sync with StudentProfile.syllabus implementation
+        key = sp.academic_program_enrollment.start_year if sp.academic_program_enrollment else None
+        if sp.type != StudentTypes.INVITED:
+            sp.__dict__['syllabus'] = syllabus.get(key, None)
     if fetch_status_history:
         queryset = (StudentStatusLog.objects
                     .order_by('-status_changed_at', '-pk'))
@@ -4,6 +4,7 @@ from django.dispatch import receiver
 from lms.utils import PublicRoute
 from users.constants import student_permission_roles
 
+from .identity import invalidate_identity_snapshot
 from .models import StudentProfile, StudentTypes, User, UserGroup
 from .services import get_student_profile, maybe_unassign_student_role
 
@@ -21,3 +22,17 @@ def post_delete_student_profile(sender, instance: StudentProfile, **kwargs):
     deleted_profile = instance
     role = StudentTypes.to_permission_role(deleted_profile.type)
     maybe_unassign_student_role(role=role, account=deleted_profile.user)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_identity(sender, instance: User, *args, **kwargs):
+    invalidate_identity_snapshot(instance.pk)
+
+
+@receiver(post_save, sender=UserGroup)
+@receiver(post_delete, sender=UserGroup)
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def invalidate_related_user_identity(sender, instance, *args, **kwargs):
+    invalidate_identity_snapshot(instance.user_id)
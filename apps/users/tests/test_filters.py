@@ -306,3 +306,28 @@ def test_filter_student_search_by_program_and_uni(
         expected_count=len(students_3)
     )
     assert {s.pk for s in students_3} == {r["user_id"] for r in results["results"]}
+
+
+@pytest.mark.django_db
+def test_student_search_keyset_pagination(client, curator, mocker, program_run_cub):
+    mocker.patch('staff.api.views.StudentKeysetPagination.page_size', 2)
+    client.login(curator)
+    students = [
+        StudentFactory(student_profile__academic_program_enrollment=program_run_cub,
+                       last_name=last_name, first_name=first_name)
+        for last_name, first_name in [('Петров', 'Иван'), ('Иванов', 'Петр'),
+                                      ('Иванов', 'Иван'), ('Иванов', 'Иван')]
+    ]
+    response_data = search(client, academic_programs=program_run_cub.program, expected_count=4)
+    user_ids = [r["user_id"] for r in response_data["results"]]
+    assert len(user_ids) == 2
+    assert response_data["next"] is not None
+    response = client.get(response_data["next"])
+    assert response.status_code == 200
+    assert response.json()["count"] is None
+    assert response.json()["next"] is None
+    user_ids += [r["user_id"] for r in response.json()["results"]]
+    expected = sorted(students, key=lambda s: (s.last_name, s.first_name, s.pk))
+    assert user_ids == [s.pk for s in expected]
+    response = client.get(f"{reverse_lazy('staff:student_search_json')}?name=Иванов&cursor=invalid")
+    assert response.status_code == 404
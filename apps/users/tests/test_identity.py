@@ -0,0 +1,95 @@
+import pytest
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.test import RequestFactory
+
+from auth.middleware import AuthenticationMiddleware
+from users.constants import Roles
+from users.identity import get_identity_snapshot
+from users.models import User
+from users.tests.factories import StudentFactory, TeacherFactory, UserFactory
+
+
+def get_request_user(client):
+    request = RequestFactory().get('/')
+    session_key = client.cookies[settings.SESSION_COOKIE_NAME].value
+    request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+    SessionMiddleware(lambda r: None).process_request(request)
+    AuthenticationMiddleware(lambda r: None).process_request(request)
+    # Evaluate lazy object
+    request.user.is_authenticated
+    return request.user
+
+
+@pytest.mark.django_db
+def test_identity_snapshot_warm_request(client, django_assert_num_queries):
+    teacher = TeacherFactory()
+    client.login(teacher)
+    get_request_user(client)
+    with django_assert_num_queries(0):
+        user = get_request_user(client)
+        assert user.is_authenticated
+        assert user.pk == teacher.pk
+        assert user.email == teacher.email
+        assert user.time_zone == teacher.time_zone
+        assert user.roles == {Roles.TEACHER}
+        assert user.is_teacher
+        assert not user.is_student
+        assert user.get_student_profile() is None
+    student = StudentFactory()
+    student_profile = student.get_student_profile()
+    client.login(student)
+    get_request_user(client)
+    with django_assert_num_queries(0):
+        user = get_request_user(client)
+        assert user.roles == {Roles.STUDENT}
+        assert user.get_student_profile() == student_profile
+        assert user.get_student_profile().type == student_profile.type
+        assert user.get_student_profile().user.pk == student.pk
+
+
+@pytest.mark.django_db
+def test_identity_snapshot_invalidation(client):
+    student = StudentFactory()
+    client.login(student)
+    user = get_request_user(client)
+    student_profile = user.get_student_profile()
+    assert student_profile is not None
+    snapshot = get_identity_snapshot(student.pk)
+    assert snapshot.student_profile_fields['id'] == student_profile.pk
+    assert snapshot.student_profile_fields['type'] == student_profile.type
+    student.add_group(Roles.TEACHER)
+    assert get_request_user(client).roles == {Roles.STUDENT, Roles.TEACHER}
+    student.remove_group(Roles.TEACHER)
+    assert get_request_user(client).roles == {Roles.STUDENT}
+    student.first_name = 'Updated'
+    student.save()
+    assert get_request_user(client).first_name == 'Updated'
+    student.is_active = False
+    student.save()
+    assert not get_request_user(client).is_authenticated
+
+
+@pytest.mark.django_db
+def test_identity_snapshot_password_change(client):
+    user = UserFactory()
+    client.login(user)
+    assert get_request_user(client).is_authenticated
+    user.set_password('new password')
+    user.save()
+    assert not get_request_user(client).is_authenticated
+
+
+@pytest.mark.django_db
+def test_identity_snapshot_user_save(client):
+    user = UserFactory()
+    client.login(user)
+    get_request_user(client)
+    request_user = get_request_user(client)
+    request_user.last_name = 'Updated'
+    request_user.save()
+    saved_user = User.objects.get(pk=user.pk)
+    assert saved_user.last_name == 'Updated'
+    # Deferred password hash hasn't been overwritten
+    assert saved_user.check_password(user.raw_password)
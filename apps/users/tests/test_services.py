@@ -181,12 +181,12 @@ def test_get_student_profiles(django_assert_num_queries, program_run_nup):
     assert student_profile2.priority < student_profile1.priority
     assert student_profile1 == student_profiles[1]
     assert student_profile2 == student_profiles[0]  # higher priority
-    with django_assert_num_queries(3):
-        # 1) student profiles 2) empty study programs 3) status history
+    with django_assert_num_queries(2):
+        # 1) student profiles 2) status history, syllabus is cached
         student_profiles = get_student_profiles(user=user, fetch_status_history=True)
         for sp in student_profiles:
             assert not sp.status_history.all()
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(3):
         student_profiles = get_student_profiles(user=user)
         for sp in student_profiles:
             assert not sp.status_history.all()
@@ -1,4 +1,5 @@
-from typing import Optional
+import hashlib
+from typing import Dict, Iterable, Optional
 
 from sorl.thumbnail import get_thumbnail as sorl_get_thumbnail
 from sorl.thumbnail.images import BaseImageFile, DummyImageFile
@@ -6,11 +7,17 @@ from sorl.thumbnail.images import BaseImageFile, DummyImageFile
 from django import forms
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.core import checks
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db.models import ImageField
 
 from users.constants import GenderTypes, ThumbnailSizes
 
+# Bump the version after changing the thumbnail options
+USER_THUMBNAIL_URL_CACHE_VERSION = 1
+USER_THUMBNAIL_URL_CACHE_KEY = "user_thumbnail_url:{version}:{digest}"
+USER_THUMBNAIL_URL_CACHE_TIMEOUT = 7 * 24 * 3600
+
 
 # TODO: add validation for unbound coords and width=img.width
 class CropboxData(forms.Form):
@@ -226,3 +233,43 @@ def get_thumbnail(path_to_img, geometry, stub_factory=None, **options) -> Option
         else:
             thumbnail = None  # DummyImageFile -> None
     return thumbnail
+
+
+def _get_thumbnail_url_cache_key(user, geometry, options) -> str:
+    cropbox = options.get("cropbox", user.photo_thumbnail_cropbox())
+    source = f"{user.photo.name}:{geometry}:{cropbox}:{sorted(options.items())}"
+    digest = hashlib.md5(source.encode("utf-8")).hexdigest()
+    return USER_THUMBNAIL_URL_CACHE_KEY.format(version=USER_THUMBNAIL_URL_CACHE_VERSION,
+                                               digest=digest)
+
+
+def get_user_thumbnail_urls(users: Iterable, geometry,
+                            **options) -> Dict[int, Optional[str]]:
+    """
+    Returns thumbnail URLs by user id. Thumbnails of the uploaded photos
+    are looked up in cache with a single request, the rest are resolved
+    by the thumbnail backend one by one. Stub images are resolved
+    without any lookups.
+    """
+    urls = {}
+    photo_users = {}
+    for user in users:
+        if user.photo:
+            photo_users[_get_thumbnail_url_cache_key(user, geometry, options)] = user
+        else:
+            thumbnail = get_user_thumbnail(user, geometry, **options)
+            urls[user.pk] = thumbnail.url if thumbnail else None
+    cached_urls = cache.get_many(list(photo_users))
+    resolved_urls = {}
+    for cache_key, user in photo_users.items():
+        if cache_key in cached_urls:
+            urls[user.pk] = cached_urls[cache_key]
+            continue
+        thumbnail = get_user_thumbnail(user, geometry, **options)
+        urls[user.pk] = thumbnail.url if thumbnail else None
+        # Don't cache the stub, the thumbnail could be created later
+        if thumbnail and not isinstance(thumbnail, BaseStubImage):
+            resolved_urls[cache_key] = thumbnail.url
+    if resolved_urls:
+        cache.set_many(resolved_urls, timeout=USER_THUMBNAIL_URL_CACHE_TIMEOUT)
+    return urls
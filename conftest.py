@@ -15,6 +15,7 @@ def _allow_django_in_async_context():
     os.environ.setdefault("DJANGO_ALLOW_ASYNC_UNSAFE", "true")
 
 from django.contrib.sites.models import Site
+from django.core.cache import caches
 from django.core.files import File
 from django.db import connection, transaction
 from django.test import TestCase
@@ -43,6 +44,17 @@ def client():
     return TestClient()
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """
+    Database changes are rolled back after each test, cached model
+    instances must not outlive them.
+    """
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
 @pytest.fixture(scope="session")
 def assert_redirect():
     """Wrapper around Django TestCase.assertRedirects with fetch_redirect_response disabled."""
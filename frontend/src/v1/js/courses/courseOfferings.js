@@ -52,6 +52,27 @@ function filterTermAction(event) {
   filterCourseOfferings(event);
 }
 
+function hasTerm(offeringsData, termSlug) {
+  let [year, termType] = termSlug.split('-');
+  let academicYear = parseInt(year);
+  if (termType === 'spring') {
+    academicYear -= 1;
+  }
+  let availableTerms = offeringsData.terms[academicYear];
+  return availableTerms !== undefined && availableTerms.includes(termType);
+}
+
+// Only courses of the active term are embedded in the page
+function loadTermCourses(offeringsData, termSlug) {
+  if (termSlug in offeringsData.courses) {
+    return $.Deferred().resolve(offeringsData.courses[termSlug]).promise();
+  }
+  return $.getJSON(offeringsData.coursesUrl, { semester: termSlug }).then(data => {
+    offeringsData.courses[termSlug] = data.courses;
+    return data.courses;
+  });
+}
+
 function filterCourseOfferings(event) {
   event.preventDefault();
   let academicYear = parseInt(event.data.yearsFilter.find('select').val());
@@ -62,7 +83,7 @@ function filterCourseOfferings(event) {
   }
   // Make sure termType available for selected year
   let slug = `${year}-${selectedTerm}`;
-  if (!(slug in event.data.offeringsData.courses)) {
+  if (!hasTerm(event.data.offeringsData, slug)) {
     let availableTerms = event.data.offeringsData.terms[academicYear];
     year = academicYear;
     // Note: terms in reversed order
@@ -72,7 +93,7 @@ function filterCourseOfferings(event) {
     }
     slug = `${year}-${selectedTerm}`;
   }
-  if (slug in event.data.offeringsData.courses) {
+  if (hasTerm(event.data.offeringsData, slug)) {
     updateDOM(event.data, slug, academicYear, selectedTerm);
     // Update history
     if (window.history && history.pushState) {
@@ -98,11 +119,15 @@ function filterCourseOfferings(event) {
 function updateDOM(eventData, termSlug, academicYear, selectedTerm) {
   let availableTerms = eventData.offeringsData.terms[academicYear];
   // Update table content
-  let rows = '';
-  eventData.offeringsData.courses[termSlug].forEach(course => {
-    rows += eventData.templates.courseRow({ co: course });
-  });
-  $('.__courses tbody').html(rows);
+  loadTermCourses(eventData.offeringsData, termSlug)
+    .then(courses => {
+      let rows = '';
+      courses.forEach(course => {
+        rows += eventData.templates.courseRow({ co: course });
+      });
+      $('.__courses tbody').html(rows);
+    })
+    .fail(error => showComponentError(error));
   // Update term types list
   let termOptions = availableTerms.reduceRight((acc, termType) => {
     acc += eventData.templates.termOption({
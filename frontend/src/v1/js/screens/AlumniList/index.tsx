@@ -1,4 +1,4 @@
-import { QueryClient, QueryClientProvider, useQuery } from '@tanstack/react-query'
+import { QueryClient, QueryClientProvider, useInfiniteQuery } from '@tanstack/react-query'
 import { City, Graduation, UserAlumni } from '~/js/api/types'
 import ky from 'ky'
 import React, { useState } from 'react'
@@ -19,7 +19,10 @@ interface AlumniListRequest {
 }
 
 interface AlumniListResponse {
-  alumni: UserAlumni[]
+  // Returned with the first page only
+  count: number | null
+  next: string | null
+  results: UserAlumni[]
 }
 
 function AlumniCard({ user }: { user: UserAlumni }) {
@@ -50,11 +53,14 @@ function Component({ programs, cities }: Props) {
     queryParams.city = selectedCity.id
   }
 
-  const { isPending, error, data } = useQuery({
+  const { isPending, error, data, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['alumniList', selectedProgram, selectedCity],
-    queryFn: () => ky
-      .get('/api/v1/alumni/list/', { searchParams: queryParams })
+    queryFn: ({ pageParam }) => (pageParam
+      ? ky.get(pageParam)
+      : ky.get('/api/v1/alumni/list/', { searchParams: queryParams }))
       .then(res => res.json<AlumniListResponse>()),
+    initialPageParam: null as string | null,
+    getNextPageParam: lastPage => lastPage.next,
   })
 
   return <>
@@ -95,7 +101,12 @@ function Component({ programs, cities }: Props) {
     {isPending && 'Loading...'}
     {error && `An error occurred: ${error.message}`}
     {data && <div className={'alumni-cards mt-10'}>
-      {data.alumni.map(user => <AlumniCard key={user.id} user={user}/>)}
+      {data.pages.flatMap(page => page.results).map(user => <AlumniCard key={user.id} user={user}/>)}
+    </div>}
+    {hasNextPage && <div className={'text-center mt-10'}>
+      <button className={'btn btn-default'} disabled={isFetchingNextPage} onClick={() => fetchNextPage()}>
+        Load more
+      </button>
     </div>}
   </>
 }
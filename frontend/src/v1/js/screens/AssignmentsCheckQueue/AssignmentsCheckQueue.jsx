@@ -1,14 +1,7 @@
 import PropTypes from 'prop-types';
-import React, {
-  useCallback,
-  useEffect,
-  useMemo,
-  useReducer,
-  useState
-} from 'react';
+import React, { useCallback, useEffect, useReducer, useState } from 'react';
 
 import cn from 'classnames';
-import countBy from 'lodash-es/countBy';
 import isEqual from 'lodash-es/isEqual';
 import { useAsync } from 'react-async';
 import {
@@ -21,15 +14,13 @@ import {
 import Checkbox from '../../components/Checkbox';
 import CheckboxButton from '../../components/CheckboxButton';
 import CourseFilterForm from './CourseFilterForm';
-import { fetchData, refetchPersonalAssignments } from './fetch';
+import { fetchData, fetchNextPage, refetchPersonalAssignments } from './fetch';
 import PersonalAssignmentList from './PersonalAssignmentList';
 import {
   FiltersURLSearchParams,
-  getFilteredPersonalAssignments,
   scoreOptions,
   sortEnum,
   sortOptions,
-  sortPersonalAssignments,
   stateReducer,
   useFilterState,
   useQueryParams
@@ -46,36 +37,41 @@ function AssignmentsCheckQueue({
 }) {
   const queryParams = useQueryParams();
   const navigate = useNavigate();
-  const [page, setPage] = useState(1);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [state, updateState] = useReducer(stateReducer, {
     isInitialized: false,
     assignments: new Map(),
     assignmentOptions: [],
     personalAssignments: null,
-    studentGroups: null
-  });
-  const { counter: fetchCounter, run } = useAsync({
-    promiseFn: fetchData,
-    deferFn: refetchPersonalAssignments,
-    csrfToken,
-    timeZone,
-    queryParams,
-    initialState,
-    updateState
+    nextCursor: null,
+    countByStatus: {}
   });
   const [filters, setFilters, onFilterChange] = useFilterState({
-    course: initialState.course,
-    assignments: initialState.selectedAssignments,
+    course: queryParams.course || initialState.course,
+    assignments: queryParams.assignments || initialState.selectedAssignments,
     statuses: queryParams.statuses || [],
     score: queryParams.score || [],
     reviewers: queryParams.reviewers || [],
     studentGroups: queryParams.studentGroups || [],
     sort: queryParams.sort || sortEnum.SOLUTION_ASC
   });
+  const { run } = useAsync({
+    promiseFn: fetchData,
+    deferFn: refetchPersonalAssignments,
+    csrfToken,
+    timeZone,
+    filters,
+    updateState
+  });
   console.debug('filters on render', filters);
 
-  const { assignments, assignmentOptions, studentGroups, personalAssignments } =
-    state;
+  const {
+    assignments,
+    assignmentOptions,
+    personalAssignments,
+    nextCursor,
+    countByStatus
+  } = state;
 
   const handleSubmitForm = ({ course, assignments }) => {
     const filterURLSearchParams = new FiltersURLSearchParams();
@@ -117,41 +113,25 @@ function AssignmentsCheckQueue({
 
     if (!isEqual(filtersPrevious, filtersNext)) {
       setFilters(filtersNext);
-    }
-    // Refetch logic
-    const formFiltersPrevious = {
-      course: filtersPrevious.course,
-      assignments: filtersPrevious.assignments
-    };
-    const formFiltersNext = {
-      course: filtersNext.course,
-      assignments: filtersNext.assignments
-    };
-    if (!isEqual(formFiltersPrevious, formFiltersNext)) {
-      // TODO(perf): filter out personal assignments and update state instead of
-      //  fetching if only some assignment checkboxes were removed
+      // Any filter change resets the check queue to the first page
       console.debug('Fetch personal assignments');
-      const filterURLSearchParams = new FiltersURLSearchParams();
-      filterURLSearchParams.assign(filtersNext);
-      run(
-        csrfToken,
-        timeZone,
-        updateState,
-        studentGroups,
-        filterURLSearchParams
-      );
+      run(csrfToken, updateState, filtersNext);
       // Rerender multiple select in CourseFilterForm
       updateState({
-        personalAssignments: null
+        personalAssignments: null,
+        nextCursor: null
       });
     }
-
-    if (fetchCounter > 0) {
-      setPage(1);
-    }
     // XXX: Skip `state` to trigger callback on changing query parameters only
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [run, csrfToken, setPage, timeZone, updateState, queryParams]);
+  }, [run, csrfToken, timeZone, updateState, queryParams]);
+
+  const loadNextPage = useCallback(() => {
+    setIsLoadingMore(true);
+    fetchNextPage([csrfToken, updateState, filters, nextCursor]).finally(() =>
+      setIsLoadingMore(false)
+    );
+  }, [csrfToken, updateState, filters, nextCursor]);
 
   const setFilterQueryParams = useCallback(
     newFilters => {
@@ -164,8 +144,8 @@ function AssignmentsCheckQueue({
 
   const setFilterValues = useCallback(
     (name, value, checked) => {
-      let values;
-      values = filters[name] || [];
+      // Copy values, filters are compared with the previous state
+      let values = [...(filters[name] || [])];
       if (checked) {
         values.push(value);
       } else {
@@ -202,16 +182,6 @@ function AssignmentsCheckQueue({
       e.target.checked
     );
 
-  const filteredPersonalAssignments = getFilteredPersonalAssignments(
-    personalAssignments,
-    filters
-  );
-  sortPersonalAssignments(filteredPersonalAssignments, filters.sort);
-
-  const countByStatus = useMemo(
-    () => countBy(personalAssignments, item => item.status),
-    [personalAssignments]
-  );
   const isLoaded = personalAssignments !== null;
 
   return (
@@ -276,36 +246,35 @@ function AssignmentsCheckQueue({
       <div className="row">
         <div className="col-xs-9">
           <PersonalAssignmentList
-            page={page}
-            setPage={setPage}
             isLoading={!isLoaded}
+            isLoadingMore={isLoadingMore}
+            hasMore={nextCursor !== null}
+            onLoadMore={loadNextPage}
             assignments={assignments}
             statusOptions={statusOptions}
-            items={filteredPersonalAssignments}
+            items={personalAssignments || []}
           />
         </div>
 
         <div className="col-xs-3">
-          {studentGroups !== null && (
-            <div className="mb-30">
-              <h5 className="mt-0">Student group</h5>
-              <>
-                {courseGroups.map(option => (
-                  <Checkbox
-                    name="studentGroups"
-                    key={`student-group-${option.value}`}
-                    value={option.value}
-                    checked={
-                      !!filters.studentGroups &&
-                      filters.studentGroups.includes(option.value)
-                    }
-                    onChange={setStudentGroupsFilter}
-                    label={option.label}
-                  />
-                ))}
-              </>
-            </div>
-          )}
+          <div className="mb-30">
+            <h5 className="mt-0">Student group</h5>
+            <>
+              {courseGroups.map(option => (
+                <Checkbox
+                  name="studentGroups"
+                  key={`student-group-${option.value}`}
+                  value={option.value}
+                  checked={
+                    !!filters.studentGroups &&
+                    filters.studentGroups.includes(option.value)
+                  }
+                  onChange={setStudentGroupsFilter}
+                  label={option.label}
+                />
+              ))}
+            </>
+          </div>
 
           <div className="mb-30">
             <h5>Score</h5>
@@ -4,8 +4,6 @@ import React, { useMemo } from 'react';
 import { formatDistance } from 'date-fns';
 import ruLocale from 'date-fns/locale/ru';
 
-import Pagination from 'components/Pagination';
-
 import { getScoreClass } from './utils';
 
 function formatScore(score) {
@@ -109,17 +107,15 @@ PersonalAssignment.propTypes = {
   ).isRequired
 };
 
-const itemsPerPage = 50;
-
 const PersonalAssignmentList = ({
-  page,
-  setPage,
   isLoading,
+  isLoadingMore,
+  hasMore,
+  onLoadMore,
   assignments,
   statusOptions,
   items
 }) => {
-  const isShowPagination = items.length > itemsPerPage;
   const statuses = useMemo(
     () =>
       statusOptions.reduce((acc, option) => {
@@ -156,29 +152,28 @@ const PersonalAssignmentList = ({
                   </td>
                 </tr>
               )}
-              {items.length > 0 &&
-                items
-                  .slice((page - 1) * itemsPerPage, page * itemsPerPage)
-                  .map(item => (
-                    <PersonalAssignment
-                      key={`personal-assignment-${item.id}`}
-                      data={item}
-                      assignments={assignments}
-                      statuses={statuses}
-                    />
-                  ))}
+              {items.map(item => (
+                <PersonalAssignment
+                  key={`personal-assignment-${item.id}`}
+                  data={item}
+                  assignments={assignments}
+                  statuses={statuses}
+                />
+              ))}
             </tbody>
           </table>
         </div>
       </div>
-      {isShowPagination && (
-        <Pagination
-          totalItems={items.length}
-          pageSize={itemsPerPage}
-          currentPage={page}
-          onChangePage={setPage}
-          force={true}
-        />
+      {!isLoading && hasMore && (
+        <div className="text-center">
+          <button
+            className="btn btn-default"
+            disabled={isLoadingMore}
+            onClick={onLoadMore}
+          >
+            Show more
+          </button>
+        </div>
       )}
     </>
   );
@@ -186,6 +181,9 @@ const PersonalAssignmentList = ({
 
 PersonalAssignmentList.propTypes = {
   isLoading: PropTypes.bool.isRequired,
+  isLoadingMore: PropTypes.bool.isRequired,
+  hasMore: PropTypes.bool.isRequired,
+  onLoadMore: PropTypes.func.isRequired,
   items: PropTypes.arrayOf(PropTypes.object),
   assignments: PropTypes.objectOf(Map),
   statusOptions: PropTypes.arrayOf(
@@ -193,9 +191,7 @@ PersonalAssignmentList.propTypes = {
       value: PropTypes.string.isRequired,
       label: PropTypes.string.isRequired
     })
-  ).isRequired,
-  page: PropTypes.number.isRequired,
-  setPage: PropTypes.func.isRequired
+  ).isRequired
 };
 
 export default PersonalAssignmentList;
@@ -3,22 +3,25 @@ import ky from 'ky';
 
 import { createNotification } from 'utils';
 
-import { parseAssignments, parsePersonalAssignments } from './utils';
+import {
+  parseAssignments,
+  parseCheckQueueCounts,
+  parsePersonalAssignments,
+  sortEnum
+} from './utils';
+
+const pageSize = 50;
 
 export const fetchData = async (
-  { csrfToken, timeZone, updateState, initialState, queryParams },
+  { csrfToken, timeZone, updateState, filters },
   controller
 ) => {
-  const searchParams = {
-    course: queryParams.course || initialState.course,
-    assignments: queryParams.assignments || initialState.selectedAssignments
-  };
   return Promise.all([
-    fetchCourseSettings([csrfToken, searchParams.course], controller),
-    fetchPersonalAssignments([csrfToken, timeZone, updateState, searchParams], controller)
+    fetchCourseAssignments([csrfToken, filters.course], controller),
+    fetchCheckQueue([csrfToken, filters], controller)
   ])
     .then(responses => {
-      const [[assignmentsJSON, enrollmentsJSON], personalAssignmentsJSON] = responses;
+      const [assignmentsJSON, [pageJSON, countsJSON]] = responses;
       const assignments = parseAssignments({
         items: assignmentsJSON,
         timeZone,
@@ -31,22 +34,15 @@ export const fetchData = async (
           label: assignment.title
         });
       });
-      const studentGroups = new Map();
-      enrollmentsJSON.forEach(item => {
-        studentGroups.set(item.student.id, item.studentGroupId);
-      });
-      const personalAssignments = parsePersonalAssignments({
-        items: personalAssignmentsJSON,
-        studentGroups,
-        timeZone,
-        locale: ru
-      });
       updateState({
         isInitialized: true,
         assignments,
         assignmentOptions, // TODO: useMemo instead
-        studentGroups,
-        personalAssignments
+        personalAssignments: parsePersonalAssignments({
+          items: pageJSON.results
+        }),
+        nextCursor: pageJSON.nextCursor,
+        countByStatus: parseCheckQueueCounts(countsJSON)
       });
     })
     .catch(error => {
@@ -55,26 +51,13 @@ export const fetchData = async (
     });
 };
 
-const fetchCourseSettings = async ([csrfToken, course], { signal }) => {
-  const assignments = ky
-    .get(`/api/v1/teaching/courses/${course}/assignments/`, {
-      headers: {
-        'X-CSRFToken': csrfToken
-      },
-      throwHttpErrors: false,
-      signal: signal
-    })
-    .then(async response => {
-      if (!response.ok) {
-        return Promise.reject(new Error('fail'));
-      }
-      return response.json();
-    });
-  const enrollments = ky
-    .get(`/api/v1/teaching/courses/${course}/enrollments/`, {
+const fetchJSON = async (csrfToken, url, searchParams, { signal }) => {
+  return ky
+    .get(url, {
       headers: {
         'X-CSRFToken': csrfToken
       },
+      searchParams,
       throwHttpErrors: false,
       signal: signal
     })
@@ -84,43 +67,77 @@ const fetchCourseSettings = async ([csrfToken, course], { signal }) => {
       }
       return response.json();
     });
-  return Promise.all([assignments, enrollments]);
 };
 
-const fetchPersonalAssignments = async (
-  [csrfToken, timeZone, updateState, searchParams],
-  { signal }
-) => {
-  return ky
-    .get(`/api/v1/teaching/courses/${searchParams.course}/personal-assignments/`, {
-      headers: {
-        'X-CSRFToken': csrfToken
-      },
-      searchParams: { assignments: searchParams.assignments },
-      throwHttpErrors: false,
-      signal: signal
-    })
-    .then(async response => {
-      if (!response.ok) {
-        return Promise.reject(new Error('fail'));
-      }
-      return response.json();
-    });
+const fetchCourseAssignments = async ([csrfToken, course], controller) => {
+  return fetchJSON(
+    csrfToken,
+    `/api/v1/teaching/courses/${course}/assignments/`,
+    {},
+    controller
+  );
+};
+
+// Filtering, sorting and pagination are made on the server side
+const getCheckQueueSearchParams = filters => {
+  const searchParams = {
+    assignments: (filters.assignments || []).join(','),
+    ordering:
+      filters.sort === sortEnum.SOLUTION_DESC
+        ? sortEnum.SOLUTION_DESC
+        : sortEnum.SOLUTION_ASC
+  };
+  if (filters.statuses && filters.statuses.length > 0) {
+    searchParams.statuses = filters.statuses.join(',');
+  }
+  if (filters.reviewers && filters.reviewers.length > 0) {
+    searchParams.assignees = filters.reviewers.join(',');
+  }
+  if (filters.studentGroups && filters.studentGroups.length > 0) {
+    searchParams.student_groups = filters.studentGroups.join(',');
+  }
+  // Both options selected is the same as no filter
+  if (filters.score && filters.score.length === 1) {
+    searchParams.graded = filters.score[0] === 'set';
+  }
+  return searchParams;
+};
+
+/**
+ * Fetches the first page of the check queue and the number of personal
+ * assignments by status. Status badges are calculated without
+ * the status filter.
+ */
+const fetchCheckQueue = async ([csrfToken, filters], controller) => {
+  const url = `/api/v1/teaching/courses/${filters.course}/personal-assignments/queue/`;
+  const searchParams = getCheckQueueSearchParams(filters);
+  const countsSearchParams = { ...searchParams, counts_only: true };
+  delete countsSearchParams.statuses;
+  return Promise.all([
+    fetchJSON(
+      csrfToken,
+      url,
+      { ...searchParams, page_size: pageSize },
+      controller
+    ),
+    fetchJSON(csrfToken, url, countsSearchParams, controller)
+  ]);
 };
 
 export const refetchPersonalAssignments = async (
-  [csrfToken, timeZone, updateState, studentGroups, searchParams],
+  [csrfToken, updateState, filters],
+  props,
   controller
 ) => {
-  fetchPersonalAssignments([csrfToken, timeZone, updateState, searchParams], controller)
-    .then(data => {
-      const personalAssignments = parsePersonalAssignments({
-        items: data,
-        studentGroups,
-        timeZone,
-        locale: ru
+  return fetchCheckQueue([csrfToken, filters], controller)
+    .then(([pageJSON, countsJSON]) => {
+      updateState({
+        personalAssignments: parsePersonalAssignments({
+          items: pageJSON.results
+        }),
+        nextCursor: pageJSON.nextCursor,
+        countByStatus: parseCheckQueueCounts(countsJSON)
       });
-      updateState({ personalAssignments });
     })
     .catch(error => {
       if (error.name === 'AbortError') {
@@ -131,3 +148,26 @@ export const refetchPersonalAssignments = async (
       }
     });
 };
+
+export const fetchNextPage = async ([csrfToken, updateState, filters, cursor]) => {
+  const url = `/api/v1/teaching/courses/${filters.course}/personal-assignments/queue/`;
+  const searchParams = {
+    ...getCheckQueueSearchParams(filters),
+    cursor,
+    page_size: pageSize
+  };
+  return fetchJSON(csrfToken, url, searchParams, {})
+    .then(pageJSON => {
+      updateState(state => ({
+        personalAssignments: [
+          ...state.personalAssignments,
+          ...parsePersonalAssignments({ items: pageJSON.results })
+        ],
+        nextCursor: pageJSON.nextCursor
+      }));
+    })
+    .catch(error => {
+      console.debug(error);
+      createNotification('Something went wrong.', 'error');
+    });
+};
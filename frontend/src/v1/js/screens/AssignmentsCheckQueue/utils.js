@@ -11,14 +11,12 @@ export const scoreOptions = [
 
 export const sortEnum = {
   SOLUTION_DESC: 'solution_desc',
-  SOLUTION_ASC: 'solution_asc',
-  NAME_ASC: 'name_asc'
+  SOLUTION_ASC: 'solution_asc'
 };
 
 export const sortOptions = [
   { value: sortEnum.SOLUTION_DESC, label: 'Newer first' },
-  { value: sortEnum.SOLUTION_ASC, label: 'Older first' },
-  { value: sortEnum.NAME_ASC, label: 'Student name' }
+  { value: sortEnum.SOLUTION_ASC, label: 'Older first' }
 ];
 
 export function getScoreClass(status) {
@@ -101,7 +99,7 @@ export const stateReducer = (state, updateArg) => {
   return { ...state, ...updateArg };
 };
 
-export function parsePersonalAssignments({ items, studentGroups, timeZone, locale }) {
+export function parsePersonalAssignments({ items }) {
   items.forEach((item, i) => {
     if (item.solutionAt !== null) {
       item.solutionAt = new Date(item.solutionAt); // in UTC
@@ -113,13 +111,20 @@ export function parsePersonalAssignments({ items, studentGroups, timeZone, local
       student: item.student,
       score: item.score,
       solutionAt: item.solutionAt,
-      status: item.status,
-      studentGroupId: studentGroups.get(item.student.id)
+      status: item.status
     };
   });
   return items;
 }
 
+export function parseCheckQueueCounts({ statuses }) {
+  const countByStatus = {};
+  for (const item of statuses) {
+    countByStatus[item.status] = item.total;
+  }
+  return countByStatus;
+}
+
 export function parseAssignments({ items, timeZone, locale }) {
   const data = new Map();
   const dateToString = formatWithOptions({ locale }, 'dd.MM.yyyy HH:mm');
@@ -146,83 +151,3 @@ export const useFilterState = (initialState = {}) => {
   };
   return [filters, setFilters, onFilterChange];
 };
-
-export const pipe = (...fns) => x => fns.reduce((v, f) => f(v), x); // eslint-disable-line
-
-const includesStatuses = (item, filterValues) => {
-  if (!filterValues || filterValues.length === 0) {
-    return true;
-  }
-  return filterValues.includes(item.status);
-};
-
-const includesReviewer = (item, filterValues) => {
-  if (!filterValues || filterValues.length === 0) {
-    return true;
-  }
-  return filterValues.includes(item.assignee !== null ? item.assignee.id : 'unset');
-};
-
-const includesScore = (item, filterValues) => {
-  if (!filterValues || filterValues.length === 0) {
-    return true;
-  }
-  return filterValues.includes(item.score !== null ? 'set' : 'unset');
-};
-
-const includesStudentGroup = (item, filterValues) => {
-  if (!filterValues || filterValues.length === 0) {
-    return true;
-  }
-  return filterValues.includes(item.studentGroupId);
-};
-
-export function getFilteredPersonalAssignments(items, filters) {
-  if (items === null) {
-    return [];
-  }
-  return items.filter(item => {
-    return (
-      includesStatuses(item, filters.statuses) &&
-      includesReviewer(item, filters.reviewers) &&
-      includesScore(item, filters.score) &&
-      includesStudentGroup(item, filters.studentGroups)
-    );
-  });
-}
-
-export function sortPersonalAssignments(items, order) {
-  if (order === sortEnum.SOLUTION_DESC) {
-    // New solutions first
-    items.sort(sortPersonalAssignmentsByFirstSolutionDesc);
-  } else if (order === sortEnum.SOLUTION_ASC) {
-    items.sort(sortPersonalAssignmentsByFirstSolutionAsc);
-  } else {
-    items.sort((a, b) => a.student.lastName.localeCompare(b.student.lastName));
-  }
-  return items;
-}
-
-// New solutions first, then null values
-function sortPersonalAssignmentsByFirstSolutionAsc(a, b) {
-  if (a.solutionAt === null && b.solutionAt === null) {
-    return a.id - b.id;
-  } else if (a.solutionAt === null) {
-    return 1;
-  } else if (b.solutionAt == null) {
-    return -1;
-  }
-  return a.solutionAt - b.solutionAt;
-}
-
-// TODO: impress with ASC version but null's should go last
-function sortPersonalAssignmentsByFirstSolutionDesc(a, b) {
-  if (a.solutionAt === null && b.solutionAt === null) {
-    return a.id - b.id;
-  } else if (a.solutionAt === null) {
-    return 1;
-  } else if (b.solutionAt == null) {
-    return -1;
-  }
-  return b.solutionAt - a.solutionAt;
-}
@@ -19,6 +19,33 @@ function getSelectedValues(items) {
     .join(',');
 }
 
+function renderRows(results) {
+  let h = '';
+  results.map(studentProfile => {
+    h += `<tr><td>`;
+    h += `<a href="/users/${studentProfile.user_id}/">${escapeHTML(studentProfile.short_name)}</a>`;
+    h += '</td></tr>';
+  });
+  return h;
+}
+
+function renderLoadMore(next) {
+  const container = $('#user-load-more-container');
+  if (next === null) {
+    container.empty();
+    return;
+  }
+  container.html('<a href="#" class="btn btn-default">Load more</a>');
+  container.find('a').one('click', function (e) {
+    e.preventDefault();
+    $.ajax({ url: next, dataType: 'json' })
+      .done(function (data) {
+        $('#user-table-container table').append(renderRows(data.results));
+        renderLoadMore(data.next);
+      });
+  });
+}
+
 function makeQuery() {
   const payload = {};
   for (const [key, value] of Object.entries(filters)) {
@@ -38,30 +65,22 @@ function makeQuery() {
     traditional: true
   })
     .done(function (data) {
-      let found;
-      if (data.next !== null) {
-        found = `500 of ${data.count} results are shown`;
-      } else {
-        found = `${data.count} results`;
-      }
+      let found = `${data.count} results`;
       if (parseInt(data.count) > 0) {
         found += ` <a target="_blank" href="/staff/student-search.csv?${$.param(
           filters
         )}">download csv</a>`;
       }
       $('#user-num-container').html(found).show();
-      let h = "<table class='table table-condensed'>";
-      data.results.map(studentProfile => {
-        h += `<tr><td>`;
-        h += `<a href="/users/${studentProfile.user_id}/">${escapeHTML(studentProfile.short_name)}</a>`;
-        h += '</td></tr>';
-      });
-      h += '</table>';
-      $('#user-table-container').html(h);
+      $('#user-table-container').html(
+        `<table class='table table-condensed'>${renderRows(data.results)}</table>`
+      );
+      renderLoadMore(data.next);
     })
     .fail(function (jqXHR) {
       $('#user-num-container').html(`Request error`).show();
       $('#user-table-container').html(`<code>${jqXHR.responseText}</code>`);
+      renderLoadMore(null);
     });
 }
 
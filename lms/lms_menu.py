@@ -6,30 +6,51 @@ from menu import Menu
 from typing import Literal
 
 from alumni.permissions import ViewAlumniMenu
+from auth.backends import RBACPermissions
 from core.http import HttpRequest
 from core.menu import MenuItem
 from core.urls import reverse
-from courses.models import CourseTeacher
 from courses.urls import RE_COURSE_URI
-from learning.models import Enrollment
+from learning.services.membership_service import UserMembership, get_user_membership
+
+_permissions_backend = RBACPermissions()
+
+
+def get_request_membership(request: HttpRequest) -> UserMembership:
+    """Returns cached course membership of the user memoized on the request."""
+    membership = getattr(request, '_user_membership', None)
+    if membership is None:
+        membership = get_user_membership(request.user.pk)
+        request._user_membership = membership
+    return membership
 
 
 def course_matcher(menu_name: Literal['learning', 'teaching'], request: HttpRequest):
     resolver_match: ResolverMatch = request.resolver_match
     if not re.match('/courses/' + RE_COURSE_URI.removeprefix('^'), request.path):
         return False
-    user = request.user
     course_id = int(resolver_match.kwargs.get('course_id'))
+    membership = get_request_membership(request)
     match menu_name:
         case 'learning':
-            return Enrollment.active.filter(student=user, course_id=course_id).exists()
+            return course_id in membership.enrolled_in
         case 'teaching':
-            return CourseTeacher.objects.filter(teacher=user, course_id=course_id).exists()
+            return course_id in membership.teaching
     return False
 
 
+class LmsMenuItem(MenuItem):
+    """Checks permissions against cached user roles."""
+    def has_perms(self, request: HttpRequest) -> bool:
+        if not request.user.is_authenticated:
+            return super().has_perms(request)
+        roles = request.user.roles
+        return all(_permissions_backend.has_perm_with_roles(request.user, perm, roles)
+                   for perm in self.permissions)
+
+
 top_menu = [
-    MenuItem(
+    LmsMenuItem(
         pgettext_lazy("menu", "Learning"),
         reverse('study:assignment_list'),
         weight=10,
@@ -56,7 +77,7 @@ top_menu = [
         permissions=("learning.view_study_menu",),
         css_classes='for-students',
     ),
-    MenuItem(
+    LmsMenuItem(
         pgettext_lazy("menu", "Teaching"),
         reverse('teaching:assignments_check_queue'),
         weight=20,
@@ -140,7 +161,7 @@ top_menu = [
         for_staff=True,
         css_classes='for-staff',
     ),
-    MenuItem(
+    LmsMenuItem(
         pgettext_lazy('menu', 'Alumni'),
         reverse('alumni:list'),
         weight=50,
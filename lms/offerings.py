@@ -0,0 +1,151 @@
+"""
+Data for the course offerings page is the same for the large groups of
+users (curators and teachers see all courses, students see the courses of
+their academic program). It's precomputed by the background job and
+stored in cache under the data version that changes every time
+a course or its teachers have been modified.
+"""
+import datetime
+from collections import OrderedDict
+from itertools import groupby
+from typing import Dict, List, NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+from django.utils.translation import get_language
+
+from core.cache import DataVersion
+from core.locks import acquire_cache_lock
+from courses.constants import SemesterTypes
+from courses.models import Course, CourseProgramBinding, CourseTeacher
+from courses.selectors import course_teachers_prefetch_queryset
+from lms.api.serializers import OfferingsCourseSerializer
+from lms.utils import group_terms_by_academic_year
+from users.models import StudentTypes, User
+
+COURSE_OFFERINGS_CACHE_VERSION = 1
+COURSE_OFFERINGS_CACHE_KEY = "course_offerings:{version}:{data_version}:{language}:{audience}"
+COURSE_OFFERINGS_CACHE_TIMEOUT = 7 * 24 * 3600
+COURSE_OFFERINGS_REBUILD_LOCK = "course_offerings_rebuild"
+# Max delay of the rebuild if the job has been lost
+COURSE_OFFERINGS_REBUILD_LOCK_TIMEOUT = 300
+# Audience of the users who see courses of all programs
+AUDIENCE_ALL = 'all'
+
+
+class CourseOfferings(NamedTuple):
+    # Term types grouped by academic year, e.g. {2017: ['autumn', 'spring']}
+    terms: Dict[int, List[str]]
+    # Serialized courses grouped by term slug
+    courses: Dict[str, List[Dict]]
+
+
+def get_offerings_queryset(courses: QuerySet) -> QuerySet:
+    course_teachers = Prefetch('course_teachers',
+                               queryset=course_teachers_prefetch_queryset(
+                                   hidden_roles=(CourseTeacher.roles.spectator,)
+                               ))
+    return (courses
+            .exclude(semester__type=SemesterTypes.SUMMER)
+            .select_related('meta_course', 'semester')
+            .only("pk",
+                  "meta_course__name", "meta_course__slug",
+                  "semester__year", "semester__index", "semester__type")
+            .prefetch_related(course_teachers)
+            .order_by('-semester__year', '-semester__index',
+                      'meta_course__name'))
+
+
+def build_course_offerings(courses: QuerySet) -> CourseOfferings:
+    courses = list(courses)
+    terms = group_terms_by_academic_year(courses)
+    courses_by_term = OrderedDict()
+    for term, cs in groupby(courses, key=lambda x: x.semester):
+        courses_by_term[term.slug] = OfferingsCourseSerializer(cs, many=True).data
+    return CourseOfferings(terms=terms, courses=courses_by_term)
+
+
+def get_offerings_audience(user: User) -> Optional[str]:
+    """
+    Returns code of the group of users who see the same list of courses
+    or None if the list is personal.
+    """
+    if user.is_curator or user.is_teacher:
+        return AUDIENCE_ALL
+    student_profile = user.get_student_profile()
+    if student_profile is None or student_profile.type == StudentTypes.INVITED:
+        return None
+    if student_profile.type == StudentTypes.REGULAR and student_profile.academic_program_enrollment:
+        return f"program:{student_profile.academic_program_enrollment.program.code}"
+    return AUDIENCE_ALL
+
+
+def _get_audience_courses(audience: str) -> QuerySet:
+    courses = Course.objects.all()
+    if audience != AUDIENCE_ALL:
+        _, program_code = audience.split(":", 1)
+        courses = courses.in_program(program_code)
+    return get_offerings_queryset(courses)
+
+
+_course_offerings_data_version = DataVersion("course_offerings:{version}:data_version",
+                                             version=COURSE_OFFERINGS_CACHE_VERSION)
+
+
+def get_course_offerings_version() -> int:
+    """
+    Returns timestamp (in microseconds) of the latest change of the
+    course offerings data.
+    """
+    return _course_offerings_data_version.get()
+
+
+def get_course_offerings_modified_at(data_version: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(data_version / 1_000_000,
+                                           tz=datetime.timezone.utc)
+
+
+def get_course_offerings_cache_key(audience: str, data_version: int) -> str:
+    return COURSE_OFFERINGS_CACHE_KEY.format(version=COURSE_OFFERINGS_CACHE_VERSION,
+                                             data_version=data_version,
+                                             language=get_language(),
+                                             audience=audience)
+
+
+def get_course_offerings(audience: str) -> CourseOfferings:
+    """
+    Returns precomputed course offerings data. Builds it in place if
+    the background job hasn't been completed yet.
+    """
+    data_version = get_course_offerings_version()
+    cache_key = get_course_offerings_cache_key(audience, data_version)
+    offerings = cache.get(cache_key)
+    if offerings is None:
+        offerings = build_course_offerings(_get_audience_courses(audience))
+        cache.set(cache_key, offerings, timeout=COURSE_OFFERINGS_CACHE_TIMEOUT)
+    return offerings
+
+
+def get_offerings_audiences() -> List[str]:
+    program_codes = (CourseProgramBinding.objects
+                     .filter(program__isnull=False)
+                     .values_list('program__code', flat=True)
+                     .order_by()
+                     .distinct())
+    return [AUDIENCE_ALL, *(f"program:{code}" for code in program_codes)]
+
+
+def invalidate_course_offerings() -> None:
+    """
+    Changes the data version and schedules rebuilding of the cached data
+    after the current transaction is committed.
+    """
+    from lms.tasks import rebuild_course_offerings
+
+    def enqueue():
+        _course_offerings_data_version.bump()
+        if acquire_cache_lock(COURSE_OFFERINGS_REBUILD_LOCK,
+                              timeout=COURSE_OFFERINGS_REBUILD_LOCK_TIMEOUT):
+            rebuild_course_offerings.delay()
+    transaction.on_commit(enqueue)
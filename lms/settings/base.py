@@ -1,4 +1,5 @@
 import logging
+import sys
 import warnings
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -55,6 +56,10 @@ SESSION_COOKIE_SECURE = env.bool("DJANGO_SESSION_COOKIE_SECURE", default=True)
 SESSION_COOKIE_DOMAIN = env.str("DJANGO_SESSION_COOKIE_DOMAIN", default=None)
 SESSION_COOKIE_NAME = env.str("DJANGO_SESSION_COOKIE_NAME", default="sessionid")
 SESSION_COOKIE_SAMESITE = env.str("DJANGO_SESSION_COOKIE_SAMESITE", default=None)
+# Sessions are read from cache and written through to the database, the cache
+# must be shared between processes
+SESSION_ENGINE = env.str("DJANGO_SESSION_ENGINE",
+                         default="django.contrib.sessions.backends.cached_db")
 CSRF_COOKIE_SECURE = env.bool("DJANGO_CSRF_COOKIE_SECURE", default=True)
 CSRF_COOKIE_DOMAIN = env.str("DJANGO_CSRF_COOKIE_DOMAIN", default=None)
 CSRF_COOKIE_NAME = env.str("DJANGO_CSRF_COOKIE_NAME", default="csrftoken")
@@ -130,14 +135,36 @@ WEBPACK_LOADER = {
     },
 }
 
+
+def _get_process_type(argv: List[str]) -> str:
+    if len(argv) > 1 and Path(argv[0]).name == "manage.py":
+        return "worker" if argv[1].startswith("rqworker") else "command"
+    return "web"
+
+
+# One of "web", "worker" (rq worker) or "command" (management command)
+PROCESS_TYPE = env.str("PROCESS_TYPE", default=None) or _get_process_type(sys.argv)
+# Lifetime of the persistent database connections in seconds by process type,
+# 0 closes the connection at the end of each request or job
+DATABASE_CONN_MAX_AGE = {
+    "web": env.int("WEB_DATABASE_CONN_MAX_AGE", default=60),
+    "worker": env.int("WORKER_DATABASE_CONN_MAX_AGE", default=0),
+    "command": env.int("COMMAND_DATABASE_CONN_MAX_AGE", default=0),
+}
+
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db_url(var="DATABASE_URL")}
+DATABASES["default"]["CONN_MAX_AGE"] = DATABASE_CONN_MAX_AGE[PROCESS_TYPE]
+# Persistent connection is checked before reuse in a new request or job
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = env.bool("DATABASE_CONN_HEALTH_CHECKS",
+                                                      default=True)
 
 
 MIDDLEWARE = [
     # TODO: Return SecurityMiddleware or configure security with nginx-ingress
     #  https://docs.djangoproject.com/en/4.0/ref/middleware/#module-django.middleware.security
     "core.middleware.HealthCheckMiddleware",
+    "core.middleware.RequestProfilerMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "auth.middleware.AuthenticationMiddleware",
     "django.contrib.sites.middleware.CurrentSiteMiddleware",
@@ -150,13 +177,53 @@ MIDDLEWARE = [
     "core.middleware.RedirectMiddleware",
 ]
 
-CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Fraction of requests profiled by `core.middleware.RequestProfilerMiddleware`,
+# 0 disables profiling
+REQUEST_PROFILER_SAMPLE_RATE = env.float("REQUEST_PROFILER_SAMPLE_RATE", default=0.0)
 
 REDIS_PASSWORD = env.str("REDIS_PASSWORD", default=None)
 REDIS_HOST = env.str("REDIS_HOST", default="127.0.0.1")
 REDIS_PORT = env.int("REDIS_PORT", default=6379)
 REDIS_DB_INDEX = env.int("REDIS_DB_INDEX", default=SITE_ID)
 REDIS_SSL = env.bool("REDIS_SSL", default=True)
+
+# Rendered markdown fragments, see `core.markdown`
+MARKDOWN_LRU_CACHE_SIZE = env.int("MARKDOWN_LRU_CACHE_SIZE", default=1024)
+MARKDOWN_CACHE_TIMEOUT = env.int("MARKDOWN_CACHE_TIMEOUT", default=7 * 24 * 3600)
+# Cache aliases share the redis database and are separated by the key prefix,
+# see `core.cache`
+CACHE_REDIS_URL = env.str(
+    "CACHE_REDIS_URL",
+    default=f"{'rediss' if REDIS_SSL else 'redis'}://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB_INDEX}",
+)
+
+
+def _redis_cache(key_prefix: str, timeout: Optional[int]):
+    return {
+        "BACKEND": "core.cache.RedisCache",
+        "LOCATION": CACHE_REDIS_URL,
+        "KEY_PREFIX": key_prefix,
+        "TIMEOUT": timeout,
+        "OPTIONS": {"password": REDIS_PASSWORD},
+    }
+
+
+CACHES = {
+    "default": _redis_cache("default", timeout=300),
+    "markdown_fragments": _redis_cache("markdown", timeout=MARKDOWN_CACHE_TIMEOUT),
+    "permissions": _redis_cache("permissions", timeout=3600),
+    "reports": _redis_cache("reports", timeout=24 * 3600),
+    # Default `SESSION_COOKIE_AGE`
+    "sessions": _redis_cache("sessions", timeout=2 * 7 * 24 * 3600),
+}
+SESSION_CACHE_ALIAS = "sessions"
+
+RQ = {"WORKER_CLASS": "core.workers.Worker"}
+# The default worker forks a work horse per job which can't reuse
+# database connections
+if DATABASE_CONN_MAX_AGE["worker"]:
+    RQ["WORKER_CLASS"] = "core.workers.PersistentConnectionWorker"
+
 RQ_QUEUES = {
     "default": {
         "HOST": REDIS_HOST,
@@ -302,7 +369,7 @@ EMAIL_HOST = env.str("DJANGO_EMAIL_HOST", default="smtp.yandex.ru")
 EMAIL_HOST_PASSWORD = env.str("DJANGO_EMAIL_HOST_PASSWORD", default=None)
 EMAIL_PORT = env.int("DJANGO_EMAIL_PORT", default=465)
 EMAIL_USE_TLS = False
-EMAIL_USE_SSL = True
+EMAIL_USE_SSL = env.bool("DJANGO_EMAIL_USE_SSL", default=True)
 EMAIL_SEND_COOLDOWN = 0.5
 EMAIL_BACKEND = env.str(
     "DJANGO_EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
@@ -57,6 +57,16 @@ DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
 PRIVATE_FILE_STORAGE = DEFAULT_FILE_STORAGE
 MEDIA_ROOT = "/tmp/django_test_media/"
 MEDIA_URL = "/media/"
+# In-process stand-in for the shared cache, aliases don't share storage
+CACHES = {
+    alias: {
+        "BACKEND": "core.cache.LocMemCache",
+        "LOCATION": alias,
+        "KEY_PREFIX": config["KEY_PREFIX"],
+        "TIMEOUT": config["TIMEOUT"],
+    }
+    for alias, config in CACHES.items()
+}
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 EMAIL_SEND_COOLDOWN = 0
 
@@ -68,7 +78,8 @@ STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
 THUMBNAIL_KVSTORE = "sorl.thumbnail.kvstores.cached_db_kvstore.KVStore"
 
-SILENCED_SYSTEM_CHECKS = ["captcha.recaptcha_test_key_error"]
+# Tests are run in a single process with the process-local caches
+SILENCED_SYSTEM_CHECKS = ["captcha.recaptcha_test_key_error", "core.E401"]
 
 for queue_config in RQ_QUEUES.values():
     queue_config["ASYNC"] = False
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from courses.models import Course, CourseProgramBinding, CourseTeacher, MetaCourse
+from lms.offerings import invalidate_course_offerings
+from users.models import User
+
+
+@receiver(post_save, sender=Course)
+def invalidate_course_offerings_on_course_save(sender, instance: Course, update_fields=None,
+                                               *args, **kwargs):
+    # Derivable fields are not shown on the course offerings page
+    if update_fields and set(update_fields) <= set(Course.derivable_fields):
+        return
+    invalidate_course_offerings()
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=MetaCourse)
+@receiver(post_save, sender=CourseTeacher)
+@receiver(post_delete, sender=CourseTeacher)
+@receiver(post_save, sender=CourseProgramBinding)
+@receiver(post_delete, sender=CourseProgramBinding)
+def invalidate_course_offerings_on_change(sender, *args, **kwargs):
+    invalidate_course_offerings()
+
+
+@receiver(post_save, sender=User)
+def invalidate_course_offerings_on_teacher_save(sender, instance: User, created,
+                                                update_fields=None, *args, **kwargs):
+    name_fields = {'first_name', 'last_name', 'username'}
+    if created or (update_fields and not name_fields.intersection(update_fields)):
+        return
+    if CourseTeacher.objects.filter(teacher=instance).exists():
+        invalidate_course_offerings()
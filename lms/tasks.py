@@ -0,0 +1,18 @@
+import logging
+
+from django_rq import job
+
+from core.locks import release_cache_lock
+from lms.offerings import (
+    COURSE_OFFERINGS_REBUILD_LOCK, get_course_offerings, get_offerings_audiences
+)
+
+logger = logging.getLogger(__file__)
+
+
+@job('default')
+def rebuild_course_offerings() -> None:
+    # Changes made after this point must schedule a new job
+    release_cache_lock(COURSE_OFFERINGS_REBUILD_LOCK)
+    for audience in get_offerings_audiences():
+        get_course_offerings(audience)
@@ -4,9 +4,11 @@ import factory
 import pytest
 import time_machine
 from django.conf import settings
+from django.urls import resolve
 from django.utils.encoding import smart_bytes
 from django_recaptcha.client import RecaptchaResponse
 
+from core.menu import Menu
 from core.urls import reverse
 from core.utils import instance_memoize
 from courses.constants import SemesterTypes
@@ -15,7 +17,9 @@ from courses.tests.factories import CourseFactory, CourseTeacherFactory, Semeste
 from learning.invitation.views import create_invited_profile
 from learning.settings import StudentStatuses
 from learning.tests.factories import EnrollmentFactory, CourseInvitationBindingFactory, InvitationFactory
+from lms import views as lms_views
 from users.constants import Roles
+from users.identity import get_identity_snapshot
 from users.models import StudentTypes, User, StudentProfile
 from users.services import create_student_profile, update_student_status
 from users.tests.factories import TeacherFactory, UserFactory, StudentFactory, CuratorFactory, StudentProfileFactory
@@ -302,3 +306,81 @@ def test_view_course_offerings_regular_in_academic(client, program_cub001, progr
     terms_courses = list(response.context_data['courses'].values())
     founded_courses = sum(map(len, terms_courses))
     assert founded_courses == 2
+
+
+def _process_top_menu(rf, user_id, path):
+    request = rf.get(path)
+    request.user = get_identity_snapshot(user_id).to_user()
+    request.resolver_match = resolve(path)
+    return Menu.process(request, name="menu_private")
+
+
+def _selected_menu_item(menu):
+    return next((item.title for item in menu if item.selected), None)
+
+
+@pytest.mark.django_db
+def test_top_menu_cached_membership(rf, django_assert_num_queries):
+    teacher = TeacherFactory()
+    course = CourseFactory(teachers=[teacher])
+    other_course = CourseFactory()
+    course_path = course.get_absolute_url()
+    other_course_path = other_course.get_absolute_url()
+    assignments_path = reverse('teaching:assignments_check_queue', subdomain=None)
+    # Warm up the cache
+    _process_top_menu(rf, teacher.pk, course_path)
+    for path in (course_path, other_course_path, assignments_path):
+        request = rf.get(path)
+        request.user = get_identity_snapshot(teacher.pk).to_user()
+        request.resolver_match = resolve(path)
+        with django_assert_num_queries(0):
+            menu = Menu.process(request, name="menu_private")
+        assert [str(item.title) for item in menu] == ['Teaching']
+    menu = _process_top_menu(rf, teacher.pk, course_path)
+    assert _selected_menu_item(menu) == 'Teaching'
+    menu = _process_top_menu(rf, teacher.pk, other_course_path)
+    assert _selected_menu_item(menu) is None
+    # Cache is invalidated on enrollment and role changes
+    EnrollmentFactory(student=teacher, course=other_course)
+    teacher.add_group(Roles.STUDENT)
+    menu = _process_top_menu(rf, teacher.pk, other_course_path)
+    assert {str(item.title) for item in menu} == {'Learning', 'Teaching'}
+    assert _selected_menu_item(menu) == 'Learning'
+    CourseTeacher.objects.filter(teacher=teacher, course=course).delete()
+    menu = _process_top_menu(rf, teacher.pk, course_path)
+    assert _selected_menu_item(menu) is None
+
+
+@pytest.mark.django_db
+def test_view_course_offerings_precomputed(client, mocker, django_capture_on_commit_callbacks):
+    url = reverse('course_list', subdomain=settings.LMS_SUBDOMAIN)
+    current_term = SemesterFactory.create_current()
+    previous_term = SemesterFactory(year=current_term.year - 1, type=SemesterTypes.AUTUMN)
+    current_course = CourseFactory(semester=current_term)
+    with django_capture_on_commit_callbacks(execute=True):
+        previous_course = CourseFactory(semester=previous_term)
+    client.login(CuratorFactory())
+    response = client.get(url)
+    assert response.status_code == 200
+    # Only courses of the active term are embedded in the page
+    assert smart_bytes(current_course.meta_course.name) in response.content
+    assert smart_bytes(previous_course.meta_course.name) not in response.content
+    etag = response.headers['ETag']
+    assert 'Last-Modified' in response.headers
+    spy = mocker.spy(lms_views, 'get_offerings_audience')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    # ETag and Last-Modified are computed once per request
+    assert spy.call_count == 1
+    # Courses of other terms are loaded on demand
+    term_url = reverse('course_list_term', subdomain=settings.LMS_SUBDOMAIN)
+    response = client.get(term_url, {'semester': previous_term.slug})
+    assert response.status_code == 200
+    assert [c['name'] for c in response.json()['courses']] == [previous_course.meta_course.name]
+    assert client.get(term_url, {'semester': 'wrong'}).status_code == 400
+    # Course changes invalidate precomputed data
+    with django_capture_on_commit_callbacks(execute=True):
+        new_course = CourseFactory(semester=current_term)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert smart_bytes(new_course.meta_course.name) in response.content
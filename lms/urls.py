@@ -10,7 +10,7 @@ from django.views.generic import TemplateView
 
 from core.views import MarkdownHowToHelpView, MarkdownRenderView
 from courses.views import TeacherDetailView
-from lms.views import CourseOfferingsView, IndexView
+from lms.views import CourseOfferingsTermView, CourseOfferingsView, IndexView
 
 admin.autodiscover()
 
@@ -30,6 +30,8 @@ urlpatterns = [
     path('', include('learning.urls')),
 
     path('courses/', CourseOfferingsView.as_view(), name="course_list"),
+    # Note: `.` is not allowed in a meta course slug
+    path('courses/terms.json', CourseOfferingsTermView.as_view(), name="course_list_term"),
     path('', include('courses.urls')),
     path("courses/", include('learning.invitation.urls')),
     path('teachers/<int:pk>/', TeacherDetailView.as_view(), name='teacher_detail'),
@@ -1,11 +1,16 @@
-from collections import OrderedDict
-from itertools import groupby
+import datetime
+import hashlib
+from typing import Optional, Tuple
 
+from django.contrib import messages
 from django.contrib.auth.views import redirect_to_login
-from django.db.models import Prefetch, Q
-from django.http import HttpResponseRedirect
-from django.utils.translation import pgettext_lazy
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.translation import get_language, pgettext_lazy
 from django.views import View
+from django.views.decorators.http import condition
 from django_filters.views import FilterMixin
 from rest_framework.renderers import JSONRenderer
 from vanilla import TemplateView
@@ -14,13 +19,16 @@ from courses.models import CourseProgramBinding
 from core.exceptions import Redirect
 from core.urls import reverse
 from courses.constants import SemesterTypes
-from courses.models import Course, CourseTeacher
-from courses.selectors import course_teachers_prefetch_queryset
+from courses.models import Course
 from courses.utils import TermPair, get_current_term_pair
 from learning.models import Enrollment
-from lms.api.serializers import OfferingsCourseSerializer
-from lms.filters import CoursesAtAcademicProgram
-from lms.utils import PublicRoute, PublicRouteException, group_terms_by_academic_year
+from lms.filters import CoursesAtAcademicProgram, semester_slug_re
+from lms.offerings import (
+    CourseOfferings, build_course_offerings, get_course_offerings,
+    get_course_offerings_modified_at, get_course_offerings_version, get_offerings_audience,
+    get_offerings_queryset
+)
+from lms.utils import PublicRoute, PublicRouteException
 from users.models import StudentTypes
 
 
@@ -40,9 +48,50 @@ class IndexView(View):
         return HttpResponseRedirect(redirect_to=redirect_to)
 
 
-class CourseOfferingsView(FilterMixin, TemplateView):
+def _compute_offerings_validators(request) -> Tuple[Optional[str], Optional[datetime.datetime]]:
+    user = request.user
+    if not user.is_authenticated:
+        return None, None
+    audience = get_offerings_audience(user)
+    # Personal data or unread messages have to be rendered from scratch
+    if audience is None or len(messages.get_messages(request)):
+        return None, None
+    data_version = get_course_offerings_version()
+    key = ":".join([
+        str(data_version),
+        audience,
+        get_language(),
+        request.get_full_path(),
+        # Page contains session related data, e.g. CSRF token
+        request.session.session_key or "",
+    ])
+    etag = hashlib.md5(key.encode('utf-8')).hexdigest()
+    return etag, get_course_offerings_modified_at(data_version)
+
+
+def _get_offerings_validators(request) -> Tuple[Optional[str], Optional[datetime.datetime]]:
+    """
+    Returns ETag and Last-Modified values of the page or (None, None) if
+    the page is personal. Memoized on the request since `condition`
+    decorator calls both functions below.
+    """
+    validators = getattr(request, '_offerings_validators', None)
+    if validators is None:
+        validators = _compute_offerings_validators(request)
+        request._offerings_validators = validators
+    return validators
+
+
+def _get_offerings_etag(request, *args, **kwargs) -> Optional[str]:
+    return _get_offerings_validators(request)[0]
+
+
+def _get_offerings_last_modified(request, *args, **kwargs) -> Optional[datetime.datetime]:
+    return _get_offerings_validators(request)[1]
+
+
+class CourseOfferingsMixin(FilterMixin):
     filterset_class = CoursesAtAcademicProgram
-    template_name = "lms/course_offerings.html"
 
     def dispatch(self, request, *args, **kwargs):
         if not self.request.user.is_authenticated:
@@ -51,11 +100,6 @@ class CourseOfferingsView(FilterMixin, TemplateView):
 
     def get_queryset(self):
         user = self.request.user
-        course_teachers = Prefetch('course_teachers',
-                                   queryset=course_teachers_prefetch_queryset(
-                                       hidden_roles=(CourseTeacher.roles.spectator,)
-                                   ))
-
         courses = Course.objects
         student_profile = user.get_student_profile()
         if not user.is_curator and not user.is_teacher:
@@ -76,37 +120,69 @@ class CourseOfferingsView(FilterMixin, TemplateView):
                 courses = courses.filter(enrolled_in | has_invitation)
             elif student_profile.type == StudentTypes.REGULAR and student_profile.academic_program_enrollment:
                 courses = courses.in_program(student_profile.academic_program_enrollment.program.code)
-        return (courses
-                .exclude(semester__type=SemesterTypes.SUMMER)
-                .select_related('meta_course', 'semester')
-                .only("pk",
-                      "meta_course__name", "meta_course__slug",
-                      "semester__year", "semester__index", "semester__type")
-                .prefetch_related(course_teachers)
-                .order_by('-semester__year', '-semester__index',
-                          'meta_course__name'))
+        return get_offerings_queryset(courses)
 
-    def get_context_data(self, **kwargs):
+    def get_course_offerings(self) -> CourseOfferings:
+        audience = get_offerings_audience(self.request.user)
+        if audience is None:
+            return build_course_offerings(self.get_queryset())
+        return get_course_offerings(audience)
+
+    def get_valid_filterset(self):
         filterset_class = self.get_filterset_class()
         filterset = self.get_filterset(filterset_class)
         if not filterset.is_valid():
             raise Redirect(to=reverse("course_list"))
+        return filterset
+
+    def get_term(self, filters, offerings: CourseOfferings):
+        # Not sure this is the best place for this method
+        assert filters.is_valid()
+        if "semester" in filters.data:
+            valid_slug = filters.data["semester"]
+            term_year, term_type = valid_slug.split("-")
+            term_year = int(term_year)
+        else:
+            # By default, return academic year and term type for the latest
+            # available course.
+            if offerings.courses:
+                latest_slug = next(iter(offerings.courses))
+                match = semester_slug_re.search(latest_slug)
+                term_year = int(match.group("term_year"))
+                term_type = match.group("term_type")
+            else:
+                term_pair = get_current_term_pair()
+                term_year = term_pair.year
+                term_type = term_pair.type
+        term_pair = TermPair(term_year, term_type)
+        return term_pair.academic_year, term_type
+
+
+@method_decorator(condition(etag_func=_get_offerings_etag,
+                            last_modified_func=_get_offerings_last_modified), name='get')
+class CourseOfferingsView(CourseOfferingsMixin, TemplateView):
+    template_name = "lms/course_offerings.html"
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_context_data(self, **kwargs):
+        filterset = self.get_valid_filterset()
         term_options = {
             SemesterTypes.AUTUMN: pgettext_lazy("adjective", "autumn"),
             SemesterTypes.SPRING: pgettext_lazy("adjective", "spring"),
         }
-        courses_qs = filterset.qs
-        terms = group_terms_by_academic_year(courses_qs)
-        active_academic_year, active_type = self.get_term(filterset, courses_qs)
+        offerings = self.get_course_offerings()
+        terms = offerings.terms
+        active_academic_year, active_type = self.get_term(filterset, offerings)
         if active_type == SemesterTypes.SPRING:
             active_year = active_academic_year + 1
         else:
             active_year = active_academic_year
         active_slug = "{}-{}".format(active_year, active_type)
-        # Group courses by (year, term_type)
-        courses = OrderedDict()
-        for term, cs in groupby(courses_qs, key=lambda x: x.semester):
-            courses[term.slug] = OfferingsCourseSerializer(cs, many=True).data
+        courses = offerings.courses
         context = {
             "TERM_TYPES": term_options,
             "terms": terms,
@@ -114,6 +190,7 @@ class CourseOfferingsView(FilterMixin, TemplateView):
             "active_academic_year": active_academic_year,
             "active_type": active_type,
             "active_slug": active_slug,
+            # Courses of other terms are loaded on demand
             "json": JSONRenderer().render({
                 "initialFilterState": {
                     "academicYear": active_academic_year,
@@ -122,29 +199,24 @@ class CourseOfferingsView(FilterMixin, TemplateView):
                 },
                 "terms": terms,
                 "termOptions": term_options,
-                "courses": courses
+                "courses": {active_slug: courses.get(active_slug, [])},
+                "coursesUrl": reverse("course_list_term"),
             }).decode('utf-8'),
         }
         return context
 
-    def get_term(self, filters, courses):
-        # Not sure this is the best place for this method
-        assert filters.is_valid()
-        if "semester" in filters.data:
-            valid_slug = filters.data["semester"]
-            term_year, term_type = valid_slug.split("-")
-            term_year = int(term_year)
-        else:
-            # By default, return academic year and term type for the latest
-            # available course.
-            if courses:
-                # Note: may hit db if `filters.qs` is not cached
-                term = courses[0].semester
-                term_year = term.year
-                term_type = term.type
-            else:
-                term_pair = get_current_term_pair()
-                term_year = term_pair.year
-                term_type = term_pair.type
-        term_pair = TermPair(term_year, term_type)
-        return term_pair.academic_year, term_type
+
+@method_decorator(condition(etag_func=_get_offerings_etag,
+                            last_modified_func=_get_offerings_last_modified), name='get')
+class CourseOfferingsTermView(CourseOfferingsMixin, View):
+    """Returns courses of the term provided in the `semester` query param"""
+    def get(self, request, *args, **kwargs):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_valid() or "semester" not in filterset.data:
+            return HttpResponseBadRequest()
+        offerings = self.get_course_offerings()
+        courses = offerings.courses.get(filterset.data["semester"], [])
+        response = HttpResponse(JSONRenderer().render({"courses": courses}),
+                                content_type="application/json")
+        patch_cache_control(response, private=True, no_cache=True)
+        return response